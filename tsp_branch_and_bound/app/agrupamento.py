@@ -0,0 +1,292 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.branch_e_bound import branch_and_bound_tsp
+from app.heuristicas import vizinho_mais_proximo_heuristica
+from app.indice_espacial import calcular_matriz_haversine
+from app.memoria_compartilhada import MatrizCompartilhada, inicializar_trabalhador, matriz_trabalhador
+
+# Configuração de Paths
+RESULTS_DIR = 'results'
+INPUT_PONTOS_CSV = os.path.join(RESULTS_DIR, 'pontos_de_visita.csv')
+OUTPUT_RESULTADOS_JSON = os.path.join(RESULTS_DIR, 'resultados_agrupamento.json')
+
+# Tamanho máximo de cada grupo resolvido pelo Branch and Bound. Com 8 cidades a busca
+# exata leva ~15 ms; com 10 já passa de 100 ms (e o número de grupos cai pouco).
+TAMANHO_MAX_GRUPO = 8
+NUM_PROCESSOS = max(1, (os.cpu_count() or 2) - 1)
+SEMENTE = 42
+MAX_ITERACOES_KMEANS = 100
+MAX_PASSADAS_2OPT = 50
+
+
+def projetar_coordenadas(latitudes, longitudes):
+    """Projeção equirretangular (x, y) em graus, com a longitude corrigida pela latitude média."""
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+    return np.column_stack([longitudes * np.cos(np.radians(latitudes.mean())), latitudes])
+
+
+def kmeans(pontos, k, rng, max_iteracoes=MAX_ITERACOES_KMEANS):
+    """K-means (Lloyd) com inicialização k-means++. Retorna o rótulo do grupo de cada ponto."""
+    n = len(pontos)
+    centros = np.empty((k, pontos.shape[1]))
+    centros[0] = pontos[rng.integers(n)]
+    distancias = ((pontos - centros[0]) ** 2).sum(axis=1)
+    for c in range(1, k):
+        total = distancias.sum()
+        escolhido = rng.choice(n, p=distancias / total) if total > 0 else rng.integers(n)
+        centros[c] = pontos[escolhido]
+        distancias = np.minimum(distancias, ((pontos - centros[c]) ** 2).sum(axis=1))
+
+    rotulos = np.full(n, -1)
+    for _ in range(max_iteracoes):
+        novos_rotulos = ((pontos[:, None, :] - centros[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        if np.array_equal(novos_rotulos, rotulos):
+            break
+        rotulos = novos_rotulos
+        for c in range(k):
+            membros = pontos[rotulos == c]
+            if len(membros):
+                centros[c] = membros.mean(axis=0)
+    return rotulos
+
+
+def particionar(pontos, tamanho_max_grupo=TAMANHO_MAX_GRUPO, semente=SEMENTE):
+    """
+    Divide os pontos hierarquicamente: k-means com k = ceil(n / tamanho_max_grupo) e,
+    em seguida, cada grupo ainda maior que o limite é dividido da mesma forma.
+    Retorna a lista de grupos (arrays com os índices dos pontos).
+    """
+    rng = np.random.default_rng(semente)
+    pendentes = [np.arange(len(pontos))]
+    grupos = []
+    while pendentes:
+        grupo = pendentes.pop()
+        if len(grupo) <= tamanho_max_grupo:
+            grupos.append(grupo)
+            continue
+        k = math.ceil(len(grupo) / tamanho_max_grupo)
+        rotulos = kmeans(pontos[grupo], k, rng)
+        partes = [grupo[rotulos == c] for c in range(k) if (rotulos == c).any()]
+        if len(partes) == 1:
+            # Pontos coincidentes: o k-means não separa, então divide pela ordem
+            partes = np.array_split(grupo, k)
+        pendentes.extend(partes)
+    return grupos
+
+
+def resolver_grupo(submatriz):
+    """Ciclo ótimo (índices locais) de um grupo. Roda dentro de um processo do pool."""
+    if len(submatriz) <= 3:
+        # Com até 3 cidades o ciclo é único (a menos do sentido)
+        rota = list(range(len(submatriz)))
+        if len(rota) == 3 and submatriz[0, 2] + submatriz[2, 1] + submatriz[1, 0] < \
+                submatriz[0, 1] + submatriz[1, 2] + submatriz[2, 0]:
+            rota = [0, 2, 1]
+        return rota
+    rota, _, _ = branch_and_bound_tsp(pd.DataFrame(submatriz))
+    return rota if rota is not None else list(range(len(submatriz)))
+
+
+def resolver_grupo_compartilhado(indices):
+    """Resolve o grupo lendo a submatriz da matriz compartilhada anexada ao trabalhador."""
+    matriz = matriz_trabalhador().matriz
+    return resolver_grupo(matriz[np.ix_(indices, indices)])
+
+
+def custo_ciclo(matriz, rota):
+    rota = np.asarray(rota)
+    return float(matriz[rota, np.roll(rota, -1)].sum())
+
+
+def dois_opt(matriz, rota, max_passadas=MAX_PASSADAS_2OPT):
+    """
+    Busca local 2-opt com a primeira cidade fixa. Para cada posição i, o ganho de todas as
+    inversões rota[i+1..j] é calculado de uma vez com NumPy. Vale para matrizes assimétricas:
+    as arestas internas do trecho invertido entram pela soma acumulada do sentido oposto.
+    """
+    rota = np.array(rota)
+    n = len(rota)
+    if n < 4:
+        return rota.tolist()
+
+    for _ in range(max_passadas):
+        melhorou = False
+        desatualizado = True
+        for i in range(n - 2):
+            if desatualizado:
+                seguinte = np.roll(rota, -1)
+                frente = matriz[rota, seguinte]          # aresta rota[k] -> rota[k+1]
+                tras = matriz[seguinte, rota]            # aresta rota[k+1] -> rota[k]
+                acumulado_frente = np.concatenate([[0.0], np.cumsum(frente)])
+                acumulado_tras = np.concatenate([[0.0], np.cumsum(tras)])
+                desatualizado = False
+
+            j = np.arange(i + 2, n)
+            internas = (acumulado_tras[j] - acumulado_tras[i + 1]) - (acumulado_frente[j] - acumulado_frente[i + 1])
+            with np.errstate(invalid='ignore'):
+                ganho = (matriz[rota[i], rota[j]] + matriz[rota[i + 1], seguinte[j]]
+                         - frente[i] - frente[j] + internas)
+            ganho[np.isnan(ganho)] = np.inf
+            melhor = int(np.argmin(ganho))
+            if ganho[melhor] < -1e-9:
+                fim = j[melhor]
+                rota[i + 1:fim + 1] = rota[i + 1:fim + 1][::-1].copy()
+                melhorou = True
+                desatualizado = True
+        if not melhorou:
+            break
+    return rota.tolist()
+
+
+def ordenar_grupos(pontos, grupos, grupo_inicial, tamanho_max_grupo=TAMANHO_MAX_GRUPO):
+    """
+    Ordem de visita dos grupos: TSP sobre os centroides, exato (B&B) se houver poucos
+    grupos e vizinho mais próximo + 2-opt caso contrário. Começa pelo grupo do depósito.
+    """
+    centroides = np.array([pontos[grupo].mean(axis=0) for grupo in grupos])
+    ordem_inicial = [grupo_inicial] + [g for g in range(len(grupos)) if g != grupo_inicial]
+    matriz = np.linalg.norm(centroides[ordem_inicial][:, None] - centroides[ordem_inicial][None], axis=2)
+    np.fill_diagonal(matriz, np.inf)
+
+    if len(grupos) <= 3:
+        rota = resolver_grupo(matriz)
+    elif len(grupos) <= tamanho_max_grupo:
+        rota, _, _ = branch_and_bound_tsp(pd.DataFrame(matriz))
+    else:
+        rota, _ = vizinho_mais_proximo_heuristica(pd.DataFrame(matriz))
+        rota = dois_opt(matriz, rota)
+    return [ordem_inicial[g] for g in rota]
+
+
+def costurar_ciclos(matriz, ciclos, deposito):
+    """
+    Junta os ciclos dos grupos (já na ordem de visita) em uma única rota. Cada ciclo é
+    aberto na cidade mais próxima da saída do grupo anterior e percorrido no sentido que
+    deixa a saída mais perto do grupo seguinte.
+    """
+    rota = []
+    saida = deposito
+    for posicao, ciclo in enumerate(ciclos):
+        if posicao == 0:
+            entrada = ciclo.index(deposito)
+        else:
+            entrada = int(np.argmin(matriz[saida, ciclo]))
+        proximo = ciclos[posicao + 1] if posicao + 1 < len(ciclos) else [deposito]
+
+        opcoes = []
+        for caminho in (ciclo[entrada:] + ciclo[:entrada],
+                        ciclo[entrada::-1] + ciclo[:entrada:-1]):
+            interno = float(matriz[caminho[:-1], caminho[1:]].sum())
+            opcoes.append((interno + float(matriz[caminho[-1], proximo].min()), caminho))
+        caminho = min(opcoes, key=lambda opcao: opcao[0])[1]
+        rota.extend(caminho)
+        saida = caminho[-1]
+    return rota
+
+
+def resolver_por_agrupamento(latitudes, longitudes, matriz=None, deposito=0, tamanho_max_grupo=TAMANHO_MAX_GRUPO,
+                             num_processos=NUM_PROCESSOS, polir=True, semente=SEMENTE):
+    """
+    Modo "agrupar primeiro, roteirizar depois" para centenas ou milhares de cidades:
+    1. divide as cidades em grupos geográficos (k-means hierárquico sobre lat/lon);
+    2. resolve cada grupo exatamente com o 'branch_and_bound_tsp', em paralelo;
+    3. ordena os grupos com um TSP sobre os centroides e costura os ciclos;
+    4. melhora a rota final com 2-opt.
+    Sem 'matriz', usa a distância Haversine. Retorna (rota, custo, informações da execução).
+    """
+    inicio = time.perf_counter()
+    if matriz is None:
+        matriz = calcular_matriz_haversine(latitudes, longitudes)
+    matriz = np.array(matriz, dtype=float)
+    np.fill_diagonal(matriz, np.inf)
+
+    pontos = projetar_coordenadas(latitudes, longitudes)
+    grupos = particionar(pontos, tamanho_max_grupo, semente)
+
+    if num_processos > 1 and len(grupos) > 1:
+        # A matriz fica na memória compartilhada: cada trabalhador se anexa uma vez e
+        # as tarefas levam apenas os índices do grupo
+        lote = max(1, len(grupos) // (4 * num_processos))
+        with MatrizCompartilhada.criar(matriz) as compartilhada, \
+                ProcessPoolExecutor(max_workers=num_processos, initializer=inicializar_trabalhador,
+                                    initargs=(compartilhada.descritor,)) as pool:
+            ciclos_locais = list(pool.map(resolver_grupo_compartilhado, grupos, chunksize=lote))
+    else:
+        ciclos_locais = [resolver_grupo(matriz[np.ix_(grupo, grupo)]) for grupo in grupos]
+    ciclos = [[int(grupo[i]) for i in ciclo] for grupo, ciclo in zip(grupos, ciclos_locais)]
+    tempo_grupos = time.perf_counter() - inicio
+
+    grupo_deposito = next(g for g, grupo in enumerate(grupos) if deposito in grupo)
+    ordem = ordenar_grupos(pontos, grupos, grupo_deposito, tamanho_max_grupo)
+    rota = costurar_ciclos(matriz, [ciclos[g] for g in ordem], deposito)
+    custo_costurado = custo_ciclo(matriz, rota)
+
+    if polir:
+        rota = dois_opt(matriz, rota)
+    custo = custo_ciclo(matriz, rota)
+
+    informacoes = {
+        "num_cidades": len(matriz),
+        "num_grupos": len(grupos),
+        "maior_grupo": max(len(grupo) for grupo in grupos),
+        "custo_antes_2opt": custo_costurado,
+        "tempo_grupos_segundos": tempo_grupos,
+        "tempo_total_segundos": time.perf_counter() - inicio,
+    }
+    return rota, custo, informacoes
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Rota para muitas cidades: agrupa, resolve cada grupo e costura.")
+    parser.add_argument('--pontos', default=INPUT_PONTOS_CSV, help="CSV com as colunas cidade, latitude e longitude.")
+    parser.add_argument('--amostra', type=int,
+                        help="Usa N cidades sorteadas do dataset completo em vez do CSV de pontos de visita.")
+    parser.add_argument('--tamanho-grupo', type=int, default=TAMANHO_MAX_GRUPO)
+    parser.add_argument('--processos', type=int, default=NUM_PROCESSOS)
+    return parser.parse_args()
+
+
+# Execução Principal
+if __name__ == "__main__":
+    args = ler_argumentos()
+    if args.amostra:
+        from app.pipeline_dados import carregar_cidades
+        pontos_de_visita = carregar_cidades().sample(n=args.amostra, random_state=SEMENTE).reset_index(drop=True)
+    else:
+        try:
+            pontos_de_visita = pd.read_csv(args.pontos)
+        except FileNotFoundError:
+            print(f"Erro: O arquivo '{args.pontos}' não foi encontrado.")
+            sys.exit(1)
+
+    print(f"Resolvendo {len(pontos_de_visita)} cidades por agrupamento (grupos de até {args.tamanho_grupo})...\n")
+    rota, custo, informacoes = resolver_por_agrupamento(
+        pontos_de_visita['latitude'], pontos_de_visita['longitude'],
+        tamanho_max_grupo=args.tamanho_grupo, num_processos=args.processos)
+
+    print(f"Grupos: {informacoes['num_grupos']} (maior: {informacoes['maior_grupo']} cidades)")
+    print(f"Custo antes do 2-opt: {informacoes['custo_antes_2opt']:.2f} km")
+    print(f"Custo Total da Rota: {custo:.2f} km (distância Haversine)")
+    print(f"Tempo de Execução: {informacoes['tempo_total_segundos']:.2f} segundos")
+
+    resultados = {
+        "rota_indices": rota,
+        "rota_nomes": pontos_de_visita['cidade'].iloc[rota].tolist(),
+        "custo_total_km": custo,
+        **informacoes,
+    }
+    with open(OUTPUT_RESULTADOS_JSON, 'w') as f:
+        json.dump(resultados, f, indent=4, ensure_ascii=False)
+    print(f"Resultados salvos em '{OUTPUT_RESULTADOS_JSON}'.")
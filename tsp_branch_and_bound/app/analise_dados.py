@@ -2,17 +2,40 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import json
 import folium
 from streamlit_folium import st_folium  # CORREÇÃO 1: Importa st_folium
 import os
 import sys
 import math  # CORREÇÃO 2: Importa a biblioteca math
+import time
+from contextlib import contextmanager
+
+# Permite importar os módulos de 'app' quando executado via 'streamlit run'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.heuristicas import vizinho_mais_proximo_heuristica
+from app.cenarios import descobrir_cenarios, ler_arquivo_resultado
+from app.simulacao import GerenciadorSimulacoes, MAX_CIDADES_SIMULACAO
+from app.cache_resultados import CacheResultados
+from app.estatisticas_resultados import calcular_estatisticas
 
 # --- Configuração de Paths ---
 # Os paths são relativos à pasta raiz (onde o main.py é executado)
 RESULTS_DIR = 'results'
 
+# Tolerância (graus) da simplificação das polylines: ~100 m, invisível no zoom dos mapas
+TOLERANCIA_SIMPLIFICACAO_GRAUS = 0.001
+
+# Simulações em segundo plano: threads do pool e intervalo de atualização do progresso (segundos)
+NUM_TRABALHADORES_SIMULACAO = 1
+INTERVALO_PROGRESSO_SEGUNDOS = 1.0
+
+# Orçamento de tempo por aba em cada rerun do Streamlit (segundos)
+ORCAMENTO_TEMPO_ABA_SEGUNDOS = 0.5
+
+# Trechos da rota ótima listados na tabela dos mais longos
+NUM_TRECHOS_MAIS_LONGOS = 5
+
 
 # Funções de Lógica
 
@@ -45,92 +68,241 @@ def decode_polyline(polyline_str):
     return coordinates
 
 
-def vizinho_mais_proximo_heuristica(matriz_distancias):
-    """Implementa a heurística do Vizinho Mais Próximo para o TSP."""
-    n = len(matriz_distancias)
-    cidade_atual = 0
-    rota = [cidade_atual]
-    nao_visitadas = set(range(1, n))
-    custo_total = 0
+def simplificar_trajetoria(coordenadas, tolerancia):
+    """
+    Simplifica uma trajetória com o algoritmo de Ramer-Douglas-Peucker (versão iterativa).
+    Remove os pontos que ficam a menos de 'tolerancia' (graus) do segmento que os substitui.
+    """
+    pontos = np.asarray(coordenadas, dtype=float)
+    if len(pontos) < 3:
+        return [tuple(p) for p in pontos]
+
+    manter = np.zeros(len(pontos), dtype=bool)
+    manter[0] = manter[-1] = True
+    pilha = [(0, len(pontos) - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        if fim - inicio < 2:
+            continue
+        a, b = pontos[inicio], pontos[fim]
+        intermediarios = pontos[inicio + 1:fim]
+        segmento = b - a
+        comprimento = np.hypot(*segmento)
+        if comprimento == 0:
+            distancias = np.hypot(*(intermediarios - a).T)
+        else:
+            distancias = np.abs(segmento[0] * (intermediarios[:, 1] - a[1]) -
+                                segmento[1] * (intermediarios[:, 0] - a[0])) / comprimento
+        idx_max = int(np.argmax(distancias))
+        if distancias[idx_max] > tolerancia:
+            meio = inicio + 1 + idx_max
+            manter[meio] = True
+            pilha.append((inicio, meio))
+            pilha.append((meio, fim))
+    return [tuple(p) for p in pontos[manter]]
+
+
+@contextmanager
+def medir_tempo_aba(nome_aba):
+    """Mede o tempo gasto para renderizar uma aba e guarda no session_state."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        st.session_state.setdefault('tempos_abas', {})[nome_aba] = time.perf_counter() - inicio
+
+
+def exibir_orcamento_tempo():
+    """Mostra na barra lateral o tempo de cada aba no último rerun, comparado ao orçamento."""
+    tempos = st.session_state.get('tempos_abas', {})
+    st.sidebar.subheader("Tempo por Aba (último rerun)")
+    st.sidebar.caption(f"Orçamento: {ORCAMENTO_TEMPO_ABA_SEGUNDOS * 1000:.0f} ms por aba")
+    for nome_aba, segundos in tempos.items():
+        texto = f"{nome_aba}: {segundos * 1000:.0f} ms"
+        if segundos > ORCAMENTO_TEMPO_ABA_SEGUNDOS:
+            st.sidebar.warning(texto + " (acima do orçamento)")
+        else:
+            st.sidebar.write(texto)
 
-    # Converte para NumPy para acesso rápido e seguro
-    matriz_np = matriz_distancias.fillna(np.inf).values
-    np.fill_diagonal(matriz_np, np.inf)
 
-    while nao_visitadas:
-        # Encontra a cidade mais próxima (índice)
-        proxima_cidade_idx = min(nao_visitadas, key=lambda cidade_idx: matriz_np[cidade_atual, cidade_idx])
+# Funções com cache (chaveadas pelo hash das entradas)
 
-        custo = matriz_np[cidade_atual, proxima_cidade_idx]
+@st.cache_data
+def decodificar_geometria(polyline_str, tolerancia=TOLERANCIA_SIMPLIFICACAO_GRAUS):
+    """Decodifica e simplifica uma polyline. O resultado fica em cache entre os reruns."""
+    return simplificar_trajetoria(decode_polyline(polyline_str), tolerancia)
 
-        if not np.isfinite(custo):
-            print("Heurística: Rota impossível encontrada (custo infinito).")
-            break
 
-        custo_total += custo
-        cidade_atual = proxima_cidade_idx
-        rota.append(cidade_atual)
-        nao_visitadas.remove(cidade_atual)
+@st.cache_data
+def calcular_heuristica(matriz_distancias):
+    """Heurística do Vizinho Mais Próximo, recalculada apenas quando a matriz muda."""
+    return vizinho_mais_proximo_heuristica(matriz_distancias)
+
+
+@st.cache_data
+def estatisticas_da_matriz(matriz_distancias, rota_indices):
+    """Estatísticas de cenários resolvidos antes do arquivo pré-calculado, calculadas uma única vez."""
+    return calcular_estatisticas(matriz_distancias.to_numpy(dtype=float), list(matriz_distancias.columns),
+                                 list(rota_indices))
+
+
+@st.cache_resource
+def construir_mapa_rota(pontos_df, rota_indices, trajetos, cor_linha):
+    """
+    Constrói o mapa folium de uma rota. 'rota_indices' e 'trajetos' (polylines de cada
+    trecho da rota, na ordem de visita) são tuplas para servir de chave do cache.
+    """
+    cidade_inicial_dados = pontos_df.iloc[rota_indices[0]]
+    m = folium.Map(location=[cidade_inicial_dados['latitude'], cidade_inicial_dados['longitude']], zoom_start=7,
+                   control_scale=True)
+
+    for idx_parada, origem_idx in enumerate(rota_indices):
+        if trajetos[idx_parada] is not None:
+            trajetoria = decodificar_geometria(trajetos[idx_parada])
+            folium.PolyLine(trajetoria, color=cor_linha, weight=4, opacity=0.8).add_to(m)
+        else:
+            # Trecho sem geometria baixada (ex: simulação): linha reta tracejada
+            destino = pontos_df.iloc[rota_indices[(idx_parada + 1) % len(rota_indices)]]
+            origem = pontos_df.iloc[origem_idx]
+            folium.PolyLine([[origem['latitude'], origem['longitude']], [destino['latitude'], destino['longitude']]],
+                            color=cor_linha, weight=2, opacity=0.6, dash_array='6').add_to(m)
+
+        row = pontos_df.iloc[origem_idx]
+        if idx_parada == 0:
+            cor = 'green'
+            popup = f"Início/Fim: {row['cidade']}"
+        else:
+            cor = 'blue'
+            popup = f"Parada {idx_parada}: {row['cidade']}"
+
+        folium.Marker([row['latitude'], row['longitude']], popup=popup,
+                      icon=folium.Icon(color=cor, icon='info-sign')).add_to(m)
+    return m
 
-    # Voltar para a cidade inicial
-    custo_retorno = matriz_np[cidade_atual, 0]
-    if np.isfinite(custo_retorno):
-        custo_total += custo_retorno
-    else:
-        print("Heurística: Rota impossível para retornar ao início.")
 
-    return rota, custo_total
+def trajetos_da_rota(rota_indices, geometrias_rotas):
+    """Polylines dos trechos da rota (incluindo o retorno ao início), na ordem de visita."""
+    trajetos = []
+    for idx_parada, origem_idx in enumerate(rota_indices):
+        destino_idx = rota_indices[(idx_parada + 1) % len(rota_indices)]
+        trajetos.append(geometrias_rotas.get(f"{origem_idx}-{destino_idx}"))
+    return tuple(trajetos)
+
+
+@st.cache_resource
+def obter_gerenciador_simulacoes():
+    """
+    Pool de simulações compartilhado entre os reruns e as sessões do dashboard. Os resultados
+    ficam também no cache em disco (data/cache/resultados.json), compartilhado com o 'branch_e_bound.py'.
+    """
+    return GerenciadorSimulacoes(num_trabalhadores=NUM_TRABALHADORES_SIMULACAO, cache_resultados=CacheResultados())
 
 
 # Funções de carregamento de dados
 
-@st.cache_data
-def carregar_dados():
-    """Carrega todos os dados necessários para o dashboard."""
-    try:
-        # Cenário original (10 cidades)
-        matriz_distancias = pd.read_csv(os.path.join(RESULTS_DIR, 'matriz_distancias.csv'), index_col=0)
-        pontos_de_visita = pd.read_csv(os.path.join(RESULTS_DIR, 'pontos_de_visita.csv'))
-        with open(os.path.join(RESULTS_DIR, 'resultados_branch_and_bound.json'), 'r') as f:
-            resultados_bnb = json.load(f)
-        with open(os.path.join(RESULTS_DIR, 'geometrias_rotas.json'), 'r') as f:
-            geometrias_rotas = json.load(f)
-
-        # Cenário de sensibilidade (9 cidades)
-        matriz_distancias_sensibilidade = pd.read_csv(os.path.join(RESULTS_DIR, 'matriz_distancias_sensibilidade.csv'),
-                                                      index_col=0)
-        pontos_de_visita_sensibilidade = pd.read_csv(os.path.join(RESULTS_DIR, 'pontos_de_visita_sensibilidade.csv'))
-        with open(os.path.join(RESULTS_DIR, 'resultados_branch_and_bound_sensibilidade.json'), 'r') as f:
-            resultados_bnb_sensibilidade = json.load(f)
-        with open(os.path.join(RESULTS_DIR, 'geometrias_rotas_sensibilidade.json'), 'r') as f:
-            geometrias_rotas_sensibilidade = json.load(f)
-
-    except FileNotFoundError as e:
-        st.error(f"Erro ao carregar dados. Arquivo não encontrado: {e.filename}")
+@st.cache_data(ttl=5)
+def listar_cenarios(diretorio=RESULTS_DIR):
+    """Descobre os cenários em 'results/' (apenas listagem de arquivos, nada é carregado)."""
+    return descobrir_cenarios(diretorio)
+
+
+@st.cache_data(show_spinner="Carregando dados do cenário...")
+def carregar_componente(caminho, mtime_ns):
+    """Lê um arquivo de resultados. O mtime faz parte da chave e invalida o cache quando o arquivo muda."""
+    return ler_arquivo_resultado(caminho)
+
+
+def carregar(cenario, componente):
+    """Carrega sob demanda um componente (resultados, matriz, pontos, geometrias) de um cenário."""
+    assinatura = cenario.assinatura(componente)
+    if assinatura is None:
+        st.error(f"Erro ao carregar dados. Arquivo não encontrado: {cenario.caminho(componente)}")
         st.error("Execute o 'main.py' (Opção 1) e os scripts de sensibilidade para gerar todos os arquivos.")
         st.stop()
-
-    return matriz_distancias, pontos_de_visita, resultados_bnb, geometrias_rotas, \
-        resultados_bnb_sensibilidade, matriz_distancias_sensibilidade, pontos_de_visita_sensibilidade, \
-        geometrias_rotas_sensibilidade
+    return carregar_componente(*assinatura)
+
+
+def carregar_estatisticas(cenario):
+    """
+    Estatísticas pré-calculadas na resolução (resumo e histograma da matriz, trechos da rota).
+    Cenários gerados antes delas existirem recorrem à matriz completa, uma única vez.
+    """
+    if cenario.disponivel('estatisticas'):
+        return carregar(cenario, 'estatisticas')
+    st.caption("Estatísticas calculadas a partir da matriz completa. Execute o 'estatisticas_resultados.py' "
+               "(ou resolva o cenário novamente) para salvá-las junto aos resultados.")
+    rota_indices = carregar(cenario, 'resultados').get("rota_otima_indices") or []
+    return estatisticas_da_matriz(carregar(cenario, 'matriz'), tuple(rota_indices))
+
+
+def custo_total(resultados):
+    """(custo, unidade) dos resultados; arquivos anteriores à unidade só têm 'custo_total_km'."""
+    if 'custo_total' in resultados:
+        return resultados['custo_total'], resultados.get('unidade', 'km')
+    return resultados['custo_total_km'], 'km'
+
+
+def custo_total_km(cenario, resultados):
+    """
+    Custo da rota em km. Se ela foi otimizada em outra unidade (--pesos), os trechos são somados
+    na matriz de distâncias do cenário, para comparar com a heurística e com os outros cenários.
+    """
+    custo, unidade = custo_total(resultados)
+    if unidade == 'km':
+        return custo
+    rota = np.asarray(resultados['rota_otima_indices'])
+    valores = carregar(cenario, 'matriz').to_numpy(dtype=float)
+    return float(valores[rota, np.roll(rota, -1)].sum())
 
 
 # Funções de dashboard
 
-def dashboard_analise(matriz_distancias, pontos_de_visita):
+def tabela_resumo(resumo):
+    """Resumo salvo (formato do describe()) como uma tabela de uma linha."""
+    return pd.DataFrame([resumo]).style.format(precision=2)
+
+
+def serie_histograma(histograma, unidade):
+    """Contagens do histograma indexadas pelo centro de cada faixa (eixo numérico, em ordem)."""
+    bordas = np.asarray(histograma["bordas"], dtype=float)
+    centros = pd.Index(((bordas[:-1] + bordas[1:]) / 2).round(1), name=f"Distância ({unidade})")
+    return pd.Series(histograma["contagens"], index=centros, name="Pares de cidades")
+
+
+def tabela_trechos(trechos):
+    """Trechos da rota na ordem de visita, numerados a partir de 1."""
+    tabela = pd.DataFrame(trechos).rename(columns={"origem": "Origem", "destino": "Destino", "custo": "Custo"})
+    tabela.index = pd.RangeIndex(1, len(tabela) + 1, name="Trecho")
+    return tabela
+
+
+def dashboard_analise(estatisticas, pontos_de_visita):
     st.header("1. Análise Exploratória de Dados")
     st.markdown("Visão geral da base de cidades e distâncias.")
     st.subheader("Cidades Selecionadas")
     st.dataframe(pontos_de_visita)
-    st.subheader("Estatísticas da Matriz de Distâncias (km)")
-    distancias = matriz_distancias.values.flatten()
-    distancias = distancias[np.isfinite(distancias) & (distancias > 0)]
-    if len(distancias) > 0:
-        stats = pd.Series(distancias).describe().to_frame().T
-        st.dataframe(stats.style.format(precision=2))
-    st.subheader("Distribuição das Distâncias entre Cidades")
-    if len(distancias) > 0:
-        st.bar_chart(pd.Series(distancias))
+
+    # Tudo abaixo vem das estatísticas pré-calculadas: nenhuma passada pela matriz completa
+    unidade = estatisticas["unidade"]
+    matriz = estatisticas["matriz"]
+    st.subheader(f"Estatísticas da Matriz de Distâncias ({unidade})")
+    if matriz["resumo"]["count"] > 0:
+        st.dataframe(tabela_resumo(matriz["resumo"]))
+        st.subheader("Distribuição das Distâncias entre Cidades")
+        st.bar_chart(serie_histograma(matriz["histograma"], unidade))
+
+    rota = estatisticas.get("rota")
+    if rota:
+        st.subheader(f"Trechos da Rota Ótima ({unidade})")
+        st.dataframe(tabela_resumo(rota["resumo"]))
+        trechos = tabela_trechos(rota["trechos"])
+        col_grafico, col_tabela = st.columns(2)
+        with col_grafico:
+            st.markdown("**Custo de Cada Trecho, na Ordem de Visita**")
+            st.bar_chart(trechos["Custo"])
+        with col_tabela:
+            st.markdown(f"**{NUM_TRECHOS_MAIS_LONGOS} Trechos Mais Longos**")
+            st.dataframe(trechos.nlargest(NUM_TRECHOS_MAIS_LONGOS, "Custo").style.format({"Custo": "{:.2f}"}))
 
 
 def dashboard_visualizacao_rota(pontos_de_visita, resultados_bnb, geometrias_rotas):
@@ -140,36 +312,12 @@ def dashboard_visualizacao_rota(pontos_de_visita, resultados_bnb, geometrias_rot
         st.error("Nenhuma rota ótima foi encontrada.")
         return
 
-    cidade_inicial_idx = rota_indices[0]
-    cidade_inicial_dados = pontos_de_visita.iloc[cidade_inicial_idx]
-
-    m = folium.Map(location=[cidade_inicial_dados['latitude'], cidade_inicial_dados['longitude']], zoom_start=7,
-                   control_scale=True)
-
-    for idx_parada in range(len(rota_indices)):
-        origem_idx = rota_indices[idx_parada]
-        destino_idx = rota_indices[idx_parada + 1] if idx_parada < len(rota_indices) - 1 else rota_indices[0]
-        chave_rota = f"{origem_idx}-{destino_idx}"
-
-        if chave_rota in geometrias_rotas and geometrias_rotas[chave_rota] is not None:
-            trajetoria = decode_polyline(geometrias_rotas[chave_rota])
-            folium.PolyLine(trajetoria, color="red", weight=4, opacity=0.8).add_to(m)
-
-        row = pontos_de_visita.iloc[origem_idx]
-
-        if idx_parada == 0:
-            cor = 'green'
-            popup = f"Início/Fim: {row['cidade']}"
-        else:
-            cor = 'blue'
-            popup = f"Parada {idx_parada}: {row['cidade']}"
-
-        folium.Marker([row['latitude'], row['longitude']], popup=popup,
-                      icon=folium.Icon(color=cor, icon='info-sign')).add_to(m)
+    m = construir_mapa_rota(pontos_de_visita, tuple(rota_indices),
+                            trajetos_da_rota(rota_indices, geometrias_rotas), "red")
 
     st.subheader("Mapa Interativo da Rota Ótima (Traçado de Rodovias)")
     # CORREÇÃO 1: Substitui folium_static por st_folium
-    st_folium(m, width=1000, height=600)
+    st_folium(m, width=1000, height=600, returned_objects=[])
 
     st.subheader("Ordem de Visita")
     st.dataframe(pd.DataFrame({"Cidade": resultados_bnb["rota_otima_nomes"]}))
@@ -181,41 +329,52 @@ def mapa_sensibilidade(pontos_df, resultados_dict, geometrias_dict, map_title, m
     if not rota_indices:
         return st.error(f"Nenhuma rota encontrada para o cenário: {map_title}.")
 
-    cidade_inicial_idx = rota_indices[0]
-    cidade_inicial_dados = pontos_df.iloc[cidade_inicial_idx]
-
-    m = folium.Map(
-        location=[cidade_inicial_dados['latitude'], cidade_inicial_dados['longitude']],
-        zoom_start=7,
-        control_scale=True
-    )
+    m = construir_mapa_rota(pontos_df, tuple(rota_indices), trajetos_da_rota(rota_indices, geometrias_dict), map_color)
 
-    for idx_parada in range(len(rota_indices)):
-        origem_idx = rota_indices[idx_parada]
-        destino_idx = rota_indices[idx_parada + 1] if idx_parada < len(rota_indices) - 1 else rota_indices[0]
-        chave_rota = f"{origem_idx}-{destino_idx}"
+    st.subheader(map_title)
+    # CORREÇÃO 1: Substitui folium_static por st_folium
+    st_folium(m, width=380, height=350, returned_objects=[])
 
-        if chave_rota in geometrias_dict and geometrias_dict[chave_rota] is not None:
-            trajetoria = decode_polyline(geometrias_dict[chave_rota])
-            folium.PolyLine(trajetoria, color=map_color, weight=4, opacity=0.8).add_to(m)
 
-        row = pontos_df.iloc[origem_idx]
-        if idx_parada == 0:
-            cor = 'green'
-            popup = f"Início/Fim: {row['cidade']}"
-        else:
-            cor = 'blue'
-            popup = f"Parada {idx_parada}: {row['cidade']}"
-
-        folium.Marker(
-            [row['latitude'], row['longitude']],
-            popup=popup,
-            icon=folium.Icon(color=cor, icon='info-sign')
-        ).add_to(m)
+def dashboard_instrumentacao(instrumentacao):
+    """ Gráficos da instrumentação da busca (gerada com 'branch_e_bound.py --instrumentar'). """
+    st.markdown("---")
+    st.subheader("Instrumentação da Busca")
+    if not instrumentacao:
+        st.caption("Execute o 'branch_e_bound.py --instrumentar' para gerar as estatísticas detalhadas da busca.")
+        return
 
-    st.subheader(map_title)
-    # CORREÇÃO 1: Substitui folium_static por st_folium
-    st_folium(m, width=380, height=350)
+    tempo_total = instrumentacao['tempo_total_segundos'] or 1.0
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Nós Gerados", f"{instrumentacao['nos_gerados']:,}")
+    col2.metric("Nós Podados", f"{instrumentacao['nos_podados']:,}",
+                delta=f"{instrumentacao.get('nos_dominados', 0):,} por dominância", delta_color="off")
+    col3.metric("Pico da Fila de Prioridade", f"{instrumentacao['pico_fila']:,}")
+    # Resultados antigos não separam a expansão (kernels) do bound calculado fora deles
+    tempo_expansao = instrumentacao.get('tempo_expansao_segundos', 0.0)
+    tempo_bound = instrumentacao['tempo_bound_segundos']
+    col4.metric("Tempo na Expansão e no Bound", f"{tempo_expansao + tempo_bound:.2f} s",
+                delta=f"{100 * (tempo_expansao + tempo_bound) / tempo_total:.1f}% do total",
+                delta_color="off")
+
+    st.markdown("**Distribuição do Tempo de Execução (s)**")
+    tempo_outros = max(tempo_total - tempo_expansao - tempo_bound - instrumentacao['tempo_fila_segundos'], 0.0)
+    st.bar_chart(pd.Series({
+        "Expansão dos nós (kernels, com o bound das duas menores arestas)": tempo_expansao,
+        "Bound fora dos kernels (raiz e atribuição)": tempo_bound,
+        "Operações da fila (heap)": instrumentacao['tempo_fila_segundos'],
+        "Demais (cópias de listas, laço)": tempo_outros
+    }))
+
+    col_poda, col_incumbente = st.columns(2)
+    with col_poda:
+        st.markdown("**Podas por Profundidade da Árvore**")
+        st.bar_chart(pd.Series(instrumentacao['podas_por_profundidade'], name="Podas").rename_axis("Profundidade"))
+    with col_incumbente:
+        st.markdown("**Evolução da Melhor Solução (Incumbente)**")
+        linha_tempo = pd.DataFrame(instrumentacao['linha_tempo_incumbente'])
+        if not linha_tempo.empty:
+            st.line_chart(linha_tempo.set_index("nos_expandidos")["custo"])
 
 
 def dashboard_resultados_algoritmo(resultados_bnb):
@@ -223,29 +382,33 @@ def dashboard_resultados_algoritmo(resultados_bnb):
     st.header("Indicadores de Desempenho do Branch and Bound")
     st.markdown("Métricas que comprovam a eficiência do algoritmo na busca pela solução ótima.")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Custo Ótimo Encontrado (km)", f"{resultados_bnb['custo_total_km']:.2f}")
+    custo, unidade = custo_total(resultados_bnb)
+    col1.metric(f"Custo Ótimo Encontrado ({unidade})", f"{custo:.2f}")
     col2.metric("Tempo de Execução (s)", f"{resultados_bnb['tempo_execucao_segundos']:.4f}")
     col3.metric("Nós Expandidos (Evidência de Poda)", f"{resultados_bnb['nos_expandidos']:,}")
     st.markdown("---")
     st.subheader("Análise da Poda e Limites")
     st.info(
         # CORREÇÃO 2: Substitui np.math.factorial por math.factorial
-        f"O algoritmo explorou **{resultados_bnb['nos_expandidos']:,}** nós. Este número é drasticamente menor do que o total de **{math.factorial(10):,}** rotas possíveis, demonstrando a eficácia da **poda por limite (Bound Pruning)**.")
+        f"O algoritmo explorou **{resultados_bnb['nos_expandidos']:,}** nós. Este número é drasticamente menor do que o total de **{math.factorial(len(resultados_bnb['rota_otima_indices'])):,}** rotas possíveis, demonstrando a eficácia da **poda por limite (Bound Pruning)**.")
+    dashboard_instrumentacao(resultados_bnb.get("instrumentacao"))
     st.write("Dados completos da execução:")
     st.json(resultados_bnb)
 
 
-def dashboard_comparativo_e_validacao(matriz_distancias, pontos_de_visita, resultados_bnb,
-                                      resultados_bnb_sensibilidade, pontos_de_visita_sensibilidade, geometrias_rotas,
-                                      geometrias_rotas_sensibilidade):
+def dashboard_comparativo_e_validacao(cenario_base, cenario_comparado):
     """ Dashboard para Heurística e Análise de Sensibilidade (Critérios 5.1 e 5.2). """
     st.header("Comparativo de Desempenho e Análise de Sensibilidade")
     st.subheader("Branch and Bound vs. Heurística do Vizinho Mais Próximo")
 
-    rota_heuristica_indices, custo_heuristica = vizinho_mais_proximo_heuristica(matriz_distancias)
+    matriz_distancias = carregar(cenario_base, 'matriz')
+    pontos_de_visita = carregar(cenario_base, 'pontos')
+    resultados_bnb = carregar(cenario_base, 'resultados')
+
+    rota_heuristica_indices, custo_heuristica = calcular_heuristica(matriz_distancias)
     rota_heuristica_nomes = [pontos_de_visita.iloc[i]['cidade'] for i in rota_heuristica_indices]
     rota_heuristica_nomes_completa = rota_heuristica_nomes + [rota_heuristica_nomes[0]]
-    custo_otimo = resultados_bnb['custo_total_km']
+    custo_otimo = custo_total_km(cenario_base, resultados_bnb)
     diferenca_percentual = ((custo_heuristica - custo_otimo) / custo_otimo) * 100
 
     col1, col2 = st.columns(2)
@@ -259,59 +422,152 @@ def dashboard_comparativo_e_validacao(matriz_distancias, pontos_de_visita, resul
         st.write(f"**Rota:** {' → '.join(rota_heuristica_nomes_completa)}")
 
     st.markdown("---")
-    st.subheader("Análise de Sensibilidade: Cenário de 9 Cidades (Remoção de Curitiba)")
-    st.markdown("Avaliamos o impacto da remoção de **Curitiba** no custo e na rota ótima.")
+    if cenario_comparado is None:
+        st.info("Nenhum outro cenário encontrado em 'results/' para a análise de sensibilidade.")
+        return
+
+    pontos_comparado = carregar(cenario_comparado, 'pontos')
+    resultados_comparado = carregar(cenario_comparado, 'resultados')
+    n_base, n_comparado = len(pontos_de_visita), len(pontos_comparado)
+
+    removidas = sorted(set(pontos_de_visita['cidade']) - set(pontos_comparado['cidade']))
+    adicionadas = sorted(set(pontos_comparado['cidade']) - set(pontos_de_visita['cidade']))
+    alteracoes = [f"Remoção de {c.title()}" for c in removidas] + [f"Inclusão de {c.title()}" for c in adicionadas]
+    descricao_alteracao = ", ".join(alteracoes) or "mesmas cidades"
 
-    custo_original = resultados_bnb['custo_total_km']
+    st.subheader(f"Análise de Sensibilidade: Cenário de {n_comparado} Cidades ({descricao_alteracao})")
+    st.markdown(f"Avaliamos o impacto da alteração (**{descricao_alteracao}**) no custo e na rota ótima.")
+
+    custo_original = custo_otimo
     rota_original = ' → '.join(resultados_bnb['rota_otima_nomes'])
-    custo_sensibilidade = resultados_bnb_sensibilidade['custo_total_km']
-    rota_sensibilidade = ' → '.join(resultados_bnb_sensibilidade['rota_otima_nomes'])
+    custo_sensibilidade = custo_total_km(cenario_comparado, resultados_comparado)
+    rota_sensibilidade = ' → '.join(resultados_comparado['rota_otima_nomes'])
     economia = custo_original - custo_sensibilidade
 
     col_mapa_orig, col_mapa_sens = st.columns(2)
     with col_mapa_orig:
-        mapa_sensibilidade(pontos_de_visita, resultados_bnb, geometrias_rotas,
-                           "CENÁRIO 1: Rota Original (10 Cidades)", "green")
+        mapa_sensibilidade(pontos_de_visita, resultados_bnb, carregar(cenario_base, 'geometrias'),
+                           f"CENÁRIO 1: Rota {cenario_base.nome.title()} ({n_base} Cidades)", "green")
         st.metric("Custo Total (km)", f"{custo_original:.2f}")
     with col_mapa_sens:
-        mapa_sensibilidade(pontos_de_visita_sensibilidade, resultados_bnb_sensibilidade, geometrias_rotas_sensibilidade,
-                           "CENÁRIO 2: Rota Otimizada (9 Cidades)", "blue")
+        mapa_sensibilidade(pontos_comparado, resultados_comparado, carregar(cenario_comparado, 'geometrias'),
+                           f"CENÁRIO 2: Rota {cenario_comparado.nome.title()} ({n_comparado} Cidades)", "blue")
         st.metric("Custo Total (km)", f"{custo_sensibilidade:.2f}", delta=f"-{economia:.2f} km de economia",
                   delta_color="inverse")
 
     st.markdown("---")
     st.info(
-        f"**Conclusão da Análise:** A remoção de **Curitiba** resultou em uma economia de **{economia:.2f} km** e simplificou o percurso, confirmando que a **restrição** do ponto de visita tem um alto impacto no custo total da logística.")
-    st.write(f"**Rota 10 Cidades:** {rota_original}")
-    st.write(f"**Rota 9 Cidades:** {rota_sensibilidade}")
+        f"**Conclusão da Análise:** A alteração (**{descricao_alteracao}**) resultou em uma variação de **{economia:.2f} km** no custo total, mostrando o impacto da **restrição** dos pontos de visita no custo total da logística.")
+    st.write(f"**Rota {n_base} Cidades:** {rota_original}")
+    st.write(f"**Rota {n_comparado} Cidades:** {rota_sensibilidade}")
+
+
+@st.fragment(run_every=INTERVALO_PROGRESSO_SEGUNDOS)
+def painel_progresso_simulacao(simulacao):
+    """ Atualiza apenas este trecho da página enquanto a simulação roda em segundo plano. """
+    if simulacao.concluida:
+        st.rerun()  # Rerun completo para exibir o resultado
+
+    progresso = simulacao.progresso()
+    st.info("Resolvendo o cenário em segundo plano... o restante do dashboard continua disponível.")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tempo (s)", f"{progresso['segundos']:.1f}")
+    col2.metric("Nós Expandidos", f"{progresso['nos_expandidos']:,}")
+    col3.metric("Nós Podados", f"{progresso['nos_podados']:,}")
+    melhor = progresso['melhor_custo']
+    col4.metric("Melhor Custo (km)", f"{melhor:.2f}" if melhor is not None else "-")
+
+
+def dashboard_simulacao(cenario_base):
+    """ Simulação interativa: escolha das cidades e do depósito, resolvida com o B&B em segundo plano. """
+    st.header("Simulação de Cenários (What-if)")
+    st.markdown("Adicione ou remova cidades e troque o depósito para avaliar o impacto na rota ótima. "
+                "A resolução usa a matriz já carregada e cada seleção é calculada uma única vez.")
+
+    matriz_distancias = carregar(cenario_base, 'matriz')
+    pontos_de_visita = carregar(cenario_base, 'pontos')
+    resultados_bnb = carregar(cenario_base, 'resultados')
+
+    todas_cidades = list(matriz_distancias.columns)
+    deposito_base = resultados_bnb['rota_otima_nomes'][0]
+    cidades = st.multiselect("Cidades visitadas", todas_cidades, default=todas_cidades)
+    if len(cidades) < 2:
+        st.info("Selecione pelo menos duas cidades.")
+        return
+    if len(cidades) > MAX_CIDADES_SIMULACAO:
+        st.warning(f"Selecione no máximo {MAX_CIDADES_SIMULACAO} cidades para a simulação interativa.")
+        return
+    deposito = st.selectbox("Depósito (início e fim da rota)", cidades,
+                            index=cidades.index(deposito_base) if deposito_base in cidades else 0)
+
+    if set(cidades) == set(todas_cidades) and deposito == deposito_base:
+        # Mesma seleção do cenário: reaproveita o resultado já salvo em 'results/'
+        resultado = dict(resultados_bnb, custo_total_km=custo_total_km(cenario_base, resultados_bnb))
+    else:
+        simulacao = obter_gerenciador_simulacoes().submeter(matriz_distancias, cidades, deposito,
+                                                            cenario_base.assinatura('matriz'))
+        if not simulacao.concluida:
+            painel_progresso_simulacao(simulacao)
+            return
+        resultado = simulacao.resultado()
+
+    if resultado is None:
+        st.error("Nenhuma rota viável encontrada para a seleção.")
+        return
+
+    variacao = resultado['custo_total_km'] - custo_total_km(cenario_base, resultados_bnb)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Custo Total (km)", f"{resultado['custo_total_km']:.2f}", delta=f"{variacao:+.2f} km",
+                delta_color="inverse")
+    col2.metric("Nós Expandidos", f"{resultado['nos_expandidos']:,}")
+    col3.metric("Tempo de Execução (s)", f"{resultado['tempo_execucao_segundos']:.2f}")
+    if resultado.get('do_cache'):
+        st.caption("Resultado do cache de resultados (o tempo é o da resolução original).")
+    mapa_sensibilidade(pontos_de_visita, resultado, carregar(cenario_base, 'geometrias'),
+                       f"Rota Simulada ({len(cidades)} Cidades)", "purple")
+    st.write(f"**Rota:** {' → '.join(resultado['rota_otima_nomes'])}")
 
 
 # Layout principal do Streamlit
+ABAS = ["Análise e Mapa da Rota", "Resultados Detalhados do Algoritmo", "Comparativo e Validação",
+        "Simulação de Cenários"]
+
+
 def main():
     st.set_page_config(layout="wide", page_title="Otimização de Rotas (B&B)")
     st.title("PROJETO PO: Otimização de Rotas de Vendas")
     st.caption("Sistema de Análise e Otimização para o Problema do Caixeiro Viajante (TSP) com Branch and Bound.")
 
-    matriz_distancias, pontos_de_visita, resultados_bnb, geometrias_rotas, \
-        resultados_bnb_sensibilidade, matriz_distancias_sensibilidade, pontos_de_visita_sensibilidade, \
-        geometrias_rotas_sensibilidade = carregar_dados()
-
-    tab1, tab2, tab3 = st.tabs(
-        ["Análise e Mapa da Rota", "Resultados Detalhados do Algoritmo", "Comparativo e Validação"])
-
-    with tab1:
-        dashboard_analise(matriz_distancias, pontos_de_visita)
-        dashboard_visualizacao_rota(pontos_de_visita, resultados_bnb, geometrias_rotas)
+    # Apenas a listagem dos cenários acontece na inicialização; os arquivos são lidos pela aba aberta
+    cenarios = listar_cenarios()
+    if not cenarios:
+        st.error("Nenhum resultado encontrado em 'results/'. Execute o 'main.py' (Opção 1) primeiro.")
+        st.stop()
 
-    with tab2:
-        dashboard_resultados_algoritmo(resultados_bnb)
+    nomes = list(cenarios)
+    nome_base = st.sidebar.selectbox("Cenário principal", nomes, index=0)
+    outros = [nome for nome in nomes if nome != nome_base]
+    nome_comparado = st.sidebar.selectbox("Cenário de comparação", outros, index=0) if outros else None
+    cenario_base = cenarios[nome_base]
+    cenario_comparado = cenarios[nome_comparado] if nome_comparado else None
+
+    # Navegação por rádio: ao contrário de st.tabs, só a aba selecionada é executada
+    aba = st.radio("Seção", ABAS, horizontal=True, label_visibility="collapsed")
+
+    with medir_tempo_aba(aba):
+        if aba == ABAS[0]:
+            dashboard_analise(carregar_estatisticas(cenario_base), carregar(cenario_base, 'pontos'))
+            dashboard_visualizacao_rota(carregar(cenario_base, 'pontos'), carregar(cenario_base, 'resultados'),
+                                        carregar(cenario_base, 'geometrias'))
+        elif aba == ABAS[1]:
+            dashboard_resultados_algoritmo(carregar(cenario_base, 'resultados'))
+        elif aba == ABAS[2]:
+            dashboard_comparativo_e_validacao(cenario_base, cenario_comparado)
+        else:
+            dashboard_simulacao(cenario_base)
 
-    with tab3:
-        dashboard_comparativo_e_validacao(matriz_distancias, pontos_de_visita, resultados_bnb,
-                                          resultados_bnb_sensibilidade, pontos_de_visita_sensibilidade,
-                                          geometrias_rotas,
-                                          geometrias_rotas_sensibilidade)
+    exibir_orcamento_tempo()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
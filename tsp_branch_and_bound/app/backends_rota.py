@@ -0,0 +1,523 @@
+# Backends de roteamento: de onde vêm as distâncias, durações e traçados de carro entre os
+# pontos de visita. 'ors' consulta a API de directions do OpenRouteService par a par, 'ors-matriz'
+# usa o endpoint de matriz do ORS (um bloco de pares por requisição) e 'local' calcula caminhos
+# mínimos (Dijkstra) sobre o grafo rodoviário em 'data/grafo_rodoviario.npz', sem rede.
+import numpy as np
+import requests
+import heapq
+import importlib.util
+import os
+import sys
+import time
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.eventos import REGISTRO_NULO, PAR_OBTIDO, TENTATIVA_REPETIDA, ESPERA_LIMITE, FALHA_PAR
+from app.indice_espacial import IndiceEspacial, distancias_haversine
+
+# numba é opcional e só é importado quando o Dijkstra JIT é usado pela primeira vez
+NUMBA_DISPONIVEL = importlib.util.find_spec('numba') is not None
+_DIJKSTRA_JIT = None
+
+# Configuração de Paths
+DATA_DIR = 'data'
+INPUT_CIDADES_CSV = os.path.join(DATA_DIR, 'brazilian_cities.csv')
+GRAFO_RODOVIARIO_NPZ = os.path.join(DATA_DIR, 'grafo_rodoviario.npz')
+
+BACKENDS = ('ors', 'ors-matriz', 'local')
+BACKEND_PADRAO = 'ors'
+
+URL_ORS_DIRECTIONS = "https://api.openrouteservice.org/v2/directions/driving-car"
+URL_ORS_MATRIX = "https://api.openrouteservice.org/v2/matrix/driving-car"
+SEGUNDOS_POR_HORA = 3600.0
+# Intervalo entre requisições (limite da conta gratuita do ORS) e espera após um erro 429
+INTERVALO_REQUISICOES_SEGUNDOS = 1.6
+ESPERA_LIMITE_API_SEGUNDOS = 60
+MAX_TENTATIVAS = 3
+# Origens e destinos por requisição ao endpoint de matriz (50 x 50 = 2.500 pares, abaixo
+# do limite de 3.500 da conta gratuita)
+BLOCO_MATRIZ_ORS = 50
+# Uma linha de progresso no terminal a cada 10% dos pares (os detalhes vão para o arquivo de eventos)
+FRACAO_PROGRESSO = 0.1
+
+# Grafo rodoviário local: cada cidade ligada às mais próximas, com a distância em linha reta
+# corrigida pelo desvio típico das rodovias. Vias curtas são mais lentas que as longas.
+VIZINHOS_GRAFO = 6
+FATOR_DESVIO_RODOVIA = 1.3
+LIMITE_VIA_CURTA_KM = 25.0
+VELOCIDADE_VIA_CURTA_KMH = 60.0
+VELOCIDADE_VIA_LONGA_KMH = 90.0
+# Trecho do ponto de visita até o nó mais próximo do grafo
+VELOCIDADE_ACESSO_KMH = 40.0
+
+
+def cabecalhos_ors(api_key):
+    return {
+        'Accept': 'application/json, application/geo+json, application/gpx+xml, img/png; charset=utf-8',
+        'Authorization': api_key
+    }
+
+
+def codificar_polyline(pontos, precisao=5):
+    """
+    Codifica uma lista de coordenadas [lat, lon] no formato polyline (ORS/Google), o mesmo
+    lido por 'decode_polyline' no dashboard.
+    """
+    fator = 10 ** precisao
+    caracteres = []
+    lat_anterior = lon_anterior = 0
+    for lat, lon in pontos:
+        lat_int, lon_int = int(round(lat * fator)), int(round(lon * fator))
+        for delta in (lat_int - lat_anterior, lon_int - lon_anterior):
+            valor = ~(delta << 1) if delta < 0 else delta << 1
+            while valor >= 0x20:
+                caracteres.append(chr((0x20 | (valor & 0x1f)) + 63))
+                valor >>= 5
+            caracteres.append(chr(valor + 63))
+        lat_anterior, lon_anterior = lat_int, lon_int
+    return ''.join(caracteres)
+
+
+class Progresso:
+    """Conta os pares processados e imprime uma linha a cada FRACAO_PROGRESSO do total."""
+
+    def __init__(self, total_pares):
+        self.total_pares = total_pares
+        self.concluidos = 0
+        self.passo = max(1, int(total_pares * FRACAO_PROGRESSO))
+
+    def avancar(self, pares=1):
+        anterior = self.concluidos
+        self.concluidos += pares
+        if self.concluidos // self.passo > anterior // self.passo or self.concluidos == self.total_pares:
+            print(f"[{self.concluidos}/{self.total_pares}] pares processados")
+        return self.concluidos
+
+
+class BackendRota:
+    """
+    Interface dos backends de roteamento.
+    'matriz' recebe os pontos de visita (colunas 'cidade', 'latitude' e 'longitude') e retorna
+    as matrizes de distância (km) e de duração (h) como arrays float (n, n) na ordem dos pontos,
+    com diagonal 0 e NaN nos pares sem rota; os rótulos das cidades só são anexados na exportação
+    (ver app/matriz_custos.py). 'geometria' retorna a polyline codificada do trecho entre dois
+    pontos (lon, lat), ou None em caso de falha.
+    """
+
+    nome = None
+
+    @property
+    def fonte_geometrias(self):
+        """Backends com a mesma fonte de traçados compartilham o cache de geometrias."""
+        return self.nome
+
+    def matriz(self, pontos_de_visita, registro=REGISTRO_NULO):
+        raise NotImplementedError
+
+    def geometria(self, origem, destino, registro=REGISTRO_NULO, chave=None):
+        raise NotImplementedError
+
+
+class BackendORSDirections(BackendRota):
+    """Uma requisição ao endpoint de directions do ORS por par de pontos."""
+
+    nome = 'ors'
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.requisicoes = 0
+
+    def _postar(self, url, payload, chave, registro):
+        """
+        POST na API do ORS respeitando o intervalo entre requisições; após um erro 429 espera
+        ESPERA_LIMITE_API_SEGUNDOS e tenta de novo. Retorna (dados, tentativas, motivo da falha).
+        """
+        if self.requisicoes:
+            time.sleep(INTERVALO_REQUISICOES_SEGUNDOS)
+        self.requisicoes += 1
+
+        for tentativa in range(MAX_TENTATIVAS):
+            try:
+                response = requests.post(url, headers=cabecalhos_ors(self.api_key), json=payload)
+                response.raise_for_status()
+                return response.json(), tentativa + 1, None
+            except requests.exceptions.HTTPError as e:
+                if response.status_code != 429:
+                    print(f"Erro HTTP em {chave}: {e}")
+                    return None, tentativa + 1, str(e)
+                print(f"Erro 429 (Limite da API). Tentativa {tentativa + 1}/{MAX_TENTATIVAS}. "
+                      f"Esperando {ESPERA_LIMITE_API_SEGUNDOS} segundos...")
+                registro.emitir(TENTATIVA_REPETIDA, par=chave, tentativa=tentativa + 1, status=429)
+                registro.emitir(ESPERA_LIMITE, par=chave, segundos=ESPERA_LIMITE_API_SEGUNDOS)
+                time.sleep(ESPERA_LIMITE_API_SEGUNDOS)
+            except requests.exceptions.RequestException as e:
+                print(f"Erro de conexão em {chave}: {e}")
+                return None, tentativa + 1, str(e)
+        print(f"Falha ao obter dados para {chave} após {MAX_TENTATIVAS} tentativas.")
+        return None, MAX_TENTATIVAS, "tentativas esgotadas"
+
+    def matriz(self, pontos_de_visita, registro=REGISTRO_NULO):
+        n = len(pontos_de_visita)
+        # Coordenadas extraídas uma única vez; cada resultado vai direto para o array pré-alocado
+        coordenadas = pontos_de_visita[['longitude', 'latitude']].to_numpy(dtype=float).tolist()
+        distancias = np.full((n, n), np.nan)
+        duracoes = np.full((n, n), np.nan)
+        progresso = Progresso(n * (n - 1))
+
+        for i in range(n):
+            for j in range(n):
+                if i == j:
+                    continue
+
+                payload = {"coordinates": [coordenadas[i], coordenadas[j]], "units": "km", "geometry": False}
+                chave_rota = f"{i}-{j}"
+
+                dados, tentativas, motivo = self._postar(URL_ORS_DIRECTIONS, payload, chave_rota, registro)
+                if dados is None:
+                    registro.emitir(FALHA_PAR, par=chave_rota, motivo=motivo, concluidos=progresso.avancar(),
+                                    total_pares=progresso.total_pares)
+                    continue
+
+                distancia = dados['routes'][0]['summary']['distance']
+                # Duração em segundos (ausente quando origem e destino coincidem)
+                duracao = dados['routes'][0]['summary'].get('duration', 0.0) / SEGUNDOS_POR_HORA
+                distancias[i, j] = distancia
+                duracoes[i, j] = duracao
+                registro.emitir(PAR_OBTIDO, par=chave_rota, distancia_km=distancia, duracao_h=duracao,
+                                tentativa=tentativas, concluidos=progresso.avancar(),
+                                total_pares=progresso.total_pares)
+
+        np.fill_diagonal(distancias, 0.0)
+        np.fill_diagonal(duracoes, 0.0)
+        return distancias, duracoes
+
+    def geometria(self, origem, destino, registro=REGISTRO_NULO, chave=None):
+        payload = {"coordinates": [list(origem), list(destino)], "units": "km"}
+        dados, _, motivo = self._postar(URL_ORS_DIRECTIONS, payload, chave, registro)
+        if dados is None:
+            registro.emitir(FALHA_PAR, par=chave, motivo=motivo)
+            return None
+        return dados['routes'][0]['geometry']
+
+
+class BackendORSMatriz(BackendORSDirections):
+    """
+    Endpoint de matriz do ORS: cada requisição devolve um bloco de até BLOCO_MATRIZ_ORS origens
+    x BLOCO_MATRIZ_ORS destinos (n² / 2.500 requisições em vez de n²). O endpoint não devolve
+    traçados, então as geometrias continuam vindo do endpoint de directions.
+    """
+
+    nome = 'ors-matriz'
+    fonte_geometrias = 'ors'
+
+    def matriz(self, pontos_de_visita, registro=REGISTRO_NULO):
+        n = len(pontos_de_visita)
+        coordenadas = pontos_de_visita[['longitude', 'latitude']].to_numpy(dtype=float)
+        distancias = np.full((n, n), np.nan)
+        duracoes = np.full((n, n), np.nan)
+        progresso = Progresso(n * (n - 1))
+
+        for inicio_origens in range(0, n, BLOCO_MATRIZ_ORS):
+            origens = np.arange(inicio_origens, min(n, inicio_origens + BLOCO_MATRIZ_ORS))
+            for inicio_destinos in range(0, n, BLOCO_MATRIZ_ORS):
+                destinos = np.arange(inicio_destinos, min(n, inicio_destinos + BLOCO_MATRIZ_ORS))
+                # Os blocos são iguais ou disjuntos: na diagonal, os mesmos locais servem de origem e destino
+                diagonal = inicio_origens == inicio_destinos
+                locais = origens if diagonal else np.concatenate([origens, destinos])
+                primeiro_destino = 0 if diagonal else len(origens)
+                payload = {
+                    "locations": coordenadas[locais].tolist(),
+                    "sources": list(range(len(origens))),
+                    "destinations": list(range(primeiro_destino, primeiro_destino + len(destinos))),
+                    "metrics": ["distance", "duration"],
+                    "units": "km",
+                }
+                chave = f"{origens[0]}-{origens[-1]}x{destinos[0]}-{destinos[-1]}"
+                pares = len(origens) * len(destinos) - (len(origens) if diagonal else 0)
+
+                dados, tentativas, motivo = self._postar(URL_ORS_MATRIX, payload, chave, registro)
+                if dados is None:
+                    registro.emitir(FALHA_PAR, par=chave, motivo=motivo, concluidos=progresso.avancar(pares),
+                                    total_pares=progresso.total_pares)
+                    continue
+
+                # Pares sem rota vêm como null (NaN)
+                bloco = np.ix_(origens, destinos)
+                distancias[bloco] = np.array(dados['distances'], dtype=float)
+                duracoes[bloco] = np.array(dados['durations'], dtype=float) / SEGUNDOS_POR_HORA
+                registro.emitir(PAR_OBTIDO, par=chave, pares=pares, tentativa=tentativas,
+                                concluidos=progresso.avancar(pares), total_pares=progresso.total_pares)
+
+        np.fill_diagonal(distancias, 0.0)
+        np.fill_diagonal(duracoes, 0.0)
+        return distancias, duracoes
+
+
+def _dijkstra(inicio, destinos, distancias_km, duracoes_h, origem, alvos, num_alvos,
+              distancia, duracao, predecessor, fixado):
+    """
+    Caminhos mínimos (em km) a partir de 'origem' sobre o grafo em CSR, parando quando os
+    'num_alvos' nós marcados em 'alvos' são fixados. A duração é acumulada ao longo do mesmo
+    caminho. 'distancia', 'duracao', 'predecessor' e 'fixado' são buffers reiniciados aqui.
+    """
+    num_nos = len(inicio) - 1
+    for v in range(num_nos):
+        distancia[v] = np.inf
+        duracao[v] = 0.0
+        predecessor[v] = -1
+        fixado[v] = False
+    distancia[origem] = 0.0
+    fila = [(0.0, origem)]
+    restantes = num_alvos
+    while len(fila) > 0 and restantes > 0:
+        d, v = heapq.heappop(fila)
+        if fixado[v]:
+            continue
+        fixado[v] = True
+        if alvos[v]:
+            restantes -= 1
+        for aresta in range(inicio[v], inicio[v + 1]):
+            w = destinos[aresta]
+            nova = d + distancias_km[aresta]
+            if nova < distancia[w]:
+                distancia[w] = nova
+                duracao[w] = duracao[v] + duracoes_h[aresta]
+                predecessor[w] = v
+                heapq.heappush(fila, (nova, w))
+
+
+def _dijkstra_jit():
+    global _DIJKSTRA_JIT
+    if _DIJKSTRA_JIT is None:
+        import numba
+        _DIJKSTRA_JIT = numba.njit(cache=True)(_dijkstra)
+    return _DIJKSTRA_JIT
+
+
+class GrafoRodoviario:
+    """
+    Grafo rodoviário dirigido em formato CSR: as arestas que saem do nó v são
+    destinos[inicio[v]:inicio[v + 1]], com a distância (km) e a duração (h) de cada uma.
+    """
+
+    def __init__(self, latitudes, longitudes, inicio, destinos, distancias_km, duracoes_h):
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.inicio = np.asarray(inicio, dtype=np.int64)
+        self.destinos = np.asarray(destinos, dtype=np.int64)
+        self.distancias_km = np.asarray(distancias_km, dtype=float)
+        self.duracoes_h = np.asarray(duracoes_h, dtype=float)
+
+    def __len__(self):
+        return len(self.latitudes)
+
+    @property
+    def num_arestas(self):
+        return len(self.destinos)
+
+    @classmethod
+    def carregar(cls, caminho=GRAFO_RODOVIARIO_NPZ):
+        with np.load(caminho) as dados:
+            return cls(dados['latitudes'], dados['longitudes'], dados['inicio'], dados['destinos'],
+                       dados['distancias_km'], dados['duracoes_h'])
+
+    def salvar(self, caminho=GRAFO_RODOVIARIO_NPZ):
+        np.savez_compressed(caminho, latitudes=self.latitudes, longitudes=self.longitudes,
+                            inicio=self.inicio.astype(np.int32), destinos=self.destinos.astype(np.int32),
+                            distancias_km=self.distancias_km.astype(np.float32),
+                            duracoes_h=self.duracoes_h.astype(np.float32))
+
+    @classmethod
+    def de_arestas(cls, latitudes, longitudes, origens, destinos):
+        """Grafo com as arestas (origem, destino) nos dois sentidos e comprimentos pela distância em linha reta."""
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        origens, destinos = (np.concatenate([origens, destinos]).astype(np.int64),
+                             np.concatenate([destinos, origens]).astype(np.int64))
+        ordem = np.argsort(origens, kind='stable')
+        origens, destinos = origens[ordem], destinos[ordem]
+
+        distancias_km = distancias_haversine(latitudes[origens], longitudes[origens],
+                                             latitudes[destinos], longitudes[destinos]) * FATOR_DESVIO_RODOVIA
+        velocidades = np.where(distancias_km < LIMITE_VIA_CURTA_KM, VELOCIDADE_VIA_CURTA_KMH, VELOCIDADE_VIA_LONGA_KMH)
+        inicio = np.zeros(len(latitudes) + 1, dtype=np.int64)
+        inicio[1:] = np.cumsum(np.bincount(origens, minlength=len(latitudes)))
+        return cls(latitudes, longitudes, inicio, destinos, distancias_km, distancias_km / velocidades)
+
+    @classmethod
+    def gerar(cls, latitudes, longitudes, vizinhos=VIZINHOS_GRAFO):
+        """
+        Grafo sintético sobre as cidades: cada uma ligada às 'vizinhos' mais próximas. Partes
+        desconexas são ligadas à maior pelo par de cidades mais próximo.
+        """
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        indice = IndiceEspacial(latitudes, longitudes)
+        arestas = set()
+        for v in range(len(latitudes)):
+            proximos, _ = indice.k_mais_proximos(latitudes[v], longitudes[v], vizinhos + 1)
+            arestas.update((min(v, int(w)), max(v, int(w))) for w in proximos if w != v)
+
+        componentes = _componentes(len(latitudes), arestas)
+        principal = max(componentes, key=len)
+        for componente in componentes:
+            if componente is principal:
+                continue
+            melhor = None
+            for v in componente:
+                distancias = distancias_haversine(latitudes[v], longitudes[v],
+                                                  latitudes[principal], longitudes[principal])
+                w = int(distancias.argmin())
+                if melhor is None or distancias[w] < melhor[0]:
+                    melhor = (distancias[w], v, int(principal[w]))
+            arestas.add((melhor[1], melhor[2]))
+
+        origens, destinos = np.array(sorted(arestas), dtype=np.int64).reshape(-1, 2).T
+        return cls.de_arestas(latitudes, longitudes, origens, destinos)
+
+
+def _componentes(num_nos, arestas):
+    """Componentes conexos (union-find) como arrays de índices."""
+    pai = list(range(num_nos))
+
+    def raiz(v):
+        while pai[v] != v:
+            pai[v] = pai[pai[v]]
+            v = pai[v]
+        return v
+
+    for a, b in arestas:
+        pai[raiz(a)] = raiz(b)
+    raizes = np.array([raiz(v) for v in range(num_nos)])
+    return [np.flatnonzero(raizes == r) for r in np.unique(raizes)]
+
+
+class BackendLocal(BackendRota):
+    """
+    Caminhos mínimos (Dijkstra) sobre um grafo rodoviário local, sem rede. Cada ponto é ligado
+    ao nó mais próximo do grafo por um trecho de acesso. Com o numba instalado, o Dijkstra é
+    compilado (JIT); sem ele, roda em Python puro sobre listas.
+    """
+
+    nome = 'local'
+
+    def __init__(self, grafo=None, caminho_grafo=GRAFO_RODOVIARIO_NPZ, usar_jit=None):
+        self.grafo = GrafoRodoviario.carregar(caminho_grafo) if grafo is None else grafo
+        self.indice = IndiceEspacial(self.grafo.latitudes, self.grafo.longitudes)
+        if usar_jit is None:
+            usar_jit = NUMBA_DISPONIVEL
+        if usar_jit and not NUMBA_DISPONIVEL:
+            raise ImportError("O numba não está instalado (pip install numba).")
+
+        num_nos = len(self.grafo)
+        if usar_jit:
+            self._dijkstra = _dijkstra_jit()
+            self._arestas = (self.grafo.inicio, self.grafo.destinos, self.grafo.distancias_km, self.grafo.duracoes_h)
+            self._buffers = (np.zeros(num_nos), np.zeros(num_nos), np.zeros(num_nos, dtype=np.int64),
+                             np.zeros(num_nos, dtype=np.bool_))
+        else:
+            self._dijkstra = _dijkstra
+            self._arestas = (self.grafo.inicio.tolist(), self.grafo.destinos.tolist(),
+                             self.grafo.distancias_km.tolist(), self.grafo.duracoes_h.tolist())
+            self._buffers = ([0.0] * num_nos, [0.0] * num_nos, [0] * num_nos, [False] * num_nos)
+        self._alvos = np.zeros(num_nos, dtype=np.bool_)
+
+    def ligar(self, coordenadas):
+        """Nó do grafo mais próximo de cada ponto (lon, lat) e o trecho de acesso até ele (km, h)."""
+        nos = np.empty(len(coordenadas), dtype=np.int64)
+        acesso_km = np.empty(len(coordenadas))
+        for p, (longitude, latitude) in enumerate(coordenadas):
+            indices, distancias = self.indice.k_mais_proximos(latitude, longitude, 1)
+            nos[p] = indices[0]
+            acesso_km[p] = distancias[0] * FATOR_DESVIO_RODOVIA
+        return nos, acesso_km, acesso_km / VELOCIDADE_ACESSO_KMH
+
+    def _caminhos(self, origem, alvos):
+        """Dijkstra a partir de 'origem' até fixar todos os nós 'alvos'. Retorna os buffers (distância, duração, predecessor)."""
+        self._alvos[:] = False
+        self._alvos[alvos] = True
+        self._dijkstra(*self._arestas, int(origem), self._alvos, int(self._alvos.sum()), *self._buffers)
+        return self._buffers[:3]
+
+    def matriz(self, pontos_de_visita, registro=REGISTRO_NULO):
+        n = len(pontos_de_visita)
+        nos, acesso_km, acesso_h = self.ligar(pontos_de_visita[['longitude', 'latitude']].to_numpy(dtype=float))
+        distancias = np.zeros((n, n))
+        duracoes = np.zeros((n, n))
+        progresso = Progresso(n * (n - 1))
+
+        for i in range(n):
+            distancia, duracao, _ = self._caminhos(nos[i], nos)
+            distancias[i] = acesso_km[i] + np.asarray(distancia)[nos] + acesso_km
+            duracoes[i] = acesso_h[i] + np.asarray(duracao)[nos] + acesso_h
+            registro.emitir(PAR_OBTIDO, par=f"{i}-*", pares=n - 1, concluidos=progresso.avancar(n - 1),
+                            total_pares=progresso.total_pares)
+
+        # Nós inalcançáveis: par sem rota
+        duracoes[~np.isfinite(distancias)] = np.nan
+        distancias[~np.isfinite(distancias)] = np.nan
+        np.fill_diagonal(distancias, 0.0)
+        np.fill_diagonal(duracoes, 0.0)
+        return distancias, duracoes
+
+    def geometria(self, origem, destino, registro=REGISTRO_NULO, chave=None):
+        (no_origem, no_destino), _, _ = self.ligar([origem, destino])
+        distancia, _, predecessor = self._caminhos(no_origem, [no_destino])
+        if not np.isfinite(distancia[no_destino]):
+            registro.emitir(FALHA_PAR, par=chave, motivo="sem caminho no grafo")
+            return None
+
+        caminho = [int(no_destino)]
+        while caminho[-1] != no_origem:
+            caminho.append(int(predecessor[caminho[-1]]))
+        pontos = [(origem[1], origem[0])]
+        pontos += [(self.grafo.latitudes[v], self.grafo.longitudes[v]) for v in reversed(caminho)]
+        pontos.append((destino[1], destino[0]))
+        return codificar_polyline(pontos)
+
+
+def criar_backend(nome=BACKEND_PADRAO, api_key=None, caminho_grafo=GRAFO_RODOVIARIO_NPZ):
+    if nome == 'ors':
+        return BackendORSDirections(api_key)
+    if nome == 'ors-matriz':
+        return BackendORSMatriz(api_key)
+    if nome == 'local':
+        return BackendLocal(caminho_grafo=caminho_grafo)
+    raise ValueError(f"Backend inválido: '{nome}'. Use um de {BACKENDS}.")
+
+
+def backend_argumentos(argumentos):
+    """Nome do backend em '--backend=<nome>' (padrão: 'ors')."""
+    for argumento in argumentos:
+        if argumento.startswith('--backend='):
+            return argumento.split('=', 1)[1]
+    return BACKEND_PADRAO
+
+
+def abrir_backend(nome):
+    """Backend pelo nome; os do ORS leem a chave da variável de ambiente ORS_API_KEY."""
+    api_key = None
+    if nome in ('ors', 'ors-matriz'):
+        api_key = os.getenv("ORS_API_KEY")
+        if not api_key:
+            print("Erro: A variável de ambiente ORS_API_KEY não foi definida.")
+            print("Configure-a antes de executar o script (ex: set ORS_API_KEY=sua_chave) "
+                  "ou use '--backend=local' para calcular as rotas sem rede.")
+            sys.exit(1)
+    try:
+        return criar_backend(nome, api_key)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+
+
+# Execução Principal
+if __name__ == "__main__":
+    # Gera o grafo rodoviário local a partir de todas as cidades do CSV
+    from app.pipeline_dados import ler_cidades_csv
+
+    cidades = ler_cidades_csv(INPUT_CIDADES_CSV)
+    grafo = GrafoRodoviario.gerar(cidades['latitude'].to_numpy(dtype=float), cidades['longitude'].to_numpy(dtype=float))
+    grafo.salvar(GRAFO_RODOVIARIO_NPZ)
+    print(f"Grafo rodoviário com {len(grafo)} nós e {grafo.num_arestas} arestas salvo em '{GRAFO_RODOVIARIO_NPZ}'.")
@@ -1,46 +1,190 @@
-import pandas as pd
 import numpy as np
+import csv
 import time
 import heapq
 import json
 import os
 import sys
+from collections import OrderedDict
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.matriz_compacta import compactar_matriz, custo_em_km, MODO_PADRAO
+from app.kernels import Kernels, NUMBA_DISPONIVEL, NOS_MIN_JIT
+from app.limitante_atribuicao import LimitanteAtribuicao
+from app.eventos import abrir_registro, caminho_eventos_argumentos, PROGRESSO_BUSCA, INCUMBENTE, CACHE_HIT
+from app.cache_resultados import (CacheResultados, CACHE_RESULTADOS_JSON, chave_instancia,
+                                  rota_para_cidades, rota_para_indices)
+from app.estatisticas_resultados import calcular_estatisticas, caminho_estatisticas, salvar_estatisticas
 
 # Configuração de Paths
 RESULTS_DIR = 'results'
 INPUT_MATRIZ_CSV = os.path.join(RESULTS_DIR, 'matriz_distancias.csv')
 OUTPUT_RESULTADOS_JSON = os.path.join(RESULTS_DIR, 'resultados_branch_and_bound.json')
+INPUT_CAMADAS_NPZ = os.path.join(RESULTS_DIR, 'matriz_custos.npz')
+
+# Máximo de estados (cidades visitadas, última cidade) guardados na tabela de dominância.
+# Com n = 10 há ~4.600 estados; o limite só atua em instâncias maiores.
+TAMANHO_MAX_DOMINANCIA = 200_000
+
+# Com um registro de eventos, o progresso da busca é emitido a cada N nós expandidos
+INTERVALO_EVENTOS_BUSCA = 10_000
+
+# Limitantes inferiores: 'duas_menores' (as duas menores arestas de cada cidade, pela metade) ou
+# 'atribuicao' (problema de atribuição; ver app/limitante_atribuicao.py). O das duas menores arestas
+# só é válido em matrizes simétricas, então o padrão (None) escolhe pela matriz (ver escolher_limitante)
+LIMITANTES = ('duas_menores', 'atribuicao')
+LIMITANTE_PADRAO = None
 
 
 # Representa um nó na árvore de busca do Branch and Bound.
 class No:
-    def __init__(self, rota, custo, bound):
+    def __init__(self, rota, custo, bound, mascara=None, atribuicao=None):
         self.rota = rota
         self.custo = custo
         self.bound = bound
+        # Conjunto de cidades visitadas como máscara de bits (usada pela tabela de dominância)
+        self.mascara = mascara
+        # Solução do problema de atribuição do nó, reaproveitada pelos filhos (limitante 'atribuicao')
+        self.atribuicao = atribuicao
 
     def __lt__(self, other):
         return (self.bound, self.custo) < (other.bound, other.custo)
 
 
-def calcular_lower_bound(matriz_distancias_np, no_atual, n):
+class EstatisticasBusca:
+    """
+    Instrumentação opcional da busca. Quando uma instância é passada para
+    branch_and_bound_tsp, os contadores abaixo são preenchidos durante a execução.
+    'chamadas_bound' conta cada bound de fato calculado: o da raiz, os dos filhos nos kernels
+    (antes da poda por dominância) e os do problema de atribuição. 'tempo_expansao_segundos'
+    é o tempo nos kernels (geração dos filhos, com o bound das duas menores arestas) e
+    'tempo_bound_segundos' o dos bounds calculados fora deles (raiz e atribuição).
+    """
+
+    def __init__(self):
+        self.nos_gerados = 0
+        self.nos_expandidos = 0
+        self.nos_podados = 0
+        self.nos_dominados = 0
+        self.chamadas_bound = 0
+        self.tempo_bound_segundos = 0.0
+        self.tempo_expansao_segundos = 0.0
+        self.tempo_fila_segundos = 0.0
+        self.tempo_total_segundos = 0.0
+        self.pico_fila = 0
+        self.podas_por_profundidade = []
+        # Cada melhoria da solução incumbente: (segundos desde o início, nós expandidos, custo)
+        self.linha_tempo_incumbente = []
+        self.inicio = time.perf_counter()
+
+    def registrar_poda(self, profundidade):
+        self.nos_podados += 1
+        while len(self.podas_por_profundidade) <= profundidade:
+            self.podas_por_profundidade.append(0)
+        self.podas_por_profundidade[profundidade] += 1
+
+    def registrar_incumbente(self, custo):
+        self.linha_tempo_incumbente.append(
+            (time.perf_counter() - self.inicio, self.nos_expandidos, float(custo)))
+
+    def para_dict(self):
+        """Converte as estatísticas para um dicionário serializável em JSON."""
+        return {
+            "nos_gerados": self.nos_gerados,
+            "nos_expandidos": self.nos_expandidos,
+            "nos_podados": self.nos_podados,
+            "nos_dominados": self.nos_dominados,
+            "chamadas_bound": self.chamadas_bound,
+            "tempo_bound_segundos": self.tempo_bound_segundos,
+            "tempo_expansao_segundos": self.tempo_expansao_segundos,
+            "tempo_fila_segundos": self.tempo_fila_segundos,
+            "tempo_total_segundos": self.tempo_total_segundos,
+            "pico_fila": self.pico_fila,
+            "podas_por_profundidade": self.podas_por_profundidade,
+            "linha_tempo_incumbente": [
+                {"segundos": t, "nos_expandidos": nos, "custo": custo}
+                for t, nos, custo in self.linha_tempo_incumbente
+            ]
+        }
+
+
+class TabelaDominancia:
+    """
+    Melhor custo conhecido para cada estado (cidades visitadas, última cidade). Dois caminhos
+    no mesmo estado têm os mesmos complementos, então o mais caro pode ser descartado.
+    O tamanho é limitado: ao passar de 'tamanho_maximo', o estado usado há mais tempo sai (LRU).
+    Descartar um estado só reduz as podas, nunca altera a solução ótima.
+    """
+
+    def __init__(self, tamanho_maximo=TAMANHO_MAX_DOMINANCIA):
+        self.tamanho_maximo = tamanho_maximo
+        self.melhores = OrderedDict()
+        self.descartes = 0
+
+    def __len__(self):
+        return len(self.melhores)
+
+    def registrar(self, chave, custo):
+        """
+        Registra um caminho recém-gerado. Retorna False se ele é dominado
+        (outro caminho já chegou ao mesmo estado com custo menor ou igual).
+        """
+        melhor = self.melhores.get(chave)
+        if melhor is not None:
+            self.melhores.move_to_end(chave)
+            if melhor <= custo:
+                return False
+        self.melhores[chave] = custo
+        if melhor is None and len(self.melhores) > self.tamanho_maximo:
+            self.melhores.popitem(last=False)
+            self.descartes += 1
+        return True
+
+    def superado(self, chave, custo):
+        """Ao retirar um nó da fila: True se um caminho mais barato para o mesmo estado surgiu depois."""
+        melhor = self.melhores.get(chave)
+        return melhor is not None and melhor < custo
+
+
+def matriz_simetrica(matriz_np):
+    """True se m[i, j] == m[j, i] para todo par (np.inf na diagonal é aceito)."""
+    return matriz_np.shape[0] == matriz_np.shape[1] and np.array_equal(matriz_np, matriz_np.T)
+
+
+def escolher_limitante(matriz_np, limitante=LIMITANTE_PADRAO):
+    """
+    Limitante da busca: o informado ou, sem ele, 'duas_menores' nas matrizes simétricas e
+    'atribuicao' nas assimétricas (como as do ORS), onde o das duas menores arestas não é válido.
+    """
+    if limitante is None:
+        return 'duas_menores' if matriz_simetrica(np.asarray(matriz_np)) else 'atribuicao'
+    if limitante not in LIMITANTES:
+        raise ValueError(f"Limitante inválido: '{limitante}'. Use um de {LIMITANTES}.")
+    return limitante
+
+
+def calcular_lower_bound(matriz_distancias_np, no_atual, n, infinito=np.inf):
     """
     Calcula o limite inferior (lower bound) para um nó.
-    matriz_distancias_np é uma matriz pura do NumPy.
+    matriz_distancias_np é uma matriz pura do NumPy; arestas com valor >= 'infinito'
+    (np.inf ou a sentinela inteira da matriz compacta) são ignoradas.
     """
     lower_bound = no_atual.custo
     vertices_nao_visitados = set(range(n)) - set(no_atual.rota)
 
     # Se a rota está completa, retorna o custo total ao voltar para o início
     if len(no_atual.rota) == n:
-        return lower_bound + matriz_distancias_np[no_atual.rota[-1], no_atual.rota[0]]
+        retorno = matriz_distancias_np[no_atual.rota[-1], no_atual.rota[0]]
+        return lower_bound + retorno if retorno < infinito else np.inf
 
     # Adiciona a menor aresta que sai do último vértice da rota parcial
     ultima_cidade = no_atual.rota[-1]
     if vertices_nao_visitados:
         # Indexação direta do NumPy (rápida)
         valores_possiveis = matriz_distancias_np[ultima_cidade, list(vertices_nao_visitados)]
-        valores_finitos = valores_possiveis[np.isfinite(valores_possiveis)]
+        valores_finitos = valores_possiveis[valores_possiveis < infinito]
         if len(valores_finitos) > 0:
             lower_bound += np.min(valores_finitos)
 
@@ -48,9 +192,9 @@ def calcular_lower_bound(matriz_distancias_np, no_atual, n):
     for vertice in vertices_nao_visitados:
         # Seleciona todas as arestas que saem do vértice (excluindo a diagonal)
         arestas_vertice = matriz_distancias_np[vertice, :]
-        arestas_vertice = arestas_vertice[np.isfinite(arestas_vertice)]
+        arestas_vertice = arestas_vertice[arestas_vertice < infinito]
 
-        # A lista já está filtrada por np.inf. Basta ordenar e somar as duas menores.
+        # A lista já está filtrada pela sentinela. Basta ordenar e somar as duas menores.
         arestas_vertice.sort()
 
         if len(arestas_vertice) >= 2:
@@ -62,102 +206,362 @@ def calcular_lower_bound(matriz_distancias_np, no_atual, n):
     return lower_bound / 2
 
 
-def branch_and_bound_tsp(matriz_distancias):
-    # Implementa o algoritmo Branch and Bound para o TSP.
+def branch_and_bound_tsp(matriz_distancias, estatisticas=None, modo_matriz=MODO_PADRAO, usar_jit=None,
+                         podar_dominancia=True, quebrar_simetria=None, tamanho_max_dominancia=TAMANHO_MAX_DOMINANCIA,
+                         registro=None, limitante=LIMITANTE_PADRAO):
+    """
+    Implementa o algoritmo Branch and Bound para o TSP sobre a matriz de distâncias
+    (array NumPy ou DataFrame n x n, com np.inf na diagonal e nas arestas inexistentes).
+    Se 'estatisticas' (EstatisticasBusca) for informado, a busca é instrumentada.
+    'modo_matriz' escolhe a representação interna ('float64', 'float32' ou 'int32' em metros);
+    o custo retornado é sempre em km.
+    'usar_jit' força (True) ou desativa (False) os kernels do numba; None começa nos kernels em
+    Python/NumPy e só passa para o JIT (se o numba estiver instalado) após NOS_MIN_JIT nós expandidos,
+    já que importar o numba custa mais do que ele economiza nas buscas curtas.
+    'podar_dominancia' ativa a tabela de dominância (TabelaDominancia) e 'quebrar_simetria'
+    percorre cada ciclo em um único sentido (None: apenas se a matriz for simétrica).
+    Com 'registro' (RegistroEventos), o progresso e cada nova melhor solução viram eventos.
+    Com limitante='atribuicao', o bound de cada nó é o do problema de atribuição, re-resolvido de
+    forma incremental a partir do nó pai. Ele não é combinado com o das duas menores arestas: esse
+    soma só arestas de saída e não é um limitante inferior válido em matrizes assimétricas (nem é
+    calculado nesse modo). Sem 'limitante', a escolha é feita pela matriz (ver escolher_limitante).
+    """
     n = len(matriz_distancias)
     fila_prioridade = []
+    instrumentar = estatisticas is not None
 
     # Conversão para NumPy para desempenho máximo
-    matriz_distancias_np = matriz_distancias.values
+    if modo_matriz == MODO_PADRAO:
+        matriz_distancias_np, infinito, escala = np.asarray(matriz_distancias), np.inf, 1
+    else:
+        matriz_distancias_np, infinito, escala = compactar_matriz(matriz_distancias, modo_matriz)
+
+    limitante = escolher_limitante(matriz_distancias_np, limitante)
+    if quebrar_simetria is None:
+        quebrar_simetria = matriz_simetrica(matriz_distancias_np)
+    dominancia = TabelaDominancia(tamanho_max_dominancia) if podar_dominancia else None
+
+    # Kernels do bound e da geração dos filhos (Python puro ou NumPy; JIT com numba se pedido)
+    kernels = Kernels(matriz_distancias_np, infinito, bool(usar_jit))
+    trocar_para_jit = usar_jit is None and NUMBA_DISPONIVEL
 
-    no_inicial = No(rota=[0], custo=0, bound=0)
-    no_inicial.bound = calcular_lower_bound(matriz_distancias_np, no_inicial, n)
+    atribuicao = LimitanteAtribuicao(matriz_distancias_np, infinito) if limitante == 'atribuicao' and n > 1 else None
+
+    inicio = time.perf_counter()
+    no_inicial = No(rota=[0], custo=0, bound=0, mascara=1)
+    if atribuicao is not None:
+        no_inicial.atribuicao, no_inicial.bound = atribuicao.raiz()
+    else:
+        no_inicial.bound = kernels.bound(no_inicial.rota, no_inicial.custo)
     heapq.heappush(fila_prioridade, no_inicial)
 
     solucao_otima = None
     custo_otimo = float('inf')
     nos_expandidos = 0
 
+    if instrumentar:
+        estatisticas.nos_gerados += 1
+        estatisticas.chamadas_bound += 1
+        estatisticas.tempo_bound_segundos += time.perf_counter() - inicio
+        estatisticas.pico_fila = max(estatisticas.pico_fila, 1)
+
     while fila_prioridade:
-        no_atual = heapq.heappop(fila_prioridade)
+        if instrumentar:
+            t0 = time.perf_counter()
+            no_atual = heapq.heappop(fila_prioridade)
+            estatisticas.tempo_fila_segundos += time.perf_counter() - t0
+            estatisticas.nos_expandidos += 1
+        else:
+            no_atual = heapq.heappop(fila_prioridade)
         nos_expandidos += 1
+        if trocar_para_jit and nos_expandidos == NOS_MIN_JIT:
+            # Busca longa: os kernels JIT dão os mesmos bounds e passam a compensar o import do numba
+            kernels = Kernels(matriz_distancias_np, infinito, True)
+        if registro is not None and nos_expandidos % INTERVALO_EVENTOS_BUSCA == 0:
+            registro.emitir(PROGRESSO_BUSCA, nos_expandidos=nos_expandidos, tamanho_fila=len(fila_prioridade),
+                            melhor_custo=custo_em_km(custo_otimo, escala) if solucao_otima else None,
+                            segundos=time.perf_counter() - inicio)
 
         if no_atual.bound >= custo_otimo:
+            if instrumentar:
+                estatisticas.registrar_poda(len(no_atual.rota))
             continue
 
-        if len(no_atual.rota) == n:
+        # Chave do estado: (cidades visitadas, última cidade) e, com a quebra de simetria,
+        # também a segunda cidade (ela restringe como o ciclo pode terminar)
+        rota = no_atual.rota
+        if dominancia is not None and len(rota) > 1:
+            chave = no_atual.mascara * n + rota[-1]
+            if quebrar_simetria:
+                chave = chave * n + rota[1]
+            if dominancia.superado(chave, no_atual.custo):
+                if instrumentar:
+                    estatisticas.nos_dominados += 1
+                    estatisticas.registrar_poda(len(rota))
+                continue
+
+        if len(rota) == n:
             # Usa a matriz NumPy aqui
-            custo_total = no_atual.custo + matriz_distancias_np[no_atual.rota[-1], no_atual.rota[0]]
-            if custo_total < custo_otimo:
+            retorno = matriz_distancias_np[rota[-1], rota[0]]
+            custo_total = no_atual.custo + retorno
+            if retorno < infinito and custo_total < custo_otimo:
                 custo_otimo = custo_total
-                solucao_otima = no_atual.rota
+                solucao_otima = rota
+                if instrumentar:
+                    estatisticas.registrar_incumbente(custo_otimo)
+                if registro is not None:
+                    registro.emitir(INCUMBENTE, custo=custo_em_km(custo_otimo, escala), nos_expandidos=nos_expandidos,
+                                    segundos=time.perf_counter() - inicio)
         else:
-            ultimo_vertice = no_atual.rota[-1]
-            vertices_nao_visitados = set(range(n)) - set(no_atual.rota)
-
-            for proximo_vertice in vertices_nao_visitados:
-                # Usa a matriz NumPy aqui
-                novo_custo = no_atual.custo + matriz_distancias_np[ultimo_vertice, proximo_vertice]
-                if not np.isfinite(novo_custo):
-                    continue
-
-                if novo_custo < custo_otimo:
-                    nova_rota = no_atual.rota + [proximo_vertice]
-                    novo_no = No(rota=nova_rota, custo=novo_custo, bound=0)
-                    # Passa a matriz NumPy para o cálculo do bound
-                    novo_no.bound = calcular_lower_bound(matriz_distancias_np, novo_no, n)
-                    heapq.heappush(fila_prioridade, novo_no)
-
+            # Filhos em ordem crescente de vértice; os de custo >= custo_otimo já vêm podados
+            if instrumentar:
+                t0 = time.perf_counter()
+            completa = len(rota) + 1 == n
+            # Com a atribuição, o kernel só calcula o bound das rotas completas (custo do ciclo)
+            bounds_no_kernel = atribuicao is None or completa
+            gerados, podados = kernels.expandir(rota, no_atual.custo, custo_otimo, quebrar_simetria, bounds_no_kernel)
+            if instrumentar:
+                t1 = time.perf_counter()
+                estatisticas.tempo_expansao_segundos += t1 - t0
+                if bounds_no_kernel:
+                    # O kernel calcula o bound de cada filho que devolve, inclusive dos que a
+                    # dominância descarta em seguida
+                    estatisticas.chamadas_bound += gerados
+                for _ in range(podados):
+                    estatisticas.registrar_poda(len(rota) + 1)
+
+            proximos, custos, bounds = kernels.proximos, kernels.custos, kernels.bounds
+            segunda = rota[1] if len(rota) > 1 else None
+            tempo_atribuicao = 0.0
+            for i in range(gerados):
+                proximo = int(proximos[i])
+                mascara = no_atual.mascara | (1 << proximo)
+                if dominancia is not None:
+                    chave = mascara * n + proximo
+                    if quebrar_simetria:
+                        chave = chave * n + (proximo if segunda is None else segunda)
+                    if not dominancia.registrar(chave, custos[i]):
+                        if instrumentar:
+                            estatisticas.nos_dominados += 1
+                            estatisticas.registrar_poda(len(rota) + 1)
+                        continue
+                bound, estado = bounds[i], None
+                if not bounds_no_kernel:
+                    if instrumentar:
+                        t2 = time.perf_counter()
+                    estado, valor = atribuicao.filho(no_atual.atribuicao, rota, proximo)
+                    bound = custos[i] + valor
+                    if instrumentar:
+                        tempo_atribuicao += time.perf_counter() - t2
+                        estatisticas.chamadas_bound += 1
+                heapq.heappush(fila_prioridade, No(rota=rota + [proximo], custo=custos[i], bound=bound,
+                                                   mascara=mascara, atribuicao=estado))
+                if instrumentar:
+                    estatisticas.nos_gerados += 1
+            if instrumentar:
+                estatisticas.tempo_bound_segundos += tempo_atribuicao
+                estatisticas.tempo_fila_segundos += time.perf_counter() - t1 - tempo_atribuicao
+                estatisticas.pico_fila = max(estatisticas.pico_fila, len(fila_prioridade))
+
+    if instrumentar:
+        estatisticas.tempo_total_segundos = time.perf_counter() - estatisticas.inicio
+
+    if modo_matriz != MODO_PADRAO:
+        custo_otimo = custo_em_km(custo_otimo, escala)
     return solucao_otima, custo_otimo, nos_expandidos
 
 
-if __name__ == "__main__":
+def _para_float(valor):
     try:
-        matriz_distancias_df = pd.read_csv(INPUT_MATRIZ_CSV, index_col=0)  # Usa path
-        matriz_distancias_df = matriz_distancias_df.apply(pd.to_numeric, errors='coerce')
-        matriz_distancias_df = matriz_distancias_df.fillna(np.inf)
+        return float(valor)
+    except ValueError:
+        return np.nan
 
-        # A diagonal já deve ser np.inf, mas garantimos
-        np.fill_diagonal(matriz_distancias_df.values, np.inf)
 
-    except FileNotFoundError:
-        print(f"Erro: O arquivo '{INPUT_MATRIZ_CSV}' não foi encontrado.")
-        print("Execute o 'matriz_custos.py' primeiro.")
-        sys.exit(1)
+def ler_matriz_csv(caminho_csv):
+    """
+    Lê a matriz de distâncias gerada pelo 'matriz_custos.py' sem o pandas. Retorna os nomes
+    das cidades e a matriz NumPy pronta para o solver (ausentes e diagonal como np.inf).
+    """
+    with open(caminho_csv, 'r', newline='', encoding='utf-8') as f:
+        linhas = list(csv.reader(f))
+    cidades = linhas[0][1:]
+    valores = np.array([[_para_float(valor) for valor in linha[1:]] for linha in linhas[1:]],
+                       dtype=float).reshape(len(linhas) - 1, len(cidades))
+    valores[np.isnan(valores)] = np.inf
+    np.fill_diagonal(valores, np.inf)
+    return cidades, valores
+
+
+def carregar_matriz_distancias(caminho_csv):
+    """
+    Lê a matriz de distâncias gerada pelo 'matriz_custos.py' e a prepara para o solver (DataFrame).
+    """
+    import pandas as pd
+    return preparar_matriz_distancias(pd.read_csv(caminho_csv, index_col=0))
+
 
-    print("Iniciando o algoritmo de Branch and Bound...\n")
+def preparar_matriz_distancias(matriz_distancias_df):
+    """Converte a matriz para float: valores ausentes e a diagonal viram np.inf."""
+    import pandas as pd
+    matriz_distancias_df = matriz_distancias_df.apply(pd.to_numeric, errors='coerce')
 
-    inicio = time.time()
-    # Passa o DataFrame (para que o nome das colunas seja mantido)
-    rota_otima, custo_otimo, nos_expandidos = branch_and_bound_tsp(matriz_distancias_df)
-    fim = time.time()
-    tempo_execucao = fim - inicio
+    # Cópia gravável (no pandas 3, '.values' pode ser somente leitura)
+    valores = matriz_distancias_df.to_numpy(dtype=float, copy=True)
+    valores[np.isnan(valores)] = np.inf
+    np.fill_diagonal(valores, np.inf)
+    return pd.DataFrame(valores, index=matriz_distancias_df.index, columns=matriz_distancias_df.columns)
+
+
+def configuracao_cache(modo_matriz=MODO_PADRAO, instrumentar=False, limitante=LIMITANTE_PADRAO):
+    """Configuração do solver que entra na chave do cache de resultados (ver app/cache_resultados.py)."""
+    return {"solver": "branch_and_bound", "modo_matriz": modo_matriz, "instrumentar": bool(instrumentar),
+            "limitante": limitante}
+
+
+def executar_branch_and_bound(caminho_matriz, caminho_resultados, instrumentar=False, descricao="",
+                              modo_matriz=MODO_PADRAO, pesos_camadas=None, caminho_camadas=None, caminho_eventos=None,
+                              caminho_cache=None, limitante=LIMITANTE_PADRAO):
+    """
+    Lê a matriz, executa o B&B, imprime e salva os resultados em JSON.
+    'limitante' escolhe o bound da busca ('duas_menores' ou 'atribuicao'; sem ele, o da matriz,
+    ver escolher_limitante) e é salvo nos resultados.
+    Com 'pesos_camadas' (ex: {'duracao_h': 1}), o custo é a combinação das camadas salvas
+    em 'caminho_camadas' (NPZ gerado pelo 'matriz_custos.py') em vez da distância do CSV.
+    O custo é salvo em 'custo_total', com a sua 'unidade'; 'custo_total_km' só existe quando
+    ele está em km.
+    Com 'caminho_eventos', o andamento da busca é gravado como eventos JSONL (ver app/eventos.py).
+    Com 'caminho_cache', uma instância já resolvida (mesmas cidades, matriz e configuração)
+    é lida do cache de resultados em vez de rodar o B&B de novo.
+    As estatísticas exibidas pelo dashboard (resumo e histograma da matriz, trechos da rota)
+    são salvas ao lado dos resultados (ver app/estatisticas_resultados.py).
+    """
+    caminho_entrada = caminho_camadas if pesos_camadas else caminho_matriz
+    unidade = 'km'
+    try:
+        if pesos_camadas:
+            from app.camadas_custo import MatrizCustos, unidade_pesos  # pandas só é necessário para as camadas
+            unidade = unidade_pesos(pesos_camadas)
+            matriz_combinada = MatrizCustos.carregar(caminho_camadas).combinar(pesos_camadas)
+            cidades, matriz_distancias = list(matriz_combinada.columns), matriz_combinada.to_numpy()
+        else:
+            cidades, matriz_distancias = ler_matriz_csv(caminho_matriz)  # Usa path
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{caminho_entrada}' não foi encontrado.")
+        print("Execute a etapa de matriz de custos ('matriz_custos.py') primeiro.")
+        sys.exit(1)
 
-    print("Resultados:")
+    limitante = escolher_limitante(matriz_distancias, limitante)
+    cache = CacheResultados(caminho_cache) if caminho_cache else None
+    em_cache = None
+    if cache is not None:
+        chave = chave_instancia(cidades, matriz_distancias, configuracao_cache(modo_matriz, instrumentar, limitante))
+        em_cache = cache.obter(chave)
+
+    with abrir_registro(caminho_eventos) as registro:
+        if em_cache is not None:
+            print(f"Resultado{descricao} obtido do cache de resultados ('{caminho_cache}').\n")
+            registro.emitir(CACHE_HIT, cache='resultados', cidades=len(cidades))
+            rota_otima = rota_para_indices(em_cache["rota_cidades"], cidades)
+            custo_otimo = em_cache["custo"]
+            nos_expandidos = em_cache["nos_expandidos"]
+            tempo_execucao = em_cache["tempo_execucao_segundos"]
+            instrumentacao = em_cache.get("instrumentacao")
+        else:
+            print(f"Iniciando o algoritmo de Branch and Bound{descricao}...\n")
+            estatisticas = EstatisticasBusca() if instrumentar else None
+            inicio = time.time()
+            with registro.etapa('branch_and_bound' + descricao, cidades=len(cidades)):
+                rota_otima, custo_otimo, nos_expandidos = branch_and_bound_tsp(
+                    matriz_distancias, estatisticas, modo_matriz,
+                    registro=registro if caminho_eventos else None, limitante=limitante)
+            fim = time.time()
+            tempo_execucao = fim - inicio
+            instrumentacao = estatisticas.para_dict() if estatisticas is not None else None
+            if cache is not None and rota_otima is not None:
+                cache.guardar(chave, {"rota_cidades": rota_para_cidades(rota_otima, cidades),
+                                      "custo": float(custo_otimo), "nos_expandidos": nos_expandidos,
+                                      "tempo_execucao_segundos": tempo_execucao, "instrumentacao": instrumentacao})
+    if cache is not None:
+        cache.salvar()
+
+    print(f"Resultados{descricao}:")
     if rota_otima is None:
         print("Nenhuma rota viável encontrada (grafo pode estar desconexo).")
-    else:
-        rota_completa = rota_otima + [rota_otima[0]]
-        # Usa o DataFrame para obter os nomes das cidades
-        rota_nomes = [matriz_distancias_df.columns[i] for i in rota_completa]
-
-        print(f"Rota Ótima (índices): {rota_completa}")
-        print(f"Rota Ótima (nomes): {rota_nomes}")
-        print(f"Custo Total da Rota: {custo_otimo:.2f} km")
-        print(f"Nós Expandidos: {nos_expandidos}")
-        print(f"Tempo de Execução: {tempo_execucao:.4f} segundos")
-
-        resultados = {
-            "rota_otima_indices": rota_otima,
-            "rota_otima_nomes": rota_nomes,
-            "custo_total_km": custo_otimo,
-            "tempo_execucao_segundos": tempo_execucao,
-            "nos_expandidos": nos_expandidos
-        }
+        return None
+
+    rota_completa = rota_otima + [rota_otima[0]]
+    rota_nomes = [cidades[i] for i in rota_completa]
+
+    print(f"Rota Ótima (índices): {rota_completa}")
+    print(f"Rota Ótima (nomes): {rota_nomes}")
+    print(f"Custo Total da Rota: {custo_otimo:.2f} {unidade}")
+    print(f"Nós Expandidos: {nos_expandidos}")
+    print(f"Tempo de Execução: {tempo_execucao:.4f} segundos")
+
+    resultados = {
+        "rota_otima_indices": rota_otima,
+        "rota_otima_nomes": rota_nomes,
+        "custo_total": custo_otimo,
+        "unidade": unidade,
+        "tempo_execucao_segundos": tempo_execucao,
+        "nos_expandidos": nos_expandidos,
+        "limitante": limitante
+    }
+    if unidade == 'km':
+        # Nome lido pelo dashboard e pela API; só quando o custo está de fato em km
+        resultados["custo_total_km"] = custo_otimo
+    if pesos_camadas:
+        resultados["pesos_camadas"] = pesos_camadas
+
+    if em_cache is not None:
+        # O tempo de execução é o da resolução original, guardada no cache
+        resultados["do_cache"] = True
+    if instrumentacao is not None:
+        resultados["instrumentacao"] = instrumentacao
+        print(f"Tempo na expansão dos nós (kernels): {instrumentacao.get('tempo_expansao_segundos', 0.0):.4f} segundos")
+        print(f"Tempo no cálculo do bound fora dos kernels: {instrumentacao['tempo_bound_segundos']:.4f} segundos")
+        print(f"Pico da fila de prioridade: {instrumentacao['pico_fila']}")
+
+    try:
+        with open(caminho_resultados, 'w') as f:  # Usa path
+            json.dump(resultados, f, indent=4)
+        print(f"Resultados salvos em '{caminho_resultados}'.")
+    except Exception as e:
+        print(f"Erro ao salvar o arquivo de resultados: {e}")
 
-        try:
-            with open(OUTPUT_RESULTADOS_JSON, 'w') as f:  # Usa path
-                json.dump(resultados, f, indent=4)
-            print(f"Resultados salvos em '{OUTPUT_RESULTADOS_JSON}'.")
-        except Exception as e:
-            print(f"Erro ao salvar o arquivo de resultados: {e}")
\ No newline at end of file
+    try:
+        estatisticas = calcular_estatisticas(matriz_distancias, cidades, rota_otima, unidade=unidade)
+        salvar_estatisticas(estatisticas, caminho_estatisticas(caminho_resultados))
+    except Exception as e:
+        print(f"Erro ao salvar as estatísticas dos resultados: {e}")
+
+    return resultados
+
+
+def ler_opcao(argumentos, nome, padrao=None):
+    """Lê '--<nome>=<valor>' dos argumentos da linha de comando."""
+    for argumento in argumentos:
+        if argumento.startswith(f'--{nome}='):
+            return argumento.split('=', 1)[1]
+    return padrao
+
+
+if __name__ == "__main__":
+    from app.camadas_custo import ler_pesos_camadas
+
+    # Use '--instrumentar' para exportar as estatísticas detalhadas da busca,
+    # '--modo-matriz=int32' (ou float32) para a representação compacta da matriz
+    # e '--pesos=duracao_h:1' (ou 'distancia_km:1,duracao_h:80') para otimizar outras camadas de custo.
+    # '--limitante=duas_menores' (ou atribuicao) força o bound; o padrão usa o de atribuição nas matrizes assimétricas
+    # '--eventos' grava o andamento da busca em results/eventos.jsonl
+    # e '--sem-cache' ignora o cache de resultados (data/cache/resultados.json), resolvendo sempre
+    pesos = ler_opcao(sys.argv, 'pesos')
+    executar_branch_and_bound(INPUT_MATRIZ_CSV, OUTPUT_RESULTADOS_JSON,
+                              instrumentar='--instrumentar' in sys.argv,
+                              modo_matriz=ler_opcao(sys.argv, 'modo-matriz', MODO_PADRAO),
+                              pesos_camadas=ler_pesos_camadas(pesos) if pesos else None,
+                              caminho_camadas=INPUT_CAMADAS_NPZ,
+                              caminho_eventos=caminho_eventos_argumentos(sys.argv),
+                              caminho_cache=None if '--sem-cache' in sys.argv else CACHE_RESULTADOS_JSON,
+                              limitante=ler_opcao(sys.argv, 'limitante', LIMITANTE_PADRAO))
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Configuração de Paths
+DATA_DIR = 'data'
+CACHE_RESULTADOS_JSON = os.path.join(DATA_DIR, 'cache', 'resultados.json')
+
+# Incrementar quando o formato das entradas mudar: o cache antigo é descartado ao carregar
+VERSAO_CACHE = 1
+
+# Limite do cache (soma das entradas serializadas); as menos usadas recentemente saem primeiro.
+# Uma entrada com instrumentação de uma instância de 10 cidades ocupa poucos KB.
+TAMANHO_MAX_CACHE_BYTES = 8 * 1024 * 1024
+
+# Casas decimais da matriz consideradas na chave (diferenças menores não mudam a rota)
+CASAS_DECIMAIS_CHAVE = 6
+
+# Trava do arquivo durante a gravação: uma trava mais antiga que isso é de um processo que
+# morreu no meio da gravação e é descartada
+TEMPO_TRAVA_OBSOLETA_SEGUNDOS = 30
+INTERVALO_TRAVA_SEGUNDOS = 0.01
+
+
+def chave_instancia(cidades, matriz, configuracao):
+    """
+    Chave do cache: SHA-256 das cidades em ordem alfabética, da matriz reordenada na mesma
+    ordem e da configuração do solver. A mesma seleção de cidades em outra ordem (ex: outro
+    depósito) gera a mesma chave. Retorna None se houver nomes repetidos, pois a rota é
+    guardada pelos nomes das cidades.
+    """
+    cidades = [str(cidade) for cidade in cidades]
+    if len(set(cidades)) != len(cidades):
+        return None
+    ordem = sorted(range(len(cidades)), key=cidades.__getitem__)
+
+    valores = np.round(np.array(matriz, dtype=np.float64)[np.ix_(ordem, ordem)], CASAS_DECIMAIS_CHAVE)
+    # Ausentes (NaN, no CSV) e infinitos (já preparados) representam a mesma aresta inexistente
+    valores[np.isnan(valores)] = np.inf
+    np.fill_diagonal(valores, np.inf)
+
+    h = hashlib.sha256()
+    h.update(json.dumps({"versao": VERSAO_CACHE, "cidades": [cidades[i] for i in ordem],
+                         "configuracao": configuracao}, sort_keys=True).encode())
+    h.update(np.ascontiguousarray(valores).tobytes())
+    return h.hexdigest()
+
+
+def rota_para_cidades(rota_indices, cidades):
+    """Rota (índices, sem repetir o início) como nomes de cidades, independente da ordem da matriz."""
+    return [str(cidades[i]) for i in rota_indices]
+
+
+def rota_para_indices(rota_cidades, cidades, inicio=0):
+    """
+    Volta aos índices da matriz atual, girando a rota para que comece em 'inicio'
+    (o B&B sempre parte do índice 0, que é o depósito na simulação).
+    """
+    posicoes = {str(cidade): i for i, cidade in enumerate(cidades)}
+    rota = [posicoes[cidade] for cidade in rota_cidades]
+    deslocamento = rota.index(inicio)
+    return rota[deslocamento:] + rota[:deslocamento]
+
+
+@contextmanager
+def _travar_arquivo(caminho_trava):
+    """
+    Trava entre processos por arquivo de criação exclusiva (O_EXCL, disponível em qualquer
+    sistema). Espera a trava de outro processo, exceto se ela for obsoleta.
+    """
+    while True:
+        try:
+            descritor = os.open(caminho_trava, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(caminho_trava) > TEMPO_TRAVA_OBSOLETA_SEGUNDOS:
+                    os.remove(caminho_trava)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(INTERVALO_TRAVA_SEGUNDOS)
+    try:
+        yield
+    finally:
+        os.close(descritor)
+        os.remove(caminho_trava)
+
+
+class CacheResultados:
+    """
+    Resultados já resolvidos (rota, custo e estatísticas), guardados em JSON e compartilhados
+    entre execuções do script, da CLI e das simulações do dashboard. As entradas seguem a
+    ordem de uso (LRU) e os acertos e falhas são contados para acompanhar a taxa de acerto.
+    Pode ser usado por várias threads (pool de simulações do dashboard) e por vários processos
+    com o mesmo arquivo: 'salvar' relê o arquivo sob uma trava e mescla as alterações deste
+    processo (entradas gravadas ou usadas e o acréscimo dos contadores) com as dos outros.
+    """
+
+    def __init__(self, caminho=CACHE_RESULTADOS_JSON, tamanho_max_bytes=TAMANHO_MAX_CACHE_BYTES):
+        self.caminho = caminho
+        self.tamanho_max_bytes = tamanho_max_bytes
+        self.entradas = OrderedDict()  # chave -> {"resultado": ..., "bytes": ...}; a mais recente no fim
+        self.contadores = {"acertos": 0, "falhas": 0, "gravacoes": 0, "remocoes": 0}
+        self.alterado = False
+        self.trava = threading.Lock()
+        # Alterações ainda não gravadas: chaves usadas (na ordem de uso), contadores na última
+        # leitura do arquivo e se o cache foi limpo
+        self.usadas = OrderedDict()
+        self.contadores_lidos = dict(self.contadores)
+        self.limpo = False
+        if caminho and os.path.exists(caminho):
+            self.contadores, self.entradas = self._ler_arquivo()
+            self.contadores_lidos = dict(self.contadores)
+
+    def _ler_arquivo(self):
+        """Contadores e entradas gravados no arquivo (vazios se ele não existir ou for de outra versão)."""
+        contadores, entradas = dict.fromkeys(self.contadores, 0), OrderedDict()
+        try:
+            with open(self.caminho, 'r') as f:
+                dados = json.load(f)
+        except FileNotFoundError:
+            return contadores, entradas
+        except (OSError, ValueError):
+            print(f"Aviso: cache de resultados '{self.caminho}' ilegível; começando vazio.")
+            return contadores, entradas
+        if dados.get("versao") != VERSAO_CACHE:
+            return contadores, entradas
+        contadores.update(dados.get("contadores", {}))
+        for chave, resultado in dados.get("entradas", []):
+            entradas[chave] = {"resultado": resultado, "bytes": len(json.dumps(resultado))}
+        return contadores, entradas
+
+    def _usar(self, chave):
+        self.usadas[chave] = True
+        self.usadas.move_to_end(chave)
+        self.alterado = True
+
+    def _remover_excedentes(self, entradas):
+        """Remove as entradas menos usadas até caber no limite; retorna quantas saíram."""
+        total = sum(entrada["bytes"] for entrada in entradas.values())
+        removidas = 0
+        while total > self.tamanho_max_bytes and len(entradas) > 1:
+            _, removida = entradas.popitem(last=False)
+            total -= removida["bytes"]
+            removidas += 1
+        return removidas
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def __contains__(self, chave):
+        return chave in self.entradas
+
+    @property
+    def tamanho_bytes(self):
+        return sum(entrada["bytes"] for entrada in self.entradas.values())
+
+    def obter(self, chave):
+        """Resultado guardado para a chave (ou None), contando o acerto ou a falha."""
+        with self.trava:
+            entrada = self.entradas.get(chave) if chave is not None else None
+            if entrada is None:
+                self.contadores["falhas"] += 1
+            else:
+                self.contadores["acertos"] += 1
+                self.entradas.move_to_end(chave)
+                self._usar(chave)
+            self.alterado = True
+            return None if entrada is None else entrada["resultado"]
+
+    def guardar(self, chave, resultado):
+        """Guarda um resultado serializável em JSON e remove as entradas mais antigas além do limite."""
+        if chave is None:
+            return
+        tamanho = len(json.dumps(resultado))
+        with self.trava:
+            self.entradas[chave] = {"resultado": resultado, "bytes": tamanho}
+            self.entradas.move_to_end(chave)
+            self.contadores["gravacoes"] += 1
+            self.contadores["remocoes"] += self._remover_excedentes(self.entradas)
+            self._usar(chave)
+
+    def estatisticas(self):
+        consultas = self.contadores["acertos"] + self.contadores["falhas"]
+        return {
+            "entradas": len(self.entradas),
+            "tamanho_bytes": self.tamanho_bytes,
+            "tamanho_max_bytes": self.tamanho_max_bytes,
+            **self.contadores,
+            "taxa_acerto": self.contadores["acertos"] / consultas if consultas else 0.0,
+        }
+
+    def salvar(self):
+        if not self.caminho or not self.alterado:
+            return
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        with _travar_arquivo(f"{self.caminho}.lock"), self.trava:
+            # Mescla com o que outros processos gravaram desde a última leitura
+            contadores, entradas = self._ler_arquivo()
+            if self.limpo:
+                contadores, entradas = dict.fromkeys(contadores, 0), OrderedDict()
+            for chave in self.usadas:
+                if chave in self.entradas:
+                    entradas[chave] = self.entradas[chave]
+                    entradas.move_to_end(chave)
+            for nome, valor in self.contadores.items():
+                contadores[nome] = contadores.get(nome, 0) + valor - self.contadores_lidos.get(nome, 0)
+            contadores["remocoes"] += self._remover_excedentes(entradas)
+
+            self.entradas, self.contadores = entradas, contadores
+            self.contadores_lidos = dict(contadores)
+            self.usadas.clear()
+            self.limpo = self.alterado = False
+            dados = {"versao": VERSAO_CACHE, "contadores": dict(contadores),
+                     "entradas": [[chave, entrada["resultado"]] for chave, entrada in entradas.items()]}
+
+            # Grava em um arquivo temporário e troca: outro processo nunca lê um JSON pela metade
+            temporario = f"{self.caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, 'w') as f:
+                json.dump(dados, f)
+            os.replace(temporario, self.caminho)
+
+    def limpar(self):
+        with self.trava:
+            self.entradas.clear()
+            self.contadores = dict.fromkeys(self.contadores, 0)
+            self.contadores_lidos = dict(self.contadores)
+            self.usadas.clear()
+            self.limpo = self.alterado = True
+
+
+# Execução Principal
+if __name__ == "__main__":
+    # Mostra o uso do cache de resultados; '--limpar' descarta as entradas e os contadores
+    cache = CacheResultados()
+    if '--limpar' in sys.argv:
+        cache.limpar()
+        cache.salvar()
+        print(f"Cache de resultados '{cache.caminho}' limpo.")
+    estatisticas = cache.estatisticas()
+    print(f"Entradas: {estatisticas['entradas']} ({estatisticas['tamanho_bytes'] / 1024:.1f} KB "
+          f"de {estatisticas['tamanho_max_bytes'] / 1024:.0f} KB)")
+    print(f"Acertos: {estatisticas['acertos']}  Falhas: {estatisticas['falhas']}  "
+          f"Taxa de acerto: {estatisticas['taxa_acerto']:.1%}")
+    print(f"Gravações: {estatisticas['gravacoes']}  Remoções por tamanho: {estatisticas['remocoes']}")
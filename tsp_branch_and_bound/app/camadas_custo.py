@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# Camadas produzidas pelo 'matriz_custos.py' (distância da rodovia e duração da viagem)
+CAMADA_DISTANCIA = 'distancia_km'
+CAMADA_DURACAO = 'duracao_h'
+PREFIXO_PERFIL_HORARIO = 'duracao_h_'
+
+# Fator multiplicativo da duração por hora do dia (trânsito nos horários de pico).
+# O ORS gratuito não retorna durações dependentes do horário, então os perfis são
+# derivados da duração base; qualquer tabela de fatores pode ser informada.
+FATORES_HORARIOS_PADRAO = {
+    0: 0.9, 1: 0.9, 2: 0.9, 3: 0.9, 4: 0.9, 5: 0.95,
+    6: 1.1, 7: 1.35, 8: 1.35, 9: 1.15, 10: 1.0, 11: 1.0,
+    12: 1.1, 13: 1.05, 14: 1.0, 15: 1.0, 16: 1.1, 17: 1.4,
+    18: 1.4, 19: 1.2, 20: 1.0, 21: 0.95, 22: 0.9, 23: 0.9,
+}
+
+
+def nome_perfil_horario(hora):
+    return f"{PREFIXO_PERFIL_HORARIO}{hora:02d}"
+
+
+class MatrizCustos:
+    """
+    Várias camadas de custo (distância, duração, perfis por horário, pedágio...) sobre o mesmo
+    conjunto de cidades, empilhadas em um único array NumPy de forma (camadas, n, n).
+    As camadas ficam prontas para o solver: diagonal e arestas inexistentes são np.inf.
+    """
+
+    def __init__(self, camadas, nomes_camadas, cidades):
+        camadas = np.array(camadas, dtype=float)
+        if camadas.ndim != 3 or camadas.shape[1] != camadas.shape[2] or len(camadas) != len(nomes_camadas):
+            raise ValueError("As camadas devem ter a forma (len(nomes_camadas), n, n).")
+        camadas[np.isnan(camadas)] = np.inf
+        for camada in camadas:
+            np.fill_diagonal(camada, np.inf)
+
+        self.camadas = camadas
+        self.nomes_camadas = list(nomes_camadas)
+        self.cidades = list(cidades)
+
+    def __len__(self):
+        return len(self.cidades)
+
+    def _indice(self, nome):
+        try:
+            return self.nomes_camadas.index(nome)
+        except ValueError:
+            raise KeyError(f"Camada '{nome}' não existe. Disponíveis: {self.nomes_camadas}") from None
+
+    def _como_dataframe(self, valores):
+        return pd.DataFrame(valores, index=self.cidades, columns=self.cidades, copy=False)
+
+    def camada(self, nome):
+        """Uma camada como DataFrame para os solvers. Não copia os dados (é uma visão do array)."""
+        return self._como_dataframe(self.camadas[self._indice(nome)])
+
+    def combinar(self, pesos):
+        """
+        Combinação ponderada das camadas, ex: {'distancia_km': 1.0, 'duracao_h': 80.0}
+        (km + 80 por hora de viagem). Com uma única camada de peso 1, retorna a própria camada.
+        """
+        pesos = {nome: peso for nome, peso in pesos.items() if peso != 0}
+        if not pesos:
+            raise ValueError("Informe ao menos uma camada com peso diferente de zero.")
+        if len(pesos) == 1:
+            (nome, peso), = pesos.items()
+            if peso == 1:
+                return self.camada(nome)
+
+        indices = [self._indice(nome) for nome in pesos]
+        vetor_pesos = np.array(list(pesos.values()), dtype=float)
+        # tensordot soma camadas * pesos; inf * 0 não ocorre porque pesos nulos foram removidos
+        return self._como_dataframe(np.tensordot(vetor_pesos, self.camadas[indices], axes=1))
+
+    def adicionar_camada(self, nome, valores):
+        """Acrescenta uma camada (ex: pedágio em R$) com a mesma ordem de cidades."""
+        if nome in self.nomes_camadas:
+            raise ValueError(f"A camada '{nome}' já existe.")
+        nova = MatrizCustos(np.asarray(valores, dtype=float)[None], [nome], self.cidades)
+        self.camadas = np.concatenate([self.camadas, nova.camadas])
+        self.nomes_camadas.append(nome)
+
+    def adicionar_perfis_horarios(self, fatores_horarios=None, camada_base=CAMADA_DURACAO):
+        """Acrescenta uma camada de duração para cada hora do dia, escalando a duração base."""
+        fatores_horarios = FATORES_HORARIOS_PADRAO if fatores_horarios is None else fatores_horarios
+        base = self.camadas[self._indice(camada_base)]
+        perfis = np.stack([base * fator for fator in fatores_horarios.values()])
+        self.camadas = np.concatenate([self.camadas, perfis])
+        self.nomes_camadas.extend(nome_perfil_horario(hora) for hora in fatores_horarios)
+
+    def salvar(self, caminho_npz):
+        np.savez_compressed(caminho_npz, camadas=self.camadas, nomes_camadas=np.array(self.nomes_camadas),
+                            cidades=np.array(self.cidades))
+
+    @classmethod
+    def carregar(cls, caminho_npz):
+        with np.load(caminho_npz, allow_pickle=False) as dados:
+            return cls(dados['camadas'], dados['nomes_camadas'].tolist(), dados['cidades'].tolist())
+
+    @classmethod
+    def de_dataframe(cls, matriz_distancias, nome=CAMADA_DISTANCIA):
+        """Matriz de uma única camada a partir do formato de 'matriz_distancias.csv'."""
+        valores = matriz_distancias.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        return cls(valores[None], [nome], matriz_distancias.columns)
+
+
+def unidade_pesos(pesos):
+    """
+    Unidade do custo de uma combinação de camadas: 'km' ou 'h' para uma única camada de peso 1
+    (distância, duração ou perfil horário) e 'custo' para as demais combinações.
+    """
+    if not pesos:
+        return 'km'
+    if len(pesos) == 1:
+        (nome, peso), = pesos.items()
+        if peso == 1 and nome == CAMADA_DISTANCIA:
+            return 'km'
+        if peso == 1 and (nome == CAMADA_DURACAO or nome.startswith(PREFIXO_PERFIL_HORARIO)):
+            return 'h'
+    return 'custo'
+
+
+def ler_pesos_camadas(texto):
+    """Converte 'distancia_km:1,duracao_h:80' em {'distancia_km': 1.0, 'duracao_h': 80.0}."""
+    pesos = {}
+    for item in texto.split(','):
+        nome, _, peso = item.partition(':')
+        pesos[nome.strip()] = float(peso) if peso else 1.0
+    return pesos
@@ -0,0 +1,86 @@
+import glob
+import json
+import os
+
+import pandas as pd
+
+# Configuração de Paths
+RESULTS_DIR = 'results'
+
+# Arquivos que compõem um cenário. O sufixo identifica o cenário
+# ('' para o original, '_sensibilidade' para o de sensibilidade, etc.).
+PREFIXO_RESULTADOS = 'resultados_branch_and_bound'
+ARQUIVOS_CENARIO = {
+    'resultados': PREFIXO_RESULTADOS + '{sufixo}.json',
+    'matriz': 'matriz_distancias{sufixo}.csv',
+    'pontos': 'pontos_de_visita{sufixo}.csv',
+    'geometrias': 'geometrias_rotas{sufixo}.json',
+    # Resumo, histograma e trechos da rota calculados na resolução (ver app/estatisticas_resultados.py)
+    'estatisticas': 'estatisticas_branch_and_bound{sufixo}.json',
+}
+NOME_CENARIO_ORIGINAL = 'original'
+
+
+def ler_arquivo_resultado(caminho):
+    """Lê um arquivo de resultados pelo tipo: JSON, matriz (CSV com índice) ou CSV simples."""
+    if caminho.endswith('.json'):
+        with open(caminho, 'r') as f:
+            return json.load(f)
+    if os.path.basename(caminho).startswith('matriz_'):
+        return pd.read_csv(caminho, index_col=0)
+    return pd.read_csv(caminho)
+
+
+class Cenario:
+    """
+    Um conjunto de resultados em 'results/'. Nada é lido na criação: cada componente
+    (resultados, matriz, pontos, geometrias, estatisticas) é carregado apenas quando solicitado.
+    """
+
+    def __init__(self, nome, sufixo, diretorio=RESULTS_DIR):
+        self.nome = nome
+        self.sufixo = sufixo
+        self.diretorio = diretorio
+
+    def __repr__(self):
+        return f"Cenario({self.nome!r})"
+
+    def caminho(self, componente):
+        return os.path.join(self.diretorio, ARQUIVOS_CENARIO[componente].format(sufixo=self.sufixo))
+
+    def assinatura(self, componente):
+        """
+        (caminho, mtime_ns) do componente, ou None se o arquivo não existir. É a chave do cache
+        do dashboard (st.cache_data em 'analise_dados.carregar_componente').
+        """
+        caminho = self.caminho(componente)
+        try:
+            return caminho, os.stat(caminho).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def disponivel(self, componente):
+        return self.assinatura(componente) is not None
+
+    def carregar(self, componente):
+        """Lê o componente do disco (o dashboard guarda as leituras no seu próprio cache)."""
+        caminho = self.caminho(componente)
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(2, "Arquivo não encontrado", caminho)
+        return ler_arquivo_resultado(caminho)
+
+
+def descobrir_cenarios(diretorio=RESULTS_DIR):
+    """
+    Descobre os cenários disponíveis procurando os arquivos de resultados do B&B.
+    Retorna um dicionário {nome: Cenario}, com o cenário original primeiro.
+    """
+    cenarios = {}
+    for caminho in sorted(glob.glob(os.path.join(diretorio, PREFIXO_RESULTADOS + '*.json'))):
+        sufixo = os.path.basename(caminho)[len(PREFIXO_RESULTADOS):-len('.json')]
+        nome = sufixo.lstrip('_') or NOME_CENARIO_ORIGINAL
+        cenarios[nome] = Cenario(nome, sufixo, diretorio)
+
+    if NOME_CENARIO_ORIGINAL in cenarios:
+        cenarios = {NOME_CENARIO_ORIGINAL: cenarios.pop(NOME_CENARIO_ORIGINAL), **cenarios}
+    return cenarios
@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Estatísticas exibidas pelo dashboard, calculadas uma única vez na resolução e salvas ao lado
+# do arquivo de resultados: o resumo e o histograma das distâncias da matriz (em vez dos n²
+# valores brutos) e os trechos da rota escolhida. Só usa o NumPy, como o 'branch_e_bound.py'.
+
+# Configuração de Paths
+RESULTS_DIR = 'results'
+PREFIXO_RESULTADOS = 'resultados_'
+PREFIXO_ESTATISTICAS = 'estatisticas_'
+
+# Faixas de mesma largura entre a menor e a maior distância da matriz
+NUM_FAIXAS_HISTOGRAMA = 30
+PERCENTIS = (25, 50, 75)
+
+
+def caminho_estatisticas(caminho_resultados):
+    """
+    Arquivo de estatísticas ao lado do de resultados:
+    'results/resultados_branch_and_bound.json' -> 'results/estatisticas_branch_and_bound.json'.
+    """
+    diretorio, nome = os.path.split(caminho_resultados)
+    if nome.startswith(PREFIXO_RESULTADOS):
+        nome = nome[len(PREFIXO_RESULTADOS):]
+    return os.path.join(diretorio, PREFIXO_ESTATISTICAS + nome)
+
+
+def resumo_valores(valores):
+    """Resumo no formato do describe() do pandas (count, mean, std, min, 25%, 50%, 75%, max)."""
+    valores = np.asarray(valores, dtype=float)
+    if len(valores) == 0:
+        return {"count": 0}
+    resumo = {"count": int(len(valores)), "mean": float(valores.mean()),
+              "std": float(valores.std(ddof=1)) if len(valores) > 1 else None,
+              "min": float(valores.min())}
+    for percentil, valor in zip(PERCENTIS, np.percentile(valores, PERCENTIS)):
+        resumo[f"{percentil}%"] = float(valor)
+    resumo["max"] = float(valores.max())
+    return resumo
+
+
+def histograma(valores, num_faixas=NUM_FAIXAS_HISTOGRAMA):
+    """Contagem por faixa: 'bordas' tem num_faixas + 1 valores e 'contagens', num_faixas."""
+    if len(valores) == 0:
+        return {"bordas": [], "contagens": []}
+    contagens, bordas = np.histogram(valores, bins=num_faixas)
+    return {"bordas": bordas.tolist(), "contagens": contagens.tolist()}
+
+
+def trechos_rota(matriz, cidades, rota):
+    """Origem, destino e custo de cada trecho da rota, incluindo o retorno ao início."""
+    origens = np.asarray(rota)
+    destinos = np.roll(origens, -1)
+    custos = matriz[origens, destinos] if len(origens) > 1 else np.zeros(len(origens))
+    return [{"origem": cidades[i], "destino": cidades[j], "custo": float(custo)}
+            for i, j, custo in zip(origens, destinos, custos)]
+
+
+def calcular_estatisticas(matriz, cidades, rota=None, unidade='km', num_faixas=NUM_FAIXAS_HISTOGRAMA):
+    """
+    Estatísticas da matriz (pares com custo finito e positivo: a diagonal e os pares sem rota
+    ficam de fora) e, com a rota, de cada um dos seus trechos.
+    """
+    matriz = np.asarray(matriz, dtype=float)
+    valores = matriz[np.isfinite(matriz) & (matriz > 0)]
+    estatisticas = {
+        "unidade": unidade,
+        "matriz": {"resumo": resumo_valores(valores), "histograma": histograma(valores, num_faixas)},
+    }
+    if rota:
+        trechos = trechos_rota(matriz, cidades, rota)
+        estatisticas["rota"] = {"resumo": resumo_valores([trecho["custo"] for trecho in trechos]),
+                                "trechos": trechos}
+    return estatisticas
+
+
+def salvar_estatisticas(estatisticas, caminho):
+    with open(caminho, 'w') as f:
+        json.dump(estatisticas, f, indent=4)
+
+
+def recalcular_cenarios(diretorio=RESULTS_DIR):
+    """Gera as estatísticas dos cenários já resolvidos em 'diretorio' (resultados anteriores a este arquivo)."""
+    from app.cenarios import descobrir_cenarios
+
+    for nome, cenario in descobrir_cenarios(diretorio).items():
+        if not cenario.disponivel('matriz'):
+            print(f"Cenário '{nome}' sem matriz de distâncias; ignorado.")
+            continue
+        matriz = cenario.carregar('matriz')
+        resultados = cenario.carregar('resultados')
+        # O CSV está sempre em km, mesmo quando a rota foi otimizada por uma combinação de camadas
+        estatisticas = calcular_estatisticas(matriz.to_numpy(dtype=float), list(matriz.columns),
+                                             resultados.get('rota_otima_indices'))
+        salvar_estatisticas(estatisticas, cenario.caminho('estatisticas'))
+        print(f"Estatísticas do cenário '{nome}' salvas em '{cenario.caminho('estatisticas')}'.")
+
+
+# Execução Principal
+if __name__ == "__main__":
+    recalcular_cenarios()
@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Configuração de Paths
+RESULTS_DIR = 'results'
+EVENTOS_JSONL = os.path.join(RESULTS_DIR, 'eventos.jsonl')
+
+# Tipos de evento emitidos pelas etapas do pipeline
+PAR_OBTIDO = 'par_obtido'
+CACHE_HIT = 'cache_hit'
+TENTATIVA_REPETIDA = 'tentativa_repetida'
+ESPERA_LIMITE = 'espera_limite'
+FALHA_PAR = 'falha_par'
+PROGRESSO_BUSCA = 'progresso_busca'
+INCUMBENTE = 'incumbente'
+ETAPA_INICIO = 'etapa_inicio'
+ETAPA_FIM = 'etapa_fim'
+
+_FIM = object()
+
+
+def _serializar(valor):
+    """Converte escalares NumPy (np.int64, np.float32...) para tipos nativos do JSON."""
+    if hasattr(valor, 'item'):
+        return valor.item()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+class RegistroEventos:
+    """
+    Grava eventos estruturados (uma linha JSON por evento) em um arquivo JSONL.
+    'emitir' apenas coloca o evento em uma fila; uma thread separada serializa e grava
+    em lotes, com buffer, descarregando o arquivo a cada 'intervalo_descarga' segundos.
+    """
+
+    def __init__(self, caminho, intervalo_descarga=0.5, tamanho_buffer=1 << 16):
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self.caminho = caminho
+        self.intervalo_descarga = intervalo_descarga
+        self.arquivo = open(caminho, 'a', encoding='utf-8', buffering=tamanho_buffer)
+        self.fila = queue.SimpleQueue()
+        self.eventos_descartados = 0
+        self.thread = threading.Thread(target=self._escrever, name='registro-eventos', daemon=True)
+        self.thread.start()
+
+    def emitir(self, tipo, **campos):
+        self.fila.put({'ts': time.time(), 'tipo': tipo, **campos})
+
+    @contextmanager
+    def etapa(self, nome, **campos):
+        """Emite o início e o fim (com a duração) de uma etapa do pipeline."""
+        inicio = time.perf_counter()
+        self.emitir(ETAPA_INICIO, etapa=nome, **campos)
+        try:
+            yield
+        finally:
+            self.emitir(ETAPA_FIM, etapa=nome, duracao_segundos=time.perf_counter() - inicio, **campos)
+
+    def _escrever(self):
+        proxima_descarga = time.monotonic() + self.intervalo_descarga
+        while True:
+            try:
+                evento = self.fila.get(timeout=max(proxima_descarga - time.monotonic(), 0.0))
+            except queue.Empty:
+                evento = None
+            if evento is _FIM:
+                break
+            if evento is not None:
+                self._gravar(evento)
+            # Descarrega pelo relógio, não só com a fila parada: com eventos chegando sem pausa
+            # (ex: a matriz de custos), o '--seguir' veria o arquivo só quando o buffer enchesse
+            if time.monotonic() >= proxima_descarga:
+                self.arquivo.flush()
+                proxima_descarga = time.monotonic() + self.intervalo_descarga
+        self.arquivo.flush()
+
+    def _gravar(self, evento):
+        try:
+            linha = json.dumps(evento, ensure_ascii=False, default=_serializar)
+        except (TypeError, ValueError) as e:
+            # Um campo não serializável descarta só esse evento, sem derrubar a thread
+            self.eventos_descartados += 1
+            print(f"Aviso: evento '{evento.get('tipo')}' descartado: {e}", file=sys.stderr)
+            return
+        self.arquivo.write(linha + '\n')
+
+    def fechar(self):
+        """Grava os eventos pendentes e fecha o arquivo."""
+        if self.thread.is_alive():
+            self.fila.put(_FIM)
+            self.thread.join()
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class RegistroNulo:
+    """Mesma interface do RegistroEventos, sem gravar nada (padrão quando não há arquivo de eventos)."""
+
+    def emitir(self, tipo, **campos):
+        pass
+
+    @contextmanager
+    def etapa(self, nome, **campos):
+        yield
+
+    def fechar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+REGISTRO_NULO = RegistroNulo()
+
+
+def abrir_registro(caminho=None):
+    """RegistroEventos no caminho informado, ou o registro nulo se não houver caminho."""
+    return RegistroEventos(caminho) if caminho else REGISTRO_NULO
+
+
+def caminho_eventos_argumentos(argumentos):
+    """'--eventos' grava em results/eventos.jsonl e '--eventos=<caminho>' no caminho informado."""
+    for argumento in argumentos:
+        if argumento == '--eventos':
+            return EVENTOS_JSONL
+        if argumento.startswith('--eventos='):
+            return argumento.split('=', 1)[1]
+    return None
+
+
+def ler_eventos(caminho):
+    """Lê os eventos do arquivo, ignorando uma última linha ainda incompleta."""
+    eventos = []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            try:
+                eventos.append(json.loads(linha))
+            except json.JSONDecodeError:
+                continue
+    return eventos
+
+
+def resumir_eventos(eventos):
+    """Resumo dos eventos: contagem por tipo, vazão e ETA da matriz, duração das etapas e progresso da busca."""
+    resumo = {'por_tipo': dict(Counter(evento['tipo'] for evento in eventos)), 'etapas': {}}
+
+    pares = [evento for evento in eventos if evento['tipo'] in (PAR_OBTIDO, CACHE_HIT, FALHA_PAR)
+             and 'total_pares' in evento]
+    # Considera apenas a execução mais recente (o arquivo acumula várias execuções)
+    inicios = [indice for indice, evento in enumerate(pares) if evento['concluidos'] == 1]
+    pares = pares[inicios[-1]:] if inicios else pares
+    if pares:
+        concluidos, total = pares[-1]['concluidos'], pares[-1]['total_pares']
+        decorrido = pares[-1]['ts'] - pares[0]['ts']
+        taxa = (len(pares) - 1) / decorrido if decorrido > 0 else None
+        resumo['matriz'] = {
+            'concluidos': concluidos,
+            'total_pares': total,
+            'pares_por_segundo': taxa,
+            'eta_segundos': (total - concluidos) / taxa if taxa else None,
+            'tempo_em_espera_segundos': sum(evento.get('segundos', 0) for evento in eventos
+                                            if evento['tipo'] == ESPERA_LIMITE),
+        }
+
+    for evento in eventos:
+        if evento['tipo'] == ETAPA_FIM:
+            resumo['etapas'][evento['etapa']] = evento['duracao_segundos']
+        elif evento['tipo'] == ETAPA_INICIO:
+            resumo['etapas'].setdefault(evento['etapa'], None)  # em andamento
+
+    progresso = [evento for evento in eventos if evento['tipo'] == PROGRESSO_BUSCA]
+    if progresso:
+        ultimo = progresso[-1]
+        resumo['busca'] = {
+            'nos_expandidos': ultimo['nos_expandidos'],
+            'nos_por_segundo': ultimo['nos_expandidos'] / ultimo['segundos'] if ultimo['segundos'] > 0 else None,
+            'tamanho_fila': ultimo['tamanho_fila'],
+            'melhor_custo': ultimo.get('melhor_custo'),
+        }
+    return resumo
+
+
+def imprimir_resumo(resumo):
+    print("Eventos por tipo: " + ", ".join(f"{tipo}={qtd}" for tipo, qtd in sorted(resumo['por_tipo'].items())))
+    matriz = resumo.get('matriz')
+    if matriz:
+        taxa = f"{matriz['pares_por_segundo']:.2f} pares/s" if matriz['pares_por_segundo'] else "-"
+        eta = f"{matriz['eta_segundos']:.0f} s" if matriz['eta_segundos'] is not None else "-"
+        print(f"Matriz: {matriz['concluidos']}/{matriz['total_pares']} pares | {taxa} | ETA {eta} | "
+              f"espera por limite da API: {matriz['tempo_em_espera_segundos']:.0f} s")
+    busca = resumo.get('busca')
+    if busca:
+        taxa = f"{busca['nos_por_segundo']:,.0f} nós/s" if busca['nos_por_segundo'] else "-"
+        print(f"Busca: {busca['nos_expandidos']:,} nós expandidos | {taxa} | fila {busca['tamanho_fila']:,} | "
+              f"melhor custo {busca['melhor_custo']}")
+    for etapa, duracao in resumo['etapas'].items():
+        print(f"Etapa '{etapa}': " + (f"{duracao:.2f} s" if duracao is not None else "em andamento"))
+
+
+def acompanhar(caminho, intervalo=2.0):
+    """Modo 'tail -f': reimprime o resumo sempre que o arquivo cresce."""
+    tamanho_anterior = -1
+    while True:
+        tamanho = os.path.getsize(caminho) if os.path.exists(caminho) else 0
+        if tamanho != tamanho_anterior:
+            tamanho_anterior = tamanho
+            print(f"\n[{time.strftime('%H:%M:%S')}]")
+            imprimir_resumo(resumir_eventos(ler_eventos(caminho)) if tamanho else {'por_tipo': {}, 'etapas': {}})
+        time.sleep(intervalo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume (ou acompanha) o arquivo de eventos JSONL do pipeline.")
+    parser.add_argument('caminho', nargs='?', default=EVENTOS_JSONL)
+    parser.add_argument('--seguir', action='store_true', help="Continua acompanhando o arquivo (Ctrl+C para sair).")
+    args = parser.parse_args()
+
+    if args.seguir:
+        try:
+            acompanhar(args.caminho)
+        except KeyboardInterrupt:
+            pass
+    elif not os.path.exists(args.caminho):
+        print(f"Erro: O arquivo '{args.caminho}' não foi encontrado.")
+        sys.exit(1)
+    else:
+        imprimir_resumo(resumir_eventos(ler_eventos(args.caminho)))
@@ -0,0 +1,129 @@
+import pandas as pd
+import json
+import os
+import sys
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.backends_rota import BACKEND_PADRAO, abrir_backend, backend_argumentos
+from app.eventos import abrir_registro, caminho_eventos_argumentos, REGISTRO_NULO, CACHE_HIT, PAR_OBTIDO
+
+# Configuração de Paths
+DATA_DIR = 'data'
+RESULTS_DIR = 'results'
+CACHE_GEOMETRIAS_JSON = os.path.join(DATA_DIR, 'cache', 'geometrias.json')
+INPUT_PONTOS_CSV = os.path.join(RESULTS_DIR, 'pontos_de_visita.csv')
+INPUT_RESULTADOS_JSON = os.path.join(RESULTS_DIR, 'resultados_branch_and_bound.json')
+OUTPUT_GEOM_JSON = os.path.join(RESULTS_DIR, 'geometrias_rotas.json')
+
+
+def chave_trecho(origem, destino, fonte=BACKEND_PADRAO):
+    """
+    Chave do cache: fonte do traçado (ver BackendRota.fonte_geometrias) e coordenadas (lon, lat)
+    de origem e destino, independente dos índices do cenário.
+    """
+    return f"{fonte}:{origem[0]:.6f},{origem[1]:.6f};{destino[0]:.6f},{destino[1]:.6f}"
+
+
+class CacheGeometrias:
+    """
+    Polylines já baixadas, guardadas em JSON e compartilhadas entre cenários e execuções
+    (a mesma cidade tem as mesmas coordenadas no cenário original e no de sensibilidade).
+    """
+
+    def __init__(self, caminho=CACHE_GEOMETRIAS_JSON):
+        self.caminho = caminho
+        self.geometrias = {}
+        self.alterado = False
+        if caminho and os.path.exists(caminho):
+            with open(caminho, 'r') as f:
+                self.geometrias = json.load(f)
+
+    def __contains__(self, chave):
+        return chave in self.geometrias
+
+    def obter(self, chave):
+        return self.geometrias.get(chave)
+
+    def guardar(self, chave, geometria):
+        self.geometrias[chave] = geometria
+        self.alterado = True
+
+    def salvar(self):
+        if not self.caminho or not self.alterado:
+            return
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        # Grava em um arquivo temporário e troca: uma interrupção nunca deixa o cache pela metade
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'w') as f:
+            json.dump(self.geometrias, f)
+        os.replace(temporario, self.caminho)
+        self.alterado = False
+
+
+def trechos_da_rota(rota_indices):
+    """Pares (origem, destino) da rota fechada, incluindo o retorno ao início."""
+    return [(origem, rota_indices[(posicao + 1) % len(rota_indices)]) for posicao, origem in enumerate(rota_indices)]
+
+
+def geometrias_das_rotas(pontos_de_visita, rotas, backend, cache=None, registro=REGISTRO_NULO):
+    """
+    Geometrias apenas dos trechos das rotas informadas (listas de índices de 'pontos_de_visita'),
+    no formato de 'geometrias_rotas.json' ({"i-j": polyline}). Trechos já baixados vêm do cache;
+    os demais são pedidos ao backend de roteamento (ver app/backends_rota.py) e guardados nele.
+    """
+    cache = CacheGeometrias(None) if cache is None else cache
+    coordenadas = pontos_de_visita[['longitude', 'latitude']].to_numpy(dtype=float)
+
+    trechos = list(dict.fromkeys(trecho for rota in rotas for trecho in trechos_da_rota(rota)))
+    geometrias_rotas = {}
+    baixados = 0
+    for i, j in trechos:
+        chave = chave_trecho(coordenadas[i], coordenadas[j], backend.fonte_geometrias)
+        if chave in cache:
+            registro.emitir(CACHE_HIT, par=f"{i}-{j}", cache='geometrias')
+        else:
+            geometria = backend.geometria(coordenadas[i], coordenadas[j], registro, chave=f"{i}-{j}")
+            baixados += 1
+            if geometria is None:
+                continue
+            cache.guardar(chave, geometria)
+            registro.emitir(PAR_OBTIDO, par=f"{i}-{j}", concluidos=baixados, total_pares=len(trechos))
+        geometrias_rotas[f"{i}-{j}"] = cache.obter(chave)
+
+    print(f"Geometrias: {len(trechos)} trechos, {len(trechos) - baixados} do cache, {baixados} baixados.")
+    return geometrias_rotas
+
+
+def executar_geometrias(caminho_pontos, caminho_resultados, caminho_geometrias, descricao="",
+                        caminho_cache=CACHE_GEOMETRIAS_JSON, caminho_eventos=None, backend=BACKEND_PADRAO):
+    """Busca as geometrias dos trechos da rota ótima (após o B&B) e salva em 'caminho_geometrias'."""
+    try:
+        pontos_de_visita = pd.read_csv(caminho_pontos)
+        with open(caminho_resultados, 'r') as f:
+            rota = json.load(f)['rota_otima_indices']
+    except FileNotFoundError as e:
+        print(f"Erro: O arquivo '{e.filename}' não foi encontrado.")
+        print(f"Execute o 'branch_e_bound{descricao}.py' primeiro.")
+        sys.exit(1)
+
+    backend = abrir_backend(backend)
+    cache = CacheGeometrias(caminho_cache)
+    with abrir_registro(caminho_eventos) as registro:
+        with registro.etapa('geometrias' + descricao, trechos=len(rota)):
+            geometrias_rotas = geometrias_das_rotas(pontos_de_visita, [rota], backend, cache, registro)
+    cache.salvar()
+
+    with open(caminho_geometrias, 'w') as f:
+        json.dump(geometrias_rotas, f, indent=4)
+    print(f"Geometrias das rotas salvas em '{caminho_geometrias}'.")
+
+
+# Execução Principal
+if __name__ == "__main__":
+    # Use '--eventos' para gravar o andamento em results/eventos.jsonl
+    # e '--backend=local' para traçar os trechos sobre o grafo rodoviário local, sem rede
+    executar_geometrias(INPUT_PONTOS_CSV, INPUT_RESULTADOS_JSON, OUTPUT_GEOM_JSON,
+                        caminho_eventos=caminho_eventos_argumentos(sys.argv),
+                        backend=backend_argumentos(sys.argv))
@@ -0,0 +1,45 @@
+import numpy as np
+
+from app.matriz_compacta import compactar_matriz, custo_em_km, MODO_PADRAO
+
+
+def vizinho_mais_proximo_heuristica(matriz_distancias, modo_matriz=MODO_PADRAO):
+    """
+    Implementa a heurística do Vizinho Mais Próximo para o TSP (matriz em array NumPy ou DataFrame).
+    'modo_matriz' escolhe a representação interna da matriz (ver app/matriz_compacta.py).
+    """
+    n = len(matriz_distancias)
+    cidade_atual = 0
+    rota = [cidade_atual]
+    nao_visitadas = set(range(1, n))
+    custo_total = 0
+
+    # Converte para NumPy para acesso rápido e seguro
+    matriz_np, infinito, escala = compactar_matriz(np.asarray(matriz_distancias, dtype=float), modo_matriz)
+    np.fill_diagonal(matriz_np, infinito)
+
+    while nao_visitadas:
+        # Encontra a cidade mais próxima (índice)
+        proxima_cidade_idx = min(nao_visitadas, key=lambda cidade_idx: matriz_np[cidade_atual, cidade_idx])
+
+        custo = matriz_np[cidade_atual, proxima_cidade_idx]
+
+        if not custo < infinito:
+            print("Heurística: Rota impossível encontrada (custo infinito).")
+            break
+
+        custo_total += custo
+        cidade_atual = proxima_cidade_idx
+        rota.append(cidade_atual)
+        nao_visitadas.remove(cidade_atual)
+
+    # Voltar para a cidade inicial
+    custo_retorno = matriz_np[cidade_atual, 0]
+    if custo_retorno < infinito:
+        custo_total += custo_retorno
+    else:
+        print("Heurística: Rota impossível para retornar ao início.")
+
+    if modo_matriz != MODO_PADRAO:
+        custo_total = custo_em_km(custo_total, escala)
+    return rota, custo_total
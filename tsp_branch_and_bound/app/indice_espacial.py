@@ -0,0 +1,190 @@
+import numpy as np
+
+RAIO_TERRA_KM = 6371.0
+KM_POR_GRAU_LATITUDE = 111.32
+
+
+def distancias_haversine(latitude, longitude, latitudes, longitudes):
+    """Distância Haversine (km) de um ponto para um vetor de pontos."""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def calcular_matriz_haversine(latitudes, longitudes):
+    """
+    Calcula a matriz de distâncias em linha reta (Haversine, em km) entre todos os pontos.
+    Usada quando não há distâncias de rodovia disponíveis (ex: API HTTP local).
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class IndiceEspacial:
+    """
+    Índice em grade regular (latitude x longitude) sobre um conjunto de pontos.
+    Cada célula guarda os índices dos pontos que caem nela; as consultas visitam
+    apenas as células que podem conter resultados e confirmam a distância exata.
+    """
+
+    def __init__(self, latitudes, longitudes, tamanho_celula_graus=0.5):
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.tamanho_celula = tamanho_celula_graus
+        self.lat_min = self.latitudes.min() if len(self.latitudes) else 0.0
+        self.lon_min = self.longitudes.min() if len(self.longitudes) else 0.0
+
+        linhas, colunas = self._celula(self.latitudes, self.longitudes)
+        self.num_linhas = int(linhas.max()) + 1 if len(linhas) else 0
+        self.num_colunas = int(colunas.max()) + 1 if len(colunas) else 0
+
+        # Estrutura compacta (estilo CSR): pontos ordenados por célula + início de cada célula
+        chaves = linhas * self.num_colunas + colunas
+        self.ordem = np.argsort(chaves, kind='stable')
+        self.inicio_celula = np.searchsorted(chaves[self.ordem], np.arange(self.num_linhas * self.num_colunas + 1))
+
+    @classmethod
+    def de_dataframe(cls, cidades, tamanho_celula_graus=0.5):
+        return cls(cidades['latitude'].to_numpy(), cidades['longitude'].to_numpy(), tamanho_celula_graus)
+
+    def __len__(self):
+        return len(self.latitudes)
+
+    def _celula(self, latitudes, longitudes):
+        linhas = np.floor((np.asarray(latitudes) - self.lat_min) / self.tamanho_celula).astype(np.int64)
+        colunas = np.floor((np.asarray(longitudes) - self.lon_min) / self.tamanho_celula).astype(np.int64)
+        return linhas, colunas
+
+    def _pontos_nas_celulas(self, linha_ini, linha_fim, coluna_ini, coluna_fim):
+        """Índices dos pontos nas células do intervalo (inclusivo), recortado aos limites da grade."""
+        linha_ini, coluna_ini = max(linha_ini, 0), max(coluna_ini, 0)
+        linha_fim, coluna_fim = min(linha_fim, self.num_linhas - 1), min(coluna_fim, self.num_colunas - 1)
+        if linha_ini > linha_fim or coluna_ini > coluna_fim:
+            return np.empty(0, dtype=np.int64)
+
+        # Em cada linha da grade, as células do intervalo de colunas são contíguas na ordenação
+        blocos = []
+        for linha in range(linha_ini, linha_fim + 1):
+            base = linha * self.num_colunas
+            blocos.append(self.ordem[self.inicio_celula[base + coluna_ini]:self.inicio_celula[base + coluna_fim + 1]])
+        return np.concatenate(blocos)
+
+    def consulta_retangulo(self, lat_min, lat_max, lon_min, lon_max):
+        """Índices dos pontos dentro do retângulo (limites inclusivos)."""
+        (l0, l1), (c0, c1) = self._celula([lat_min, lat_max], [lon_min, lon_max])
+        candidatos = self._pontos_nas_celulas(l0, l1, c0, c1)
+        lat, lon = self.latitudes[candidatos], self.longitudes[candidatos]
+        dentro = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return np.sort(candidatos[dentro])
+
+    def consulta_raio(self, latitude, longitude, raio_km):
+        """Índices dos pontos a até 'raio_km' do ponto, ordenados pela distância."""
+        delta_lat = raio_km / KM_POR_GRAU_LATITUDE
+        cos_lat = max(np.cos(np.radians(min(abs(latitude) + delta_lat, 89.9))), 1e-6)
+        delta_lon = min(raio_km / (KM_POR_GRAU_LATITUDE * cos_lat), 180.0)
+
+        (l0, l1), (c0, c1) = self._celula([latitude - delta_lat, latitude + delta_lat],
+                                          [longitude - delta_lon, longitude + delta_lon])
+        candidatos = self._pontos_nas_celulas(l0, l1, c0, c1)
+        distancias = distancias_haversine(latitude, longitude,
+                                          self.latitudes[candidatos], self.longitudes[candidatos])
+        dentro = distancias <= raio_km
+        candidatos, distancias = candidatos[dentro], distancias[dentro]
+        ordem = np.lexsort((candidatos, distancias))
+        return candidatos[ordem], distancias[ordem]
+
+    def k_mais_proximos(self, latitude, longitude, k):
+        """Os k pontos mais próximos, ordenados pela distância. O raio de busca dobra até cobrir k pontos."""
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        raio_km = self.tamanho_celula * KM_POR_GRAU_LATITUDE
+        while True:
+            indices, distancias = self.consulta_raio(latitude, longitude, raio_km)
+            if len(indices) >= k:
+                return indices[:k], distancias[:k]
+            raio_km *= 2
+
+
+def selecionar_pontos(cidades, indice=None, deposito=None, raio_km=None, retangulo=None,
+                      populacao_minima=None, k=None, estado_deposito=None):
+    """
+    Seleciona os pontos de visita a partir da tabela limpa de cidades.
+
+    - deposito: nome da cidade de partida (fica sempre na posição 0 do resultado);
+    - raio_km: apenas cidades a até essa distância do depósito;
+    - retangulo: (lat_min, lat_max, lon_min, lon_max);
+    - populacao_minima: filtro pela coluna 'populacao' (osm_population);
+    - k: mantém as k cidades mais próximas do depósito (além dele) que passam nos filtros;
+    - estado_deposito: estado do depósito, obrigatório quando o nome existe em mais de um estado.
+
+    Retorna um DataFrame no formato de 'pontos_de_visita.csv', pronto para a matriz de custos.
+    """
+    if indice is None:
+        indice = IndiceEspacial.de_dataframe(cidades)
+    selecionados = np.ones(len(cidades), dtype=bool)
+
+    idx_deposito = None
+    if deposito is not None:
+        mesmo_nome = cidades['cidade'].to_numpy() == deposito.upper()
+        if estado_deposito is not None:
+            mesmo_nome &= cidades['estado'].to_numpy() == estado_deposito.upper()
+        encontrados = np.flatnonzero(mesmo_nome)
+        if len(encontrados) == 0:
+            raise ValueError(f"Cidade de depósito '{deposito}' não encontrada.")
+        if len(encontrados) > 1:
+            # Nomes repetidos entre estados (ex: ALTO ALEGRE): não escolhe um deles em silêncio
+            estados = ', '.join(sorted(map(str, cidades['estado'].iloc[encontrados])))
+            raise ValueError(f"Cidade de depósito '{deposito}' existe em mais de um estado ({estados}); "
+                             "informe o estado do depósito.")
+        idx_deposito = int(encontrados[0])
+        lat_dep = float(cidades['latitude'].iat[idx_deposito])
+        lon_dep = float(cidades['longitude'].iat[idx_deposito])
+    elif raio_km is not None or k is not None:
+        raise ValueError("As consultas por raio e k-vizinhos exigem um depósito.")
+
+    if raio_km is not None:
+        no_raio = np.zeros(len(cidades), dtype=bool)
+        no_raio[indice.consulta_raio(lat_dep, lon_dep, raio_km)[0]] = True
+        selecionados &= no_raio
+
+    if retangulo is not None:
+        no_retangulo = np.zeros(len(cidades), dtype=bool)
+        no_retangulo[indice.consulta_retangulo(*retangulo)] = True
+        selecionados &= no_retangulo
+
+    if populacao_minima is not None:
+        selecionados &= cidades['populacao'].to_numpy() >= populacao_minima
+
+    if idx_deposito is not None:
+        selecionados[idx_deposito] = False
+
+    if k is not None:
+        # Amplia a busca até encontrar k vizinhos que também passem pelos filtros
+        k_busca = k + 1
+        while True:
+            vizinhos, _ = indice.k_mais_proximos(lat_dep, lon_dep, k_busca)
+            vizinhos = vizinhos[selecionados[vizinhos]][:k]
+            if len(vizinhos) >= k or k_busca >= len(indice):
+                break
+            k_busca *= 2
+        escolhidos = vizinhos
+    elif idx_deposito is not None:
+        # Ordena por distância ao depósito para uma saída estável
+        escolhidos = np.flatnonzero(selecionados)
+        distancias = distancias_haversine(lat_dep, lon_dep, cidades['latitude'].to_numpy()[escolhidos],
+                                          cidades['longitude'].to_numpy()[escolhidos])
+        escolhidos = escolhidos[np.argsort(distancias, kind='stable')]
+    else:
+        escolhidos = np.flatnonzero(selecionados)
+
+    if idx_deposito is not None:
+        escolhidos = np.concatenate([[idx_deposito], escolhidos])
+    return cidades.iloc[escolhidos].reset_index(drop=True)
@@ -0,0 +1,316 @@
+# Kernels do Branch and Bound: bound, geração dos filhos e custo da rota.
+# Por padrão rodam em Python puro sobre listas, que no CPython são bem mais rápidas de
+# indexar elemento a elemento do que arrays NumPy. Com o numba instalado, as mesmas funções
+# podem ser compiladas (JIT) e recebem arrays NumPy.
+# A ordem das operações é a mesma de 'calcular_lower_bound', então os bounds (e a rota,
+# o custo e os nós expandidos) são idênticos aos da implementação original.
+import importlib.util
+
+import numpy as np
+
+# numba é opcional. Só é importado (~0,2 s) quando os kernels JIT são usados pela primeira vez.
+NUMBA_DISPONIVEL = importlib.util.find_spec('numba') is not None
+_KERNELS_JIT = None
+IMPLEMENTACOES = ('jit', 'numpy', 'python')
+
+# Sem o numba, a partir deste número de cidades a geração vetorizada dos filhos (NumPy)
+# supera o laço em Python puro (ver o benchmark 'test_custo_por_no_expansao')
+N_MIN_VETORIZADO = 24
+
+# Importar o numba e carregar os kernels do cache custa ~0,5 s por processo, e o JIT economiza
+# só ~3,5 µs por nó expandido. Sem 'usar_jit', o Branch and Bound passa para os kernels JIT
+# apenas depois deste número de nós expandidos, quando a busca já é longa o bastante para pagá-los.
+NOS_MIN_JIT = 200_000
+
+
+def _somar_duas_menores(matriz, n, infinito, saida):
+    """saida[v] = soma das duas menores arestas válidas da linha v (ou a única, ou 0)."""
+    for v in range(n):
+        menor = infinito
+        segunda = infinito
+        for j in range(n):
+            valor = matriz[v][j]
+            if valor < menor:
+                segunda = menor
+                menor = valor
+            elif valor < segunda:
+                segunda = valor
+        if segunda < infinito:
+            saida[v] = menor + segunda
+        elif menor < infinito:
+            saida[v] = menor
+        else:
+            saida[v] = 0
+
+
+def _bound_no(matriz, rota, tamanho_rota, custo, n, duas_menores, infinito, visitados):
+    """Mesmo cálculo de 'calcular_lower_bound' para a rota parcial rota[:tamanho_rota]."""
+    if tamanho_rota == n:
+        retorno = matriz[rota[tamanho_rota - 1]][rota[0]]
+        if retorno < infinito:
+            return custo + retorno
+        return np.inf
+
+    for v in range(n):
+        visitados[v] = False
+    for i in range(tamanho_rota):
+        visitados[rota[i]] = True
+
+    limite = custo
+    ultima = rota[tamanho_rota - 1]
+    menor = infinito
+    for j in range(n):
+        if not visitados[j] and matriz[ultima][j] < menor:
+            menor = matriz[ultima][j]
+    if menor < infinito:
+        limite = limite + menor
+    for v in range(n):
+        if not visitados[v]:
+            limite = limite + duas_menores[v]
+    return limite / 2
+
+
+def _expandir_no(matriz, rota, tamanho_rota, custo, n, duas_menores, infinito, custo_otimo, simetrica,
+                 calcular_bounds, visitados, proximos, custos, bounds):
+    """
+    Gera os filhos de um nó, em ordem crescente do vértice (a mesma do laço original).
+    Preenche proximos/custos/bounds e retorna (filhos gerados, filhos podados).
+    Sem 'calcular_bounds', o bound das duas menores arestas não é calculado (o chamador usa
+    outro limitante) e bounds[] recebe só o custo do filho, exceto nas rotas completas.
+
+    Com 'simetrica', só são gerados os caminhos que ainda podem terminar em uma cidade maior
+    que a segunda da rota (rota[1] < rota[-1]): cada ciclo é percorrido em um único sentido.
+    """
+    for v in range(n):
+        visitados[v] = False
+    for i in range(tamanho_rota):
+        visitados[rota[i]] = True
+
+    ultima = rota[tamanho_rota - 1]
+    completa = tamanho_rota + 1 == n
+    gerados = 0
+    podados = 0
+    for proximo in range(n):
+        if visitados[proximo]:
+            continue
+        aresta = matriz[ultima][proximo]
+        if not aresta < infinito:
+            continue
+        novo_custo = custo + aresta
+        if not novo_custo < custo_otimo:
+            podados += 1
+            continue
+        if simetrica and n >= 3:
+            segunda = rota[1] if tamanho_rota >= 2 else proximo
+            if completa:
+                viavel = proximo > segunda
+            else:
+                viavel = False
+                for j in range(n - 1, segunda, -1):
+                    if not visitados[j] and j != proximo:
+                        viavel = True
+                        break
+            if not viavel:
+                podados += 1
+                continue
+
+        if completa:
+            retorno = matriz[proximo][rota[0]]
+            limite = novo_custo + retorno if retorno < infinito else np.inf
+        elif not calcular_bounds:
+            limite = novo_custo
+        else:
+            # Limite do filho: como em _bound_no, com 'proximo' também visitado
+            limite = novo_custo
+            menor = infinito
+            for j in range(n):
+                if not visitados[j] and j != proximo and matriz[proximo][j] < menor:
+                    menor = matriz[proximo][j]
+            if menor < infinito:
+                limite = limite + menor
+            for v in range(n):
+                if not visitados[v] and v != proximo:
+                    limite = limite + duas_menores[v]
+            limite = limite / 2
+
+        proximos[gerados] = proximo
+        custos[gerados] = novo_custo
+        bounds[gerados] = limite
+        gerados += 1
+    return gerados, podados
+
+
+def _custo_rota(matriz, rota, tamanho_rota):
+    """Custo do ciclo rota[0] -> ... -> rota[-1] -> rota[0]."""
+    total = 0
+    for i in range(tamanho_rota):
+        total = total + matriz[rota[i]][rota[(i + 1) % tamanho_rota]]
+    return total
+
+
+def _tipo_soma(matriz):
+    """Tipo das somas de custos: int64 para matrizes inteiras (sem estouro), float64 para as demais."""
+    return np.int64 if np.issubdtype(matriz.dtype, np.integer) else np.float64
+
+
+def _bound_no_vetorizado(matriz, rota, tamanho_rota, custo, n, duas_menores, infinito, visitados):
+    """Versão NumPy de _bound_no (mesma ordem de soma, então o mesmo resultado)."""
+    if tamanho_rota == n:
+        retorno = matriz[rota[tamanho_rota - 1], rota[0]]
+        return custo + retorno if retorno < infinito else np.inf
+
+    visitados[:] = False
+    visitados[rota[:tamanho_rota]] = True
+    nao_visitados = np.flatnonzero(~visitados)
+    arestas = matriz[rota[tamanho_rota - 1], nao_visitados].astype(_tipo_soma(matriz))
+    menor = arestas.min()
+    termos = np.concatenate([[custo + menor if menor < infinito else custo], duas_menores[nao_visitados]])
+    return np.cumsum(termos)[-1] / 2
+
+
+def _expandir_no_vetorizado(matriz, rota, tamanho_rota, custo, n, duas_menores, infinito, custo_otimo, simetrica,
+                            calcular_bounds, visitados, proximos, custos, bounds):
+    """
+    Versão NumPy de _expandir_no: custos, podas e bounds de todos os filhos em arrays, sem laço
+    Python por filho. Os filhos podados são filtrados por máscaras antes de qualquer objeto ser
+    criado. As somas do bound seguem a mesma ordem (np.cumsum é sequencial e os termos
+    excluídos entram como zero), então os bounds são idênticos aos de _expandir_no.
+    """
+    tipo_soma = duas_menores.dtype
+    visitados[:] = False
+    visitados[rota[:tamanho_rota]] = True
+    nao_visitados = np.nonzero(~visitados)[0]
+    ultima = rota[tamanho_rota - 1]
+    completa = tamanho_rota + 1 == n
+
+    arestas = matriz[ultima, nao_visitados]
+    existentes = arestas < infinito
+    candidatos = nao_visitados[existentes]
+    novos_custos = custo + arestas[existentes].astype(tipo_soma, copy=False)
+
+    aceitos = novos_custos < custo_otimo
+    podados = int(len(candidatos) - aceitos.sum())
+    if simetrica and n >= 3:
+        if completa:
+            viaveis = candidatos > rota[1]
+        elif tamanho_rota >= 2:
+            # Precisa sobrar, além do próprio filho, uma cidade maior que a segunda para fechar o ciclo
+            maiores = int((nao_visitados > rota[1]).sum())
+            viaveis = maiores - (candidatos > rota[1]) >= 1
+        else:
+            viaveis = candidatos < nao_visitados[-1]
+        podados += int((aceitos & ~viaveis).sum())
+        aceitos &= viaveis
+
+    filhos = candidatos[aceitos]
+    novos_custos = novos_custos[aceitos]
+    if completa:
+        retornos = matriz[filhos, rota[0]].astype(tipo_soma, copy=False)
+        limites = np.where(retornos < infinito, novos_custos + retornos, np.inf)
+    elif not calcular_bounds:
+        limites = novos_custos
+    else:
+        # Linha de cada filho restrita às cidades ainda não visitadas, sem o próprio filho
+        proprio = filhos[:, None] == nao_visitados[None, :]
+        trechos = matriz[filhos[:, None], nao_visitados].astype(tipo_soma, copy=False)
+        trechos[proprio] = infinito
+        menores = trechos.min(axis=1)
+        inicio = novos_custos + np.where(menores < infinito, menores, 0)
+        termos = np.where(proprio, 0, duas_menores[nao_visitados][None, :])
+        limites = np.concatenate((inicio[:, None], termos), axis=1).cumsum(axis=1)[:, -1] / 2
+
+    gerados = len(filhos)
+    proximos[:gerados] = filhos
+    custos[:gerados] = novos_custos
+    bounds[:gerados] = limites
+    return gerados, podados
+
+
+def _custo_rota_vetorizado(matriz, rota, tamanho_rota):
+    rota = rota[:tamanho_rota]
+    return np.cumsum(matriz[rota, np.roll(rota, -1)].astype(_tipo_soma(matriz)))[-1]
+
+
+class Kernels:
+    """
+    Conjunto de kernels em uma das implementações, com os buffers de trabalho já alocados
+    para a matriz informada: 'jit' (numba), 'numpy' (filhos vetorizados) ou 'python' (listas).
+    Sem 'implementacao', usa o JIT se 'usar_jit' e, sem ele, o NumPy a partir de
+    N_MIN_VETORIZADO cidades e Python puro abaixo disso.
+    """
+
+    def __init__(self, matriz_np, infinito=np.inf, usar_jit=False, implementacao=None):
+        if implementacao is None:
+            if usar_jit:
+                implementacao = 'jit'
+            else:
+                implementacao = 'numpy' if len(matriz_np) >= N_MIN_VETORIZADO else 'python'
+        if implementacao not in IMPLEMENTACOES:
+            raise ValueError(f"Implementação inválida: '{implementacao}'. Use uma de {IMPLEMENTACOES}.")
+        if implementacao == 'jit' and not NUMBA_DISPONIVEL:
+            raise ImportError("O numba não está instalado (pip install numba).")
+
+        self.implementacao = implementacao
+        self.usar_jit = implementacao == 'jit'
+        self.n = n = len(matriz_np)
+        self.infinito = infinito
+        if implementacao == 'jit':
+            self.matriz = np.ascontiguousarray(matriz_np)
+            self.visitados = np.zeros(n, dtype=np.bool_)
+            self.proximos = np.zeros(n, dtype=np.int64)
+            self.custos = np.zeros(n, dtype=self.matriz.dtype)
+            self.bounds = np.zeros(n, dtype=np.float64)
+            somar_duas_menores, self._bound, self._expandir, self._custo = _kernels_jit()
+            self.duas_menores = np.zeros(n, dtype=self.matriz.dtype)
+            somar_duas_menores(self.matriz, n, infinito, self.duas_menores)
+        elif implementacao == 'numpy':
+            self.matriz = np.asarray(matriz_np)
+            tipo_soma = _tipo_soma(self.matriz)
+            self.visitados = np.zeros(n, dtype=np.bool_)
+            self.proximos = np.zeros(n, dtype=np.int64)
+            self.custos = np.zeros(n, dtype=tipo_soma)
+            self.bounds = np.zeros(n, dtype=np.float64)
+            self._bound, self._expandir, self._custo = (_bound_no_vetorizado, _expandir_no_vetorizado,
+                                                        _custo_rota_vetorizado)
+            duas_menores = [0] * n
+            _somar_duas_menores(self.matriz.tolist(), n, infinito, duas_menores)
+            self.duas_menores = np.asarray(duas_menores, dtype=tipo_soma)
+        else:
+            self.matriz = matriz_np.tolist()
+            self.visitados = [False] * n
+            self.proximos = [0] * n
+            self.custos = [0] * n
+            self.bounds = [0.0] * n
+            self._bound, self._expandir, self._custo = _bound_no, _expandir_no, _custo_rota
+            self.duas_menores = [0] * n
+            _somar_duas_menores(self.matriz, n, infinito, self.duas_menores)
+
+    def _rota(self, rota):
+        return rota if self.implementacao == 'python' else np.asarray(rota, dtype=np.int64)
+
+    def bound(self, rota, custo):
+        return self._bound(self.matriz, self._rota(rota), len(rota), custo, self.n, self.duas_menores,
+                           self.infinito, self.visitados)
+
+    def expandir(self, rota, custo, custo_otimo, simetrica=False, calcular_bounds=True):
+        """
+        Gera os filhos de um nó. Retorna (gerados, podados): os filhos válidos ficam em
+        proximos[:gerados], custos[:gerados] e bounds[:gerados]. Com calcular_bounds=False,
+        bounds[] só é um limitante nas rotas completas (ver _expandir_no).
+        """
+        return self._expandir(self.matriz, self._rota(rota), len(rota), custo, self.n, self.duas_menores,
+                              self.infinito, custo_otimo, simetrica, calcular_bounds, self.visitados,
+                              self.proximos, self.custos, self.bounds)
+
+    def custo_rota(self, rota):
+        return self._custo(self.matriz, self._rota(rota), len(rota))
+
+
+def _kernels_jit():
+    """Versões JIT (numba) dos kernels, criadas no primeiro uso."""
+    global _KERNELS_JIT
+    if _KERNELS_JIT is None:
+        import numba
+        jit = numba.njit(cache=True)
+        _KERNELS_JIT = (jit(_somar_duas_menores), jit(_bound_no), jit(_expandir_no), jit(_custo_rota))
+    return _KERNELS_JIT
@@ -0,0 +1,146 @@
+# Limitante do problema de atribuição (AP) para o TSP assimétrico.
+# Cada cidade escolhe uma sucessora (linha -> coluna) sem repetir colunas; a atribuição de
+# custo mínimo ignora apenas a restrição de formar um único ciclo, então é um limitante
+# inferior válido que respeita o sentido das arestas (i -> j e j -> i têm custos distintos).
+#
+# Para o nó com a rota parcial v0 -> ... -> vk e as cidades não visitadas U, as linhas são
+# {vk} ∪ U (quem ainda precisa de sucessora) e as colunas U ∪ {v0} (quem ainda precisa de
+# antecessora); vk -> v0 só é permitido quando U está vazio.
+#
+# A resolução é o algoritmo húngaro por caminhos aumentantes mínimos (o mesmo esquema do
+# 'linear_sum_assignment' do SciPy), com cada passo do Dijkstra vetorizado sobre as colunas.
+# O filho de um nó remove uma linha e uma coluna do problema do pai: as variáveis duais do
+# pai continuam viáveis e só as (no máximo duas) linhas que ficaram livres são reatribuídas,
+# em O(n²) em vez de resolver tudo de novo em O(n³).
+import numpy as np
+
+
+def _caminho_aumentante(custos, u, v, linha_para_coluna, coluna_para_linha, colunas_ativas, inicio,
+                        fim=-1, deposito=-1):
+    """
+    Caminho de custo reduzido mínimo da linha livre 'inicio' até uma coluna livre; atualiza as
+    variáveis duais (u, v) e aumenta a atribuição ao longo dele. A aresta fim -> deposito é
+    tratada como inexistente. Retorna False se não há caminho (atribuição inviável).
+    """
+    n = len(v)
+    distancias = np.full(n, np.inf)
+    anterior = np.full(n, -1)
+    livres = colunas_ativas.copy()  # colunas ainda não fixadas pelo Dijkstra
+    linhas_visitadas = [inicio]
+    linha, minimo = inicio, 0.0
+    while True:
+        reduzidos = minimo + custos[linha] - u[linha] - v
+        if linha == fim:
+            reduzidos[deposito] = np.inf
+        melhora = livres & (reduzidos < distancias)
+        distancias[melhora] = reduzidos[melhora]
+        anterior[melhora] = linha
+
+        candidatas = np.where(livres, distancias, np.inf)
+        coluna = int(candidatas.argmin())
+        minimo = candidatas[coluna]
+        if minimo == np.inf:
+            return False
+        livres[coluna] = False
+        if coluna_para_linha[coluna] < 0:
+            break
+        linha = coluna_para_linha[coluna]
+        linhas_visitadas.append(linha)
+
+    # Duais: os custos reduzidos continuam >= 0 e ficam 0 ao longo do caminho
+    fixadas = colunas_ativas & ~livres
+    u[inicio] += minimo
+    outras = np.asarray(linhas_visitadas[1:], dtype=np.int64)
+    u[outras] += minimo - distancias[linha_para_coluna[outras]]
+    v[fixadas] -= minimo - distancias[fixadas]
+
+    while True:
+        linha = anterior[coluna]
+        coluna_para_linha[coluna] = linha
+        linha_para_coluna[linha], coluna = coluna, linha_para_coluna[linha]
+        if linha == inicio:
+            return True
+
+
+def _resolver(custos):
+    """AP completo a partir de duais viáveis (u = menor custo de cada linha, v = 0)."""
+    n = len(custos)
+    minimos = custos.min(axis=1)
+    estado = (np.where(np.isfinite(minimos), minimos, 0.0), np.zeros(n), np.full(n, -1), np.full(n, -1))
+    colunas_ativas = np.ones(n, dtype=bool)
+    for linha in range(n):
+        if not _caminho_aumentante(custos, *estado, colunas_ativas, linha):
+            return None
+    return estado
+
+
+def resolver_atribuicao(matriz):
+    """
+    Atribuição de custo mínimo de uma matriz quadrada (np.inf: par proibido). Retorna
+    (coluna atribuída a cada linha, custo total), ou (None, np.inf) se não houver atribuição.
+    """
+    custos = np.asarray(matriz, dtype=float)
+    estado = _resolver(custos)
+    if estado is None:
+        return None, np.inf
+    linha_para_coluna = estado[2]
+    return linha_para_coluna, float(custos[np.arange(len(custos)), linha_para_coluna].sum())
+
+
+class LimitanteAtribuicao:
+    """
+    Limitante AP dos nós do Branch and Bound. O estado de um nó é a solução do seu problema
+    de atribuição (duais u e v e a atribuição nos dois sentidos), reaproveitada pelos filhos.
+    O limitante do nó é o custo da rota parcial mais o valor da atribuição.
+    """
+
+    def __init__(self, matriz_np, infinito=np.inf):
+        custos = np.array(matriz_np, dtype=float)
+        custos[custos >= infinito] = np.inf  # sentinela inteira da matriz compacta
+        np.fill_diagonal(custos, np.inf)
+        self.custos = custos
+        self.n = len(custos)
+
+    def raiz(self):
+        """Estado e valor da atribuição da rota [0]: o AP clássico sobre a matriz inteira."""
+        estado = _resolver(self.custos)
+        if estado is None:
+            return None, np.inf
+        return estado, self._valor(estado[2], np.ones(self.n, dtype=bool))
+
+    def filho(self, estado, rota, proximo):
+        """
+        Estado e valor da atribuição da rota + [proximo], a partir do estado do nó 'rota'.
+        Só vale para filhos que ainda deixam cidades não visitadas.
+        """
+        u, v, linha_para_coluna, coluna_para_linha = (parte.copy() for parte in estado)
+        ultima, deposito = rota[-1], rota[0]
+
+        # Sai a linha da última cidade (sua sucessora passa a ser 'proximo') e a coluna de 'proximo'
+        coluna = linha_para_coluna[ultima]
+        linha_para_coluna[ultima] = -1
+        coluna_para_linha[coluna] = -1
+        linha = coluna_para_linha[proximo]
+        if linha >= 0:
+            linha_para_coluna[linha] = -1
+            coluna_para_linha[proximo] = -1
+        # 'proximo' vira o fim da rota: voltar direto ao depósito fecharia o ciclo cedo demais
+        if linha_para_coluna[proximo] == deposito:
+            linha_para_coluna[proximo] = -1
+            coluna_para_linha[deposito] = -1
+
+        linhas_ativas = np.ones(self.n, dtype=bool)
+        linhas_ativas[rota] = False
+        colunas_ativas = np.ones(self.n, dtype=bool)
+        colunas_ativas[rota[1:]] = False
+        colunas_ativas[proximo] = False
+
+        for linha in np.flatnonzero(linhas_ativas & (linha_para_coluna < 0)):
+            if not _caminho_aumentante(self.custos, u, v, linha_para_coluna, coluna_para_linha, colunas_ativas,
+                                       linha, proximo, deposito):
+                return None, np.inf
+        return (u, v, linha_para_coluna, coluna_para_linha), self._valor(linha_para_coluna, linhas_ativas)
+
+    def _valor(self, linha_para_coluna, linhas_ativas):
+        linhas = np.flatnonzero(linhas_ativas)
+        return float(self.custos[linhas, linha_para_coluna[linhas]].sum())
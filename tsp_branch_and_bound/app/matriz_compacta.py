@@ -0,0 +1,38 @@
+import numpy as np
+
+# Modos de armazenamento da matriz usada pelos solvers:
+# - 'float64': km em ponto flutuante (padrão, np.inf como sentinela);
+# - 'float32': km em precisão simples (metade da memória, np.inf como sentinela);
+# - 'int32': metros inteiros (metade da memória, aritmética exata, SENTINELA_INT32 como sentinela).
+MODOS_MATRIZ = ('float64', 'float32', 'int32')
+MODO_PADRAO = 'float64'
+
+METROS_POR_KM = 1000
+# Maior valor de int32: nenhuma distância real chega perto (são ~2,1 milhões de km)
+SENTINELA_INT32 = np.iinfo(np.int32).max
+
+
+def compactar_matriz(matriz_np, modo_matriz=MODO_PADRAO):
+    """
+    Converte uma matriz de distâncias em km (np.inf/NaN para arestas inexistentes) para o modo pedido.
+    Retorna (matriz, infinito, escala): 'infinito' é o valor sentinela (arestas válidas são sempre
+    menores que ele) e 'escala' converte os custos da matriz de volta para km (custo / escala).
+    """
+    if modo_matriz not in MODOS_MATRIZ:
+        raise ValueError(f"Modo de matriz inválido: '{modo_matriz}'. Use um de {MODOS_MATRIZ}.")
+
+    matriz_np = np.asarray(matriz_np, dtype=np.float64)
+    if modo_matriz == 'int32':
+        validos = np.isfinite(matriz_np)
+        compacta = np.full(matriz_np.shape, SENTINELA_INT32, dtype=np.int32)
+        compacta[validos] = np.rint(matriz_np[validos] * METROS_POR_KM)
+        return compacta, SENTINELA_INT32, METROS_POR_KM
+
+    compacta = matriz_np.astype(modo_matriz)  # sempre uma cópia gravável
+    compacta[np.isnan(compacta)] = np.inf
+    return compacta, np.inf, 1
+
+
+def custo_em_km(custo, escala):
+    """Converte um custo acumulado na unidade da matriz compacta de volta para km."""
+    return float(custo) / escala
@@ -1,117 +1,97 @@
 import pandas as pd
-import requests
-import json
 import numpy as np
-import time
 import os
 import sys
 
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.camadas_custo import MatrizCustos, CAMADA_DISTANCIA, CAMADA_DURACAO
+from app.indice_espacial import calcular_matriz_haversine  # reexportada (API HTTP, agrupamento)
+from app.eventos import abrir_registro, caminho_eventos_argumentos, REGISTRO_NULO
+from app.backends_rota import BackendORSDirections, BACKEND_PADRAO, abrir_backend, backend_argumentos
+
 # Configuração de Paths
 RESULTS_DIR = 'results'
 INPUT_PONTOS_CSV = os.path.join(RESULTS_DIR, 'pontos_de_visita.csv')
 OUTPUT_MATRIZ_CSV = os.path.join(RESULTS_DIR, 'matriz_distancias.csv')
-OUTPUT_GEOM_JSON = os.path.join(RESULTS_DIR, 'geometrias_rotas.json')
+OUTPUT_CAMADAS_NPZ = os.path.join(RESULTS_DIR, 'matriz_custos.npz')
 
 
-def construir_matriz_distancias(pontos_de_visita, api_key):
+def construir_matriz_custos(pontos_de_visita, api_key=None, registro=REGISTRO_NULO, backend=None):
     """
-    Constrói a matriz de distâncias de carro e coleta as geometrias das rotas
-    usando a API do OpenRouteService.
+    Constrói as matrizes de distância (km) e de duração (h) de carro pelo backend de roteamento
+    (padrão: API de directions do OpenRouteService; ver app/backends_rota.py). As geometrias não
+    são pedidas aqui: apenas os trechos da rota escolhida são desenhados, e eles são buscados
+    depois da resolução (ver app/geometrias.py).
+    Cada par, tentativa e espera é emitido como evento em 'registro' (ver app/eventos.py).
+    O backend devolve arrays sem rótulos; os nomes das cidades só entram em MatrizCustos e
+    na exportação para CSV.
     """
-    url_base = "https://api.openrouteservice.org/v2/directions/driving-car"
-    n = len(pontos_de_visita)
-
-    matriz_distancias = pd.DataFrame(
-        index=pontos_de_visita['cidade'],
-        columns=pontos_de_visita['cidade']
-    )
-    geometrias_rotas = {}
-
-    headers = {
-        'Accept': 'application/json, application/geo+json, application/gpx+xml, img/png; charset=utf-8',
-        'Authorization': api_key
-    }
-
-    print("Construindo matriz de distâncias e coletando geometrias...\n")
-
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                matriz_distancias.iloc[i, j] = 0
-                continue
-
-            origem = [pontos_de_visita.iloc[i]['longitude'], pontos_de_visita.iloc[i]['latitude']]
-            destino = [pontos_de_visita.iloc[j]['longitude'], pontos_de_visita.iloc[j]['latitude']]
-            payload = {"coordinates": [origem, destino], "units": "km"}
-            chave_rota = f"{i}-{j}"
-
-            max_tentativas = 3
-            for tentativa in range(max_tentativas):
-                try:
-                    response = requests.post(url_base, headers=headers, json=payload)
-                    response.raise_for_status()
-                    dados = response.json()
-
-                    distancia = dados['routes'][0]['summary']['distance']
-                    geometria_codificada = dados['routes'][0]['geometry']
-
-                    matriz_distancias.iloc[i, j] = distancia
-                    geometrias_rotas[chave_rota] = geometria_codificada
-
-                    print(
-                        f"[{i + 1}/{n}] {pontos_de_visita.iloc[i]['cidade']} → {pontos_de_visita.iloc[j]['cidade']}: {distancia:.2f} km")
-
-                    time.sleep(1.6)
-                    break
-
-                except requests.exceptions.HTTPError as e:
-                    if response.status_code == 429:
-                        print(
-                            f"Erro 429 (Limite da API). Tentativa {tentativa + 1}/{max_tentativas}. Esperando 60 segundos...")
-                        time.sleep(60)
-                    else:
-                        print(f"Erro HTTP na rota {chave_rota}: {e}")
-                        matriz_distancias.iloc[i, j] = np.nan
-                        geometrias_rotas[chave_rota] = None
-                        break
-
-                except requests.exceptions.RequestException as e:
-                    print(f"Erro de conexão para {chave_rota}: {e}. Marcando como NaN.")
-                    matriz_distancias.iloc[i, j] = np.nan
-                    geometrias_rotas[chave_rota] = None
-                    break
-            else:
-                print(
-                    f"Falha ao obter dados para a rota {chave_rota} após {max_tentativas} tentativas. Marcando como NaN.")
-                matriz_distancias.iloc[i, j] = np.nan
-                geometrias_rotas[chave_rota] = None
-
-    print("\nMatriz de distâncias e geometrias concluídas!")
-    return matriz_distancias.astype(float), geometrias_rotas
+    backend = BackendORSDirections(api_key) if backend is None else backend
 
+    print(f"Construindo matriz de distâncias (backend '{backend.nome}')...\n")
+    # Todas as camadas em um único array (camadas, n, n); NaN (falhas) viram np.inf. Os arrays
+    # do backend são temporários: não ficam vivos junto com a cópia feita por MatrizCustos
+    camadas = np.stack(backend.matriz(pontos_de_visita, registro))
+    print("\nMatriz de distâncias concluída!")
 
-# Execução Principal
-if __name__ == "__main__":
-    try:
-        pontos_de_visita = pd.read_csv(INPUT_PONTOS_CSV)  # Usa path da raiz
+    return MatrizCustos(camadas, [CAMADA_DISTANCIA, CAMADA_DURACAO], pontos_de_visita['cidade'])
 
-        # Usa variável de ambiente para a chave
-        api_key = os.getenv("ORS_API_KEY")
-        if not api_key:
-            print("Erro: A variável de ambiente ORS_API_KEY não foi definida.")
-            print("Configure-a antes de executar o script (ex: set ORS_API_KEY=sua_chave).")
-            sys.exit(1)  # Termina o script com erro
 
-        matriz_distancias, geometrias_rotas = construir_matriz_distancias(pontos_de_visita, api_key)
+def construir_matriz_distancias(pontos_de_visita, api_key=None, backend=None):
+    """
+    Constrói a matriz de distâncias de carro (formato de 'matriz_distancias.csv', diagonal 0)
+    pelo backend de roteamento (padrão: API de directions do OpenRouteService).
+    """
+    matriz_custos = construir_matriz_custos(pontos_de_visita, api_key, backend=backend)
+    return matriz_para_csv(matriz_custos.camada(CAMADA_DISTANCIA))
+
 
-        matriz_distancias.to_csv(OUTPUT_MATRIZ_CSV)  # Usa path da raiz
-        print(f"Matriz de distâncias salva como '{OUTPUT_MATRIZ_CSV}'.")
+def matriz_para_csv(matriz):
+    """Volta ao formato do CSV: diagonal 0 e arestas inexistentes como NaN."""
+    valores = matriz.to_numpy(dtype=float, copy=True)
+    valores[np.isinf(valores)] = np.nan
+    np.fill_diagonal(valores, 0.0)
+    return pd.DataFrame(valores, index=pd.Index(matriz.index, name='cidade'), columns=matriz.columns)
 
-        with open(OUTPUT_GEOM_JSON, 'w') as f:  # Usa path da raiz
-            json.dump(geometrias_rotas, f, indent=4)
-        print(f"Geometrias das rotas salvas em '{OUTPUT_GEOM_JSON}'.")
 
+def executar_matriz_custos(caminho_pontos, caminho_matriz, caminho_camadas,
+                           perfis_horarios=False, descricao="", caminho_eventos=None, backend=BACKEND_PADRAO):
+    """
+    Consulta o backend de roteamento ('ors', 'ors-matriz' ou 'local') e salva a matriz de
+    distâncias (CSV) e as camadas de custo (NPZ).
+    Com 'caminho_eventos', o andamento é gravado como eventos JSONL (ver app/eventos.py).
+    """
+    try:
+        pontos_de_visita = pd.read_csv(caminho_pontos)  # Usa path da raiz
     except FileNotFoundError:
-        print(f"Erro: O arquivo '{INPUT_PONTOS_CSV}' não foi encontrado.")
-        print("Execute o 'pipeline_dados.py' primeiro para gerar a amostra de cidades.")
-        sys.exit(1) # Termina o script com erro
+        print(f"Erro: O arquivo '{caminho_pontos}' não foi encontrado.")
+        print(f"Execute o 'pipeline_dados{descricao}.py' primeiro para gerar a amostra de cidades.")
+        sys.exit(1)  # Termina o script com erro
+
+    # Os backends do ORS usam a variável de ambiente ORS_API_KEY para a chave
+    backend = abrir_backend(backend)
+
+    with abrir_registro(caminho_eventos) as registro:
+        with registro.etapa('matriz_custos' + descricao, cidades=len(pontos_de_visita)):
+            matriz_custos = construir_matriz_custos(pontos_de_visita, registro=registro, backend=backend)
+    if perfis_horarios:
+        matriz_custos.adicionar_perfis_horarios()
+
+    matriz_para_csv(matriz_custos.camada(CAMADA_DISTANCIA)).to_csv(caminho_matriz)
+    print(f"Matriz de distâncias salva como '{caminho_matriz}'.")
+
+    matriz_custos.salvar(caminho_camadas)
+    print(f"Camadas de custo ({', '.join(matriz_custos.nomes_camadas)}) salvas em '{caminho_camadas}'.")
+
+
+# Execução Principal
+if __name__ == "__main__":
+    # Use '--perfis-horarios' para salvar também a duração por hora do dia
+    # '--eventos' para gravar o andamento em results/eventos.jsonl
+    # e '--backend=ors-matriz' (ou 'local', sem rede) para trocar o backend de roteamento
+    executar_matriz_custos(INPUT_PONTOS_CSV, OUTPUT_MATRIZ_CSV, OUTPUT_CAMADAS_NPZ,
+                           perfis_horarios='--perfis-horarios' in sys.argv,
+                           caminho_eventos=caminho_eventos_argumentos(sys.argv),
+                           backend=backend_argumentos(sys.argv))
@@ -0,0 +1,71 @@
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Matrizes a partir deste tamanho vão para a memória compartilhada em vez de serem
+# serializadas (pickle) para cada processo. 1 MB ~ 360 cidades em float64.
+LIMITE_BYTES_COMPARTILHAR = 1 << 20
+
+# Matriz anexada uma única vez por processo trabalhador (ver 'inicializar_trabalhador')
+_matriz_trabalhador = None
+
+
+class MatrizCompartilhada:
+    """
+    Matriz de custos float64 (n x n) em um bloco de 'multiprocessing.shared_memory'.
+    O processo que cria o bloco é o dono e o libera; os trabalhadores se anexam pelo
+    'descritor' (nome + n), sem copiar a matriz nem serializá-la.
+    """
+
+    def __init__(self, bloco, n, dono):
+        self.bloco = bloco
+        self.n = n
+        self.dono = dono
+        self.matriz = np.ndarray((n, n), dtype=np.float64, buffer=bloco.buf)
+
+    @classmethod
+    def criar(cls, matriz):
+        matriz = np.asarray(matriz, dtype=np.float64)
+        n = len(matriz)
+        bloco = shared_memory.SharedMemory(create=True, size=max(1, n * n * 8))
+        compartilhada = cls(bloco, n, dono=True)
+        compartilhada.matriz[:] = matriz
+        return compartilhada
+
+    @classmethod
+    def anexar(cls, descritor):
+        nome, n = descritor
+        if sys.version_info >= (3, 13):
+            # Só o dono registra o bloco no resource_tracker (quem o remove ao final)
+            bloco = shared_memory.SharedMemory(name=nome, track=False)
+        else:
+            bloco = shared_memory.SharedMemory(name=nome)
+        return cls(bloco, n, dono=False)
+
+    @property
+    def descritor(self):
+        return self.bloco.name, self.n
+
+    def fechar(self):
+        """Desfaz o mapeamento neste processo e, no dono, remove o bloco do sistema."""
+        self.matriz = None
+        self.bloco.close()
+        if self.dono:
+            self.bloco.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def inicializar_trabalhador(descritor):
+    """'initializer' do ProcessPoolExecutor: cada trabalhador se anexa uma vez à matriz."""
+    global _matriz_trabalhador
+    _matriz_trabalhador = MatrizCompartilhada.anexar(descritor)
+
+
+def matriz_trabalhador():
+    return _matriz_trabalhador
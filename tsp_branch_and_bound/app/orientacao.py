@@ -0,0 +1,353 @@
+import numpy as np
+import heapq
+import json
+import os
+import sys
+import time
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.branch_e_bound import (No, EstatisticasBusca, TabelaDominancia, ler_matriz_csv, ler_opcao,
+                                TAMANHO_MAX_DOMINANCIA, INTERVALO_EVENTOS_BUSCA)
+from app.eventos import abrir_registro, caminho_eventos_argumentos, PROGRESSO_BUSCA, INCUMBENTE
+
+# Problema de orientação (orienteering): com um orçamento de distância por dia, escolher
+# quais cidades visitar, e em que ordem, para maximizar o prêmio total (população atendida).
+# A busca é o mesmo Branch and Bound best-first do TSP, com limitantes superiores no lugar
+# dos inferiores.
+
+# Configuração de Paths
+DATA_DIR = 'data'
+RESULTS_DIR = 'results'
+INPUT_CIDADES_CSV = os.path.join(DATA_DIR, 'brazilian_cities.csv')
+INPUT_PONTOS_CSV = os.path.join(RESULTS_DIR, 'pontos_de_visita.csv')
+INPUT_MATRIZ_CSV = os.path.join(RESULTS_DIR, 'matriz_distancias.csv')
+OUTPUT_RESULTADOS_JSON = os.path.join(RESULTS_DIR, 'resultados_orientacao.json')
+
+# Orçamento padrão do script (km rodados no dia, ida e volta ao depósito)
+ORCAMENTO_PADRAO_KM = 800.0
+
+# Folga relativa nas comparações com o orçamento e com o melhor prêmio (arredondamento das somas)
+TOLERANCIA = 1e-9
+
+
+def menores_caminhos(matriz):
+    """
+    Menor distância entre cada par de cidades passando por quaisquer outras (Floyd-Warshall
+    vetorizado). As matrizes de rodovia não seguem a desigualdade triangular (um desvio por uma
+    terceira cidade pode ser mais curto que a rota direta), então alcance e retorno ao depósito
+    só são limites inferiores válidos sobre esse fechamento.
+    """
+    distancias = matriz.copy()
+    np.fill_diagonal(distancias, 0.0)
+    for k in range(len(distancias)):
+        np.minimum(distancias, distancias[:, k, None] + distancias[None, k, :], out=distancias)
+    return distancias
+
+
+class LimitantesOrientacao:
+    """
+    Limitante superior do prêmio de um caminho parcial 0 -> ... -> u, aplicado a todos os
+    filhos de um nó de uma só vez (NumPy, sem laço por filho).
+
+    O caminho que falta (u -> cidades S -> 0) usa uma aresta de entrada e uma de saída de cada
+    cidade de S, então seu comprimento é pelo menos (saída mínima de u + entrada mínima de 0
+    + soma de 'peso[j]' em S) / 2, com peso[j] = entrada mínima + saída mínima de j. Isso vira
+    uma mochila: capacidade 2 * (orçamento restante) - saída mínima de u - entrada mínima de 0.
+    O limitante é a relaxação fracionária da mochila (itens em ordem de prêmio / peso), restrita
+    às cidades que o filho ainda alcança (ir até j e voltar ao depósito cabe no orçamento).
+
+    As arestas mínimas são recalculadas a cada nó expandido só entre as cidades ainda alcançáveis
+    pelo pai (os filhos nunca usam outras): com o orçamento apertado, o vizinho mais próximo
+    de uma cidade muitas vezes já está fora de alcance, e o limitante fica bem mais justo.
+    O alcance é medido pelos menores caminhos (menores_caminhos), não pelas arestas diretas.
+    """
+
+    def __init__(self, matriz, premios, orcamento):
+        self.matriz = matriz
+        self.premios = premios
+        self.orcamento = orcamento
+        self.fechamento = menores_caminhos(matriz)
+        self.retorno = self.fechamento[:, 0]
+
+    def alcancaveis(self, ultima, custo, livres):
+        """Cidades livres que um caminho de custo 'custo' terminado em 'ultima' ainda visita antes de voltar."""
+        limite = self.orcamento * (1 + TOLERANCIA)
+        return np.flatnonzero(livres & (custo + self.fechamento[ultima] + self.retorno <= limite))
+
+    def superiores(self, ultimos, custos, premios_coletados, candidatas):
+        """
+        Limitante superior de cada filho (arrays de mesmo tamanho: cidade final, custo e prêmio do
+        caminho). 'candidatas' são os índices das cidades livres alcançáveis pelo pai (ver
+        alcancaveis), incluindo as dos filhos; a cidade de cada filho é excluída da sua própria mochila.
+        """
+        k, m = len(ultimos), len(candidatas)
+        if m == 0:
+            return premios_coletados.astype(float)
+        entre_candidatas = self.matriz[np.ix_(candidatas, candidatas)]
+        ao_deposito = self.matriz[candidatas, 0]
+        pesos = entre_candidatas.min(axis=0) + np.minimum(entre_candidatas.min(axis=1), ao_deposito)
+        pesos = np.where(np.isfinite(pesos), pesos, 0.0)
+        premios = self.premios[candidatas]
+        razao = np.divide(premios, pesos, out=np.full(m, np.inf), where=pesos > 0)
+        ordem = np.argsort(-razao, kind='stable')
+        colunas, pesos, premios = candidatas[ordem], pesos[ordem], premios[ordem]
+
+        saindo = self.matriz[ultimos][:, colunas]
+        caminhos = self.fechamento[ultimos][:, colunas]
+        limite = self.orcamento * (1 + TOLERANCIA)
+        alcancaveis = ((custos[:, None] + caminhos + self.retorno[colunas][None, :] <= limite)
+                       & (colunas[None, :] != ultimos[:, None]))
+        saida_ultimos = np.minimum(saindo.min(axis=1), self.matriz[ultimos, 0])
+        capacidade = np.maximum(2 * (self.orcamento - custos) - saida_ultimos - ao_deposito.min(), 0.0)
+
+        pesos = np.where(alcancaveis, pesos[None, :], 0.0)
+        premios = np.where(alcancaveis, premios[None, :], 0.0)
+        pesos_acumulados = np.cumsum(pesos, axis=1)
+        premios_acumulados = np.cumsum(premios, axis=1)
+
+        # Os itens inteiros formam um prefixo (peso acumulado não decrescente); o seguinte entra em fração
+        cabem = (pesos_acumulados <= capacidade[:, None]).sum(axis=1)
+        linhas = np.arange(k)
+        anteriores = np.maximum(cabem - 1, 0)
+        inteiros = np.where(cabem > 0, premios_acumulados[linhas, anteriores], 0.0)
+        usado = np.where(cabem > 0, pesos_acumulados[linhas, anteriores], 0.0)
+        seguinte = np.minimum(cabem, m - 1)
+        tem_seguinte = (cabem < m) & (pesos[linhas, seguinte] > 0)
+        fracao = np.divide(capacidade - usado, pesos[linhas, seguinte], out=np.zeros(k), where=tem_seguinte)
+        return premios_coletados + inteiros + np.clip(fracao, 0.0, 1.0) * premios[linhas, seguinte] * tem_seguinte
+
+
+def insercao_gulosa(matriz, premios, orcamento):
+    """
+    Solução inicial: insere repetidamente a cidade com maior prêmio por km acrescentado
+    (na melhor posição do ciclo) enquanto o orçamento permitir. Retorna (rota, prêmio, custo).
+    """
+    n = len(matriz)
+    distancias = matriz.copy()
+    np.fill_diagonal(distancias, 0.0)
+    rota, custo = [0], 0.0
+    livres = np.ones(n, dtype=bool)
+    livres[0] = False
+    livres &= premios > 0
+
+    while livres.any():
+        origens = np.array(rota)
+        destinos = np.roll(origens, -1)
+        # aumentos[p, j]: custo extra de inserir j entre rota[p] e rota[p + 1]
+        aumentos = (distancias[origens, :] + distancias[:, destinos].T
+                    - distancias[origens, destinos][:, None])
+        posicoes = aumentos.argmin(axis=0)
+        aumento = aumentos[posicoes, np.arange(n)]
+        viaveis = livres & (custo + aumento <= orcamento * (1 + TOLERANCIA))
+        if not viaveis.any():
+            break
+        pontuacao = np.where(viaveis, premios / np.maximum(aumento, TOLERANCIA), -np.inf)
+        j = int(pontuacao.argmax())
+        rota.insert(int(posicoes[j]) + 1, j)
+        custo += float(aumento[j])
+        livres[j] = False
+    return rota, float(premios[rota].sum()), custo
+
+
+class NoOrientacao(No):
+    """Nó do B&B de orientação: 'bound' é o limitante superior negativo (a fila retira o maior primeiro)."""
+
+    def __init__(self, rota, custo, bound, mascara, premio):
+        super().__init__(rota, custo, bound, mascara)
+        self.premio = premio
+
+
+def branch_and_bound_orientacao(matriz_distancias, premios, orcamento, estatisticas=None, registro=None,
+                                podar_dominancia=True, tamanho_max_dominancia=TAMANHO_MAX_DOMINANCIA):
+    """
+    Resolve o problema de orientação partindo e voltando ao índice 0 (depósito): maximiza a soma
+    de 'premios' das cidades visitadas com distância total (incluindo a volta) <= 'orcamento'.
+    'matriz_distancias' segue o formato do B&B do TSP (array NumPy ou DataFrame, np.inf ou NaN
+    nas arestas inexistentes); os prêmios devem ser não negativos e o do depósito é ignorado.
+    Retorna (rota, premio_total, custo_total, nos_expandidos); a rota começa no depósito.
+    'estatisticas' e 'registro' funcionam como em branch_and_bound_tsp; a linha do tempo do
+    incumbente registra o prêmio em vez do custo.
+    """
+    matriz = np.array(matriz_distancias, dtype=float)
+    matriz[np.isnan(matriz)] = np.inf
+    np.fill_diagonal(matriz, np.inf)
+    premios = np.nan_to_num(np.array(premios, dtype=float))
+    premios[0] = 0.0
+    n = len(matriz)
+    instrumentar = estatisticas is not None
+    limite_orcamento = orcamento * (1 + TOLERANCIA)
+
+    limitantes = LimitantesOrientacao(matriz, premios, orcamento)
+    dominancia = TabelaDominancia(tamanho_max_dominancia) if podar_dominancia else None
+
+    # A solução gulosa já poda boa parte da árvore desde o início
+    melhor_rota, melhor_premio, melhor_custo = insercao_gulosa(matriz, premios, orcamento)
+    if instrumentar:
+        estatisticas.registrar_incumbente(melhor_premio)
+
+    inicio = time.perf_counter()
+    livres_raiz = np.ones(n, dtype=bool)
+    livres_raiz[0] = False
+    alcancaveis_raiz = limitantes.alcancaveis(0, 0.0, livres_raiz)
+    limitante_raiz = limitantes.superiores(np.array([0]), np.array([0.0]), np.array([0.0]), alcancaveis_raiz)[0]
+    fila_prioridade = [NoOrientacao(rota=[0], custo=0.0, bound=-limitante_raiz, mascara=1, premio=0.0)]
+    nos_expandidos = 0
+    if instrumentar:
+        estatisticas.nos_gerados += 1
+        estatisticas.chamadas_bound += 1
+        estatisticas.pico_fila = 1
+
+    while fila_prioridade:
+        no_atual = heapq.heappop(fila_prioridade)
+        nos_expandidos += 1
+        if instrumentar:
+            estatisticas.nos_expandidos += 1
+        if registro is not None and nos_expandidos % INTERVALO_EVENTOS_BUSCA == 0:
+            registro.emitir(PROGRESSO_BUSCA, nos_expandidos=nos_expandidos, tamanho_fila=len(fila_prioridade),
+                            melhor_custo=melhor_custo, melhor_premio=melhor_premio,
+                            segundos=time.perf_counter() - inicio)
+
+        rota = no_atual.rota
+        if -no_atual.bound <= melhor_premio * (1 + TOLERANCIA):
+            # Best-first: todos os nós restantes na fila têm limitante menor ou igual
+            if instrumentar:
+                estatisticas.nos_podados += len(fila_prioridade) + 1
+            break
+        if dominancia is not None and len(rota) > 1 and dominancia.superado(no_atual.mascara * n + rota[-1],
+                                                                             no_atual.custo):
+            if instrumentar:
+                estatisticas.nos_dominados += 1
+                estatisticas.registrar_poda(len(rota))
+            continue
+
+        # Filhos: cidades livres das quais ainda é possível voltar ao depósito dentro do orçamento
+        ultima = rota[-1]
+        livres = livres_raiz.copy()
+        livres[rota] = False
+        custos = no_atual.custo + matriz[ultima]
+        proximos = np.flatnonzero(livres & (custos + limitantes.retorno <= limite_orcamento))
+        if len(proximos) == 0:
+            continue
+
+        if instrumentar:
+            t0 = time.perf_counter()
+        custos = custos[proximos]
+        premios_filhos = no_atual.premio + premios[proximos]
+        candidatas = limitantes.alcancaveis(ultima, no_atual.custo, livres)
+        superiores = limitantes.superiores(proximos, custos, premios_filhos, candidatas)
+        fechados = custos + matriz[proximos, 0]
+        if instrumentar:
+            estatisticas.tempo_bound_segundos += time.perf_counter() - t0
+            estatisticas.chamadas_bound += len(proximos)
+
+        # Cada filho que consegue voltar direto ao depósito já é uma solução completa
+        viaveis = np.flatnonzero(fechados <= limite_orcamento)
+        if len(viaveis):
+            i = viaveis[np.argmax(premios_filhos[viaveis])]
+            if premios_filhos[i] > melhor_premio * (1 + TOLERANCIA):
+                melhor_rota = rota + [int(proximos[i])]
+                melhor_premio, melhor_custo = float(premios_filhos[i]), float(fechados[i])
+                if instrumentar:
+                    estatisticas.registrar_incumbente(melhor_premio)
+                if registro is not None:
+                    registro.emitir(INCUMBENTE, premio=melhor_premio, custo=melhor_custo,
+                                    nos_expandidos=nos_expandidos, segundos=time.perf_counter() - inicio)
+
+        promissores = np.flatnonzero(superiores > melhor_premio * (1 + TOLERANCIA))
+        if instrumentar:
+            for _ in range(len(proximos) - len(promissores)):
+                estatisticas.registrar_poda(len(rota) + 1)
+        for i in promissores:
+            proximo = int(proximos[i])
+            mascara = no_atual.mascara | (1 << proximo)
+            if dominancia is not None and not dominancia.registrar(mascara * n + proximo, custos[i]):
+                if instrumentar:
+                    estatisticas.nos_dominados += 1
+                    estatisticas.registrar_poda(len(rota) + 1)
+                continue
+            heapq.heappush(fila_prioridade, NoOrientacao(rota=rota + [proximo], custo=float(custos[i]),
+                                                         bound=-float(superiores[i]), mascara=mascara,
+                                                         premio=float(premios_filhos[i])))
+            if instrumentar:
+                estatisticas.nos_gerados += 1
+        if instrumentar:
+            estatisticas.pico_fila = max(estatisticas.pico_fila, len(fila_prioridade))
+
+    if instrumentar:
+        estatisticas.tempo_total_segundos = time.perf_counter() - estatisticas.inicio
+    return melhor_rota, melhor_premio, melhor_custo, nos_expandidos
+
+
+def premios_populacao(pontos_de_visita, cidades):
+    """População (osm_population) de cada ponto de visita, pela tabela limpa de cidades; ausentes valem 0."""
+    populacao = cidades.drop_duplicates(['cidade', 'estado']).set_index(['cidade', 'estado'])['populacao']
+    chaves = list(zip(pontos_de_visita['cidade'].str.upper(), pontos_de_visita['estado'].str.upper()))
+    return populacao.reindex(chaves).fillna(0.0).to_numpy(dtype=float)
+
+
+def executar_orientacao(caminho_pontos, caminho_matriz, caminho_resultados, orcamento_km=ORCAMENTO_PADRAO_KM,
+                        caminho_cidades=INPUT_CIDADES_CSV, instrumentar=False, caminho_eventos=None):
+    """
+    Escolhe as cidades do dia dentro de 'orcamento_km', maximizando a população visitada
+    (prêmio de cada cidade = osm_population), e salva a rota em JSON. O depósito é o
+    primeiro ponto de visita, como no TSP.
+    """
+    import pandas as pd
+    from app.pipeline_dados import carregar_cidades
+
+    try:
+        cidades, matriz_distancias = ler_matriz_csv(caminho_matriz)
+        pontos_de_visita = pd.read_csv(caminho_pontos)
+    except FileNotFoundError as e:
+        print(f"Erro: O arquivo '{e.filename}' não foi encontrado.")
+        print("Execute as etapas de dados e de matriz de custos primeiro.")
+        sys.exit(1)
+
+    premios = premios_populacao(pontos_de_visita, carregar_cidades(caminho_cidades))
+    print(f"Iniciando o Branch and Bound de orientação (orçamento de {orcamento_km:.0f} km)...\n")
+
+    estatisticas = EstatisticasBusca() if instrumentar else None
+    inicio = time.time()
+    with abrir_registro(caminho_eventos) as registro:
+        with registro.etapa('orientacao', cidades=len(cidades), orcamento_km=orcamento_km):
+            rota, premio, custo, nos_expandidos = branch_and_bound_orientacao(
+                matriz_distancias, premios, orcamento_km, estatisticas,
+                registro=registro if caminho_eventos else None)
+    tempo_execucao = time.time() - inicio
+
+    rota_nomes = [cidades[i] for i in rota + [rota[0]]]
+    print(f"Rota (nomes): {rota_nomes}")
+    print(f"Cidades visitadas: {len(rota) - 1} de {len(cidades) - 1}")
+    print(f"População atendida: {premio:,.0f} de {premios[1:].sum():,.0f}")
+    print(f"Distância Total: {custo:.2f} km (orçamento: {orcamento_km:.2f} km)")
+    print(f"Nós Expandidos: {nos_expandidos}")
+    print(f"Tempo de Execução: {tempo_execucao:.4f} segundos")
+
+    resultados = {
+        "rota_indices": rota,
+        "rota_nomes": rota_nomes,
+        "populacao_atendida": premio,
+        "distancia_total_km": custo,
+        "orcamento_km": orcamento_km,
+        "tempo_execucao_segundos": tempo_execucao,
+        "nos_expandidos": nos_expandidos
+    }
+    if estatisticas is not None:
+        resultados["instrumentacao"] = estatisticas.para_dict()
+
+    with open(caminho_resultados, 'w') as f:
+        json.dump(resultados, f, indent=4)
+    print(f"Resultados salvos em '{caminho_resultados}'.")
+    return resultados
+
+
+# Execução Principal
+if __name__ == "__main__":
+    # Use '--orcamento-km=500' para mudar o limite de distância do dia,
+    # '--instrumentar' para exportar as estatísticas da busca e '--eventos' para gravar o andamento
+    executar_orientacao(INPUT_PONTOS_CSV, INPUT_MATRIZ_CSV, OUTPUT_RESULTADOS_JSON,
+                        orcamento_km=float(ler_opcao(sys.argv, 'orcamento-km', ORCAMENTO_PADRAO_KM)),
+                        instrumentar='--instrumentar' in sys.argv,
+                        caminho_eventos=caminho_eventos_argumentos(sys.argv))
@@ -1,72 +1,219 @@
 import pandas as pd
+import numpy as np
+import argparse
+import hashlib
 import os
 import sys
+import unicodedata
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.indice_espacial import selecionar_pontos
+from app.eventos import abrir_registro, REGISTRO_NULO, CACHE_HIT, EVENTOS_JSONL
 
 # Configuração de Paths
 # Os paths são relativos à raiz do projeto (onde o main.py é executado)
 DATA_DIR = 'data'
 RESULTS_DIR = 'results'
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')
 
 INPUT_CSV_PATH = os.path.join(DATA_DIR, 'brazilian_cities.csv')
 OUTPUT_CSV_PATH = os.path.join(RESULTS_DIR, 'pontos_de_visita.csv')
+CACHE_NPZ_PATH = os.path.join(CACHE_DIR, 'cidades_limpas.npz')
+
+# Apenas as colunas usadas são lidas do CSV, já com tipos compactos. As coordenadas ficam em
+# float64: o CSV tem 7 casas decimais, que o float32 não representa, e elas viram as consultas
+# ao ORS e as chaves do cache de geometrias
+COLUNAS_CSV = {
+    'city': 'cidade',
+    'ibge_code': 'codigo_ibge',
+    'state': 'estado',
+    'osm_population': 'populacao',
+    'osm_latitude': 'latitude',
+    'osm_longitude': 'longitude',
+}
+TIPOS_CSV = {
+    'city': 'str',
+    'ibge_code': 'int32',
+    'state': 'category',
+    'osm_population': 'float32',
+    'osm_latitude': 'float64',
+    'osm_longitude': 'float64',
+}
+# Colunas gravadas em 'pontos_de_visita.csv' (formato esperado pelas etapas seguintes)
+COLUNAS_SAIDA = ['cidade', 'estado', 'latitude', 'longitude']
+
+# Incrementar quando o formato do cache mudar, para invalidar arquivos antigos
+VERSAO_CACHE = 2
+
+ESTADO_AMOSTRA = 'PARANÁ'
+TAMANHO_AMOSTRA = 10
 
-def limpar_e_padronizar_dados(caminho_arquivo_csv):
+
+def calcular_hash_arquivo(caminho_arquivo):
+    """Calcula o SHA-256 de um arquivo (usado para invalidar o cache)."""
+    h = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def ler_cidades_csv(caminho_arquivo_csv, estado=None):
+    """
+    Lê o CSV de cidades com apenas as colunas necessárias e tipos compactos.
+    Se 'estado' for informado, o filtro é aplicado antes de qualquer tratamento de strings.
+    """
+    df = pd.read_csv(caminho_arquivo_csv, usecols=list(COLUNAS_CSV), dtype=TIPOS_CSV)
+    df = df.rename(columns=COLUNAS_CSV)
+
+    # Padroniza apenas as categorias de estado (27 valores), não as 5.570 linhas
+    df['estado'] = df['estado'].cat.rename_categories(lambda nome: nome.upper())
+    if estado is not None:
+        df = df[df['estado'] == estado]
+
+    # Tratamento de valores ausentes e duplicatas
+    df = df.dropna(subset=['latitude', 'longitude'])
+    df = df.assign(cidade=df['cidade'].str.upper())
+    df = df.drop_duplicates(subset=['cidade', 'estado'])
+    return df.reset_index(drop=True)
+
+
+def _salvar_cache(df, caminho_cache, hash_origem):
+    os.makedirs(os.path.dirname(caminho_cache), exist_ok=True)
+    np.savez(
+        caminho_cache,
+        versao=np.array(VERSAO_CACHE),
+        hash_origem=np.array(hash_origem),
+        categorias_estado=np.array(df['estado'].cat.categories, dtype=str),
+        codigos_estado=df['estado'].cat.codes.to_numpy(),
+        cidade=df['cidade'].to_numpy(dtype=str),
+        **{coluna: df[coluna].to_numpy() for coluna in ['codigo_ibge', 'populacao', 'latitude', 'longitude']}
+    )
+
+
+def _ler_cache(caminho_cache, hash_origem):
+    """Retorna o DataFrame do cache, ou None se ele não existir ou estiver desatualizado."""
+    if not os.path.exists(caminho_cache):
+        return None
+    try:
+        with np.load(caminho_cache, allow_pickle=False) as dados:
+            if int(dados['versao']) != VERSAO_CACHE or str(dados['hash_origem']) != hash_origem:
+                return None
+            estado = pd.Categorical.from_codes(dados['codigos_estado'], categories=dados['categorias_estado'])
+            return pd.DataFrame({
+                'cidade': dados['cidade'].astype(object),
+                'codigo_ibge': dados['codigo_ibge'],
+                'estado': estado,
+                'populacao': dados['populacao'],
+                'latitude': dados['latitude'],
+                'longitude': dados['longitude'],
+            })
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def caminho_cache_estado(caminho_cache, estado):
+    """Cache de um único estado, ao lado do da tabela completa (ex: 'cidades_limpas_parana.npz')."""
+    if estado is None:
+        return caminho_cache
+    nome = unicodedata.normalize('NFKD', estado).encode('ascii', 'ignore').decode().lower().replace(' ', '_')
+    base, extensao = os.path.splitext(caminho_cache)
+    return f"{base}_{nome}{extensao}"
+
+
+def carregar_cidades(caminho_arquivo_csv=INPUT_CSV_PATH, estado=None, caminho_cache=CACHE_NPZ_PATH,
+                     registro=REGISTRO_NULO):
+    """
+    Retorna a tabela limpa de cidades (cidade, codigo_ibge, estado, populacao, latitude, longitude).
+    Com 'estado', o filtro é aplicado na leitura do CSV, antes do tratamento de strings, e o
+    resultado tem o seu próprio cache (ver caminho_cache_estado). Cada cache (NPZ) é reconstruído
+    quando o hash do CSV muda.
+    """
+    hash_origem = calcular_hash_arquivo(caminho_arquivo_csv)
+    caminho_cache = caminho_cache_estado(caminho_cache, estado) if caminho_cache else None
+    df = _ler_cache(caminho_cache, hash_origem) if caminho_cache else None
+
+    if df is None:
+        df = ler_cidades_csv(caminho_arquivo_csv, estado=estado)
+        if caminho_cache:
+            _salvar_cache(df, caminho_cache, hash_origem)
+            print(f"Cache de cidades atualizado em '{caminho_cache}'.")
+    else:
+        print(f"Cidades carregadas do cache '{caminho_cache}'.")
+        registro.emitir(CACHE_HIT, cache=caminho_cache, linhas=len(df))
+    return df
+
+
+def limpar_e_padronizar_dados(caminho_arquivo_csv, registro=REGISTRO_NULO):
     """
     Função para ler, limpar e padronizar o dataset de cidades.
     """
     try:
-        df = pd.read_csv(caminho_arquivo_csv, dtype={'osm_latitude': float, 'osm_longitude': float})
+        cidades_pr = carregar_cidades(caminho_arquivo_csv, estado=ESTADO_AMOSTRA, registro=registro)
         print("Arquivo carregado com sucesso!")
     except FileNotFoundError:
         print(f"Erro: O arquivo '{caminho_arquivo_csv}' não foi encontrado.")
         sys.exit(1) # Termina o script com erro
 
-    # Etapa 1: Seleção de colunas relevantes
-    colunas_relevantes = ['city', 'state', 'osm_latitude', 'osm_longitude']
-    df_filtrado = df[colunas_relevantes].copy()
-
-    # Etapa 2: Renomear colunas
-    df_filtrado.rename(columns={
-        'city': 'cidade',
-        'state': 'estado',
-        'osm_latitude': 'latitude',
-        'osm_longitude': 'longitude'
-    }, inplace=True)
-
-    # Etapa 3: Tratamento de valores ausentes (NaN)
-    print(f"\nVerificando valores nulos antes da limpeza:\n{df_filtrado.isnull().sum()}")
-    df_limpo = df_filtrado.dropna(subset=['latitude', 'longitude'])
-    print(f"Valores nulos após a limpeza:\n{df_limpo.isnull().sum()}")
-    print(f"Linhas removidas devido a valores nulos: {len(df_filtrado) - len(df_limpo)}")
-
-    # Etapa 4: Remoção de duplicatas
-    df_final = df_limpo.drop_duplicates(subset=['cidade', 'estado'])
-    print(f"Linhas removidas devido a duplicatas: {len(df_limpo) - len(df_final)}")
-
-    # Etapa 5: Padronização de strings
-    df_final['cidade'] = df_final['cidade'].str.upper()
-    df_final['estado'] = df_final['estado'].str.upper()
-    print("\nResumo do DataFrame final:")
-    print(df_final.info())
-    print(df_final.head())
-
-    # Etapa 6: Reduzir quantidade de dados (Amostra de 10 cidades do Paraná)
-    cidades_pr = df_final[df_final['estado'] == 'PARANÁ']
-
-    if cidades_pr.empty or len(cidades_pr) < 10:
+    print(f"Cidades disponíveis em {ESTADO_AMOSTRA}: {len(cidades_pr)}")
+
+    # Reduzir quantidade de dados (Amostra de 10 cidades do Paraná)
+    if cidades_pr.empty or len(cidades_pr) < TAMANHO_AMOSTRA:
         print("\nAviso: Não há cidades suficientes no Paraná para a amostra de 10. Selecionando todas as disponíveis.")
         cidades_selecionadas = cidades_pr
     else:
-        cidades_selecionadas = cidades_pr.sample(n=10, random_state=42).reset_index(drop=True)
+        cidades_selecionadas = cidades_pr.sample(n=TAMANHO_AMOSTRA, random_state=42).reset_index(drop=True)
 
+    cidades_selecionadas = cidades_selecionadas[COLUNAS_SAIDA]
     print("\nResumo da amostra selecionada:")
     print(cidades_selecionadas)
     return cidades_selecionadas
 
 
+def selecionar_por_consulta(caminho_arquivo_csv, estado=None, registro=REGISTRO_NULO, **consulta):
+    """
+    Seleciona os pontos de visita com consultas espaciais (raio, retângulo, k-vizinhos,
+    população mínima) em vez da amostra aleatória fixa.
+    """
+    cidades = carregar_cidades(caminho_arquivo_csv, estado=estado, registro=registro)
+    cidades_selecionadas = selecionar_pontos(cidades, **consulta)[COLUNAS_SAIDA]
+    print("\nResumo da seleção por consulta espacial:")
+    print(cidades_selecionadas)
+    return cidades_selecionadas
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Gera os pontos de visita a partir do dataset de cidades.")
+    parser.add_argument('--deposito', help="Cidade de partida (posição 0 da rota).")
+    parser.add_argument('--estado', help="Restringe a busca a um estado (ex: PARANÁ).")
+    parser.add_argument('--estado-deposito', help="Estado do depósito, quando o nome existe em mais de um estado.")
+    parser.add_argument('--raio-km', type=float, help="Cidades a até essa distância do depósito.")
+    parser.add_argument('--retangulo', type=float, nargs=4, metavar=('LAT_MIN', 'LAT_MAX', 'LON_MIN', 'LON_MAX'),
+                        help="Cidades dentro do retângulo.")
+    parser.add_argument('--populacao-minima', type=float, help="População mínima (osm_population).")
+    parser.add_argument('--k', type=int, help="Quantidade de cidades mais próximas do depósito.")
+    parser.add_argument('--eventos', nargs='?', const=EVENTOS_JSONL, metavar='CAMINHO',
+                        help="Grava eventos estruturados (JSONL) do carregamento.")
+    return parser.parse_args()
+
+
 # Execução Principal
 if __name__ == "__main__":
-    dados_cidades = limpar_e_padronizar_dados(INPUT_CSV_PATH) # CORREÇÃO: Usa path da raiz
+    args = ler_argumentos()
+    consulta = {
+        'deposito': args.deposito, 'raio_km': args.raio_km, 'populacao_minima': args.populacao_minima,
+        'k': args.k, 'retangulo': tuple(args.retangulo) if args.retangulo else None
+    }
+
+    with abrir_registro(args.eventos) as registro, registro.etapa('pipeline_dados'):
+        if any(valor is not None for valor in consulta.values()):
+            dados_cidades = selecionar_por_consulta(INPUT_CSV_PATH, estado=args.estado.upper() if args.estado else None,
+                                                    registro=registro, estado_deposito=args.estado_deposito,
+                                                    **consulta)
+        else:
+            dados_cidades = limpar_e_padronizar_dados(INPUT_CSV_PATH, registro) # CORREÇÃO: Usa path da raiz
 
     if dados_cidades is not None:
         print("\nDados prontos para serem usados na modelagem do problema de roteamento.")
@@ -0,0 +1,335 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.branch_e_bound import branch_and_bound_tsp
+from app.heuristicas import vizinho_mais_proximo_heuristica
+from app.indice_espacial import calcular_matriz_haversine
+from app.memoria_compartilhada import MatrizCompartilhada, LIMITE_BYTES_COMPARTILHAR
+
+# Configuração do Serviço
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8000
+NUM_TRABALHADORES = max(1, (os.cpu_count() or 2) - 1)
+TAMANHO_FILA = 8                # Requisições aguardando além das que já estão em execução
+TAMANHO_CACHE = 256             # Número máximo de resultados mantidos em memória
+TEMPO_LIMITE_SEGUNDOS = 300
+LIMITE_CIDADES_EXATO = 11       # Acima disso o modo 'auto' usa a heurística
+JANELA_LATENCIAS = 1000         # Quantidade de latências usadas no cálculo dos percentis
+METODOS_VALIDOS = ('auto', 'exato', 'heuristica')
+
+
+class ErroRequisicao(Exception):
+    """Erro de validação do corpo da requisição (responde com HTTP 400)."""
+
+
+# Funções de Lógica
+
+def montar_matriz(payload):
+    """
+    Constrói a matriz de custos (NumPy) a partir do corpo da requisição.
+    Aceita uma matriz pronta ('matriz') ou uma lista de coordenadas [lat, lon] ('coordenadas').
+    """
+    if 'matriz' in payload:
+        try:
+            matriz = np.array(payload['matriz'], dtype=float)
+        except (TypeError, ValueError):
+            raise ErroRequisicao("'matriz' deve ser uma lista de listas numéricas.")
+        if matriz.ndim != 2 or matriz.shape[0] != matriz.shape[1]:
+            raise ErroRequisicao("'matriz' deve ser quadrada (n x n).")
+    elif 'coordenadas' in payload:
+        try:
+            coordenadas = np.array(payload['coordenadas'], dtype=float)
+        except (TypeError, ValueError):
+            raise ErroRequisicao("'coordenadas' deve ser uma lista de pares [latitude, longitude].")
+        if coordenadas.ndim != 2 or coordenadas.shape[1] != 2:
+            raise ErroRequisicao("'coordenadas' deve ser uma lista de pares [latitude, longitude].")
+        matriz = calcular_matriz_haversine(coordenadas[:, 0], coordenadas[:, 1])
+    else:
+        raise ErroRequisicao("Informe 'matriz' ou 'coordenadas' no corpo da requisição.")
+
+    if len(matriz) < 2:
+        raise ErroRequisicao("São necessárias pelo menos 2 cidades.")
+    return matriz
+
+
+def canonicalizar_matriz(matriz):
+    """
+    Padroniza a matriz para que entradas equivalentes gerem o mesmo hash:
+    NaN e diagonal viram np.inf e os valores são arredondados a 6 casas decimais.
+    """
+    matriz = np.round(np.array(matriz, dtype=np.float64), 6)
+    matriz[np.isnan(matriz)] = np.inf
+    np.fill_diagonal(matriz, np.inf)
+    return np.ascontiguousarray(matriz)
+
+
+def escolher_metodo(metodo, n):
+    """Resolve o método 'auto' de acordo com o tamanho da instância; 'exato' respeita o mesmo limite."""
+    if metodo == 'auto':
+        return 'exato' if n <= LIMITE_CIDADES_EXATO else 'heuristica'
+    if metodo == 'exato' and n > LIMITE_CIDADES_EXATO:
+        raise ErroRequisicao(f"O método 'exato' aceita no máximo {LIMITE_CIDADES_EXATO} cidades; "
+                             f"use 'heuristica' ou 'auto'.")
+    return metodo
+
+
+def chave_cache(matriz_canonica, metodo):
+    """Hash SHA-256 da matriz canonicalizada (formato + bytes) e do método."""
+    h = hashlib.sha256()
+    h.update(metodo.encode())
+    h.update(str(matriz_canonica.shape).encode())
+    h.update(matriz_canonica.tobytes())
+    return h.hexdigest()
+
+
+def resolver_instancia(matriz_canonica, metodo):
+    """Executa o solver escolhido. Roda dentro de um processo do pool de trabalhadores."""
+    inicio = time.perf_counter()
+
+    if metodo == 'exato':
+        rota, custo, nos_expandidos = branch_and_bound_tsp(matriz_canonica)
+    else:
+        rota, custo = vizinho_mais_proximo_heuristica(matriz_canonica)
+        nos_expandidos = None
+
+    return {
+        "rota": [int(i) for i in rota] if rota is not None else None,
+        "custo": float(custo) if rota is not None and np.isfinite(custo) else None,
+        "metodo": metodo,
+        "nos_expandidos": nos_expandidos,
+        "tempo_solver_segundos": time.perf_counter() - inicio
+    }
+
+
+def resolver_instancia_compartilhada(descritor, metodo):
+    """Como 'resolver_instancia', mas lendo a matriz da memória compartilhada (sem cópia)."""
+    with MatrizCompartilhada.anexar(descritor) as compartilhada:
+        return resolver_instancia(compartilhada.matriz, metodo)
+
+
+class ServicoResolucao:
+    """
+    Núcleo do serviço: pool de processos com fila limitada, cache LRU de resultados
+    e registro de latências. Independente do servidor HTTP para facilitar os testes.
+    """
+
+    def __init__(self, num_trabalhadores=NUM_TRABALHADORES, tamanho_fila=TAMANHO_FILA,
+                 tamanho_cache=TAMANHO_CACHE, tempo_limite=TEMPO_LIMITE_SEGUNDOS):
+        self.pool = ProcessPoolExecutor(max_workers=num_trabalhadores)
+        # Vagas = trabalhadores ocupados + fila de espera. Sem vaga, a requisição é recusada (backpressure).
+        self.vagas = threading.BoundedSemaphore(num_trabalhadores + tamanho_fila)
+        self.tempo_limite = tempo_limite
+
+        self.tamanho_cache = tamanho_cache
+        self.cache = OrderedDict()
+        self.trava = threading.Lock()
+
+        self.latencias = deque(maxlen=JANELA_LATENCIAS)
+        self.contadores = {"requisicoes": 0, "cache_hits": 0, "cache_misses": 0, "rejeitadas": 0, "erros": 0}
+
+    def _contar(self, nome):
+        with self.trava:
+            self.contadores[nome] += 1
+
+    def _buscar_cache(self, chave):
+        with self.trava:
+            resultado = self.cache.get(chave)
+            if resultado is not None:
+                self.cache.move_to_end(chave)
+            return resultado
+
+    def _guardar_cache(self, chave, resultado):
+        with self.trava:
+            self.cache[chave] = resultado
+            self.cache.move_to_end(chave)
+            while len(self.cache) > self.tamanho_cache:
+                self.cache.popitem(last=False)
+
+    def _liberar(self, compartilhada):
+        """Devolve a vaga do pool e remove o bloco de memória compartilhada da requisição."""
+        self.vagas.release()
+        if compartilhada is not None:
+            compartilhada.fechar()
+
+    def registrar_erro(self):
+        self._contar("erros")
+
+    def registrar_latencia(self, segundos):
+        with self.trava:
+            self.latencias.append(segundos)
+
+    def resolver(self, payload):
+        """Processa uma requisição de resolução. Retorna (status_http, corpo)."""
+        self._contar("requisicoes")
+
+        metodo = payload.get('metodo', 'auto')
+        if metodo not in METODOS_VALIDOS:
+            raise ErroRequisicao(f"'metodo' deve ser um de {METODOS_VALIDOS}.")
+
+        matriz = canonicalizar_matriz(montar_matriz(payload))
+        metodo = escolher_metodo(metodo, len(matriz))
+        chave = chave_cache(matriz, metodo)
+
+        resultado = self._buscar_cache(chave)
+        if resultado is not None:
+            self._contar("cache_hits")
+            return 200, dict(resultado, cache=True)
+        self._contar("cache_misses")
+
+        if not self.vagas.acquire(blocking=False):
+            self._contar("rejeitadas")
+            return 503, {"erro": "Fila de processamento cheia. Tente novamente em instantes."}
+
+        # Matrizes grandes vão para a memória compartilhada: o trabalhador recebe só o nome do bloco
+        compartilhada = None
+        try:
+            if matriz.nbytes >= LIMITE_BYTES_COMPARTILHAR:
+                compartilhada = MatrizCompartilhada.criar(matriz)
+                futuro = self.pool.submit(resolver_instancia_compartilhada, compartilhada.descritor, metodo)
+            else:
+                futuro = self.pool.submit(resolver_instancia, matriz, metodo)
+        except Exception as e:
+            self._liberar(compartilhada)
+            self._contar("erros")
+            return 500, {"erro": f"Falha ao enviar a instância ao trabalhador: {e}"}
+        # A vaga e o bloco só são liberados quando o trabalhador termina, mesmo após um 504:
+        # o processo continua resolvendo e ainda ocupa o pool
+        futuro.add_done_callback(lambda _: self._liberar(compartilhada))
+
+        try:
+            resultado = futuro.result(timeout=self.tempo_limite)
+        except FuturesTimeoutError:
+            self._contar("erros")
+            return 504, {"erro": f"Tempo limite de {self.tempo_limite} s excedido."}
+        except Exception as e:
+            self._contar("erros")
+            return 500, {"erro": f"Erro ao resolver a instância: {e}"}
+
+        self._guardar_cache(chave, resultado)
+        return 200, dict(resultado, cache=False)
+
+    def metricas(self):
+        """Percentis de latência (em ms) e contadores do serviço."""
+        with self.trava:
+            latencias = np.array(self.latencias, dtype=float) * 1000
+            metricas = dict(self.contadores)
+            metricas["itens_cache"] = len(self.cache)
+
+        if len(latencias) > 0:
+            p50, p90, p95, p99 = np.percentile(latencias, [50, 90, 95, 99])
+            metricas["latencia_ms"] = {
+                "amostras": int(len(latencias)),
+                "p50": float(p50), "p90": float(p90), "p95": float(p95), "p99": float(p99),
+                "max": float(latencias.max())
+            }
+        else:
+            metricas["latencia_ms"] = {"amostras": 0}
+        return metricas
+
+    def encerrar(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Servidor HTTP
+
+class ManipuladorRequisicoes(BaseHTTPRequestHandler):
+    """Rotas: POST /resolver, GET /metricas e GET /saude."""
+
+    servico = None  # Definido por criar_servidor
+
+    def _responder(self, status, corpo):
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _ler_corpo(self):
+        try:
+            tamanho = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise ErroRequisicao("Cabeçalho 'Content-Length' inválido.")
+        if tamanho < 0:
+            raise ErroRequisicao("Cabeçalho 'Content-Length' inválido.")
+        return self.rfile.read(tamanho)
+
+    def do_GET(self):
+        if self.path == '/metricas':
+            self._responder(200, self.servico.metricas())
+        elif self.path == '/saude':
+            self._responder(200, {"status": "ok"})
+        else:
+            self._responder(404, {"erro": "Rota não encontrada."})
+
+    def do_POST(self):
+        if self.path != '/resolver':
+            self._responder(404, {"erro": "Rota não encontrada."})
+            return
+
+        inicio = time.perf_counter()
+        try:
+            payload = json.loads(self._ler_corpo() or b'{}')
+            if not isinstance(payload, dict):
+                raise ErroRequisicao("O corpo deve ser um objeto JSON.")
+            status, corpo = self.servico.resolver(payload)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            status, corpo = 400, {"erro": "Corpo da requisição não é um JSON válido."}
+        except ErroRequisicao as e:
+            status, corpo = 400, {"erro": str(e)}
+        except Exception as e:
+            # Sem isso a thread do manipulador morreria sem responder ao cliente
+            self.servico.registrar_erro()
+            status, corpo = 500, {"erro": f"Erro interno: {e}"}
+
+        if status == 200:
+            self.servico.registrar_latencia(time.perf_counter() - inicio)
+        self._responder(status, corpo)
+
+    def log_message(self, format, *args):
+        # Silencia o log padrão por requisição (o volume atrapalha em carga)
+        pass
+
+
+def criar_servidor(host=HOST_PADRAO, porta=PORTA_PADRAO, servico=None):
+    """Cria o servidor HTTP (multithread) ligado a um ServicoResolucao."""
+    servico = servico or ServicoResolucao()
+    manipulador = type('Manipulador', (ManipuladorRequisicoes,), {'servico': servico})
+    return ThreadingHTTPServer((host, porta), manipulador)
+
+
+def executar_servidor(host=HOST_PADRAO, porta=PORTA_PADRAO):
+    """Sobe a API e atende até Ctrl+C."""
+    servidor = criar_servidor(host=host, porta=porta)
+
+    print(f"API de resolução do TSP ouvindo em http://{host}:{porta}")
+    print("  POST /resolver  -> {\"coordenadas\": [[lat, lon], ...]} ou {\"matriz\": [[...]]}")
+    print("  GET  /metricas  -> percentis de latência e taxa de acerto do cache")
+    print("Para parar o servidor, pressione Ctrl+C.")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando o servidor...")
+    finally:
+        servidor.server_close()
+        servidor.RequestHandlerClass.servico.encerrar()
+
+
+# Execução Principal
+if __name__ == "__main__":
+    executar_servidor(porta=int(sys.argv[1]) if len(sys.argv) > 1 else int(os.getenv("PORTA_API", PORTA_PADRAO)))
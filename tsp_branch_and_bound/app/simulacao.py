@@ -0,0 +1,150 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Permite importar os módulos de 'app' quando executado como script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.branch_e_bound import (branch_and_bound_tsp, preparar_matriz_distancias, EstatisticasBusca, configuracao_cache,
+                                escolher_limitante)
+from app.cache_resultados import chave_instancia, rota_para_cidades, rota_para_indices
+
+# Limite de cidades para a simulação interativa (o tempo do B&B cresce rapidamente com n)
+MAX_CIDADES_SIMULACAO = 11
+
+
+def submatriz_cenario(matriz_distancias, cidades, deposito):
+    """
+    Recorta a matriz já carregada para as cidades escolhidas, com o depósito na posição 0
+    (o B&B sempre parte do índice 0). As demais cidades mantêm a ordem da matriz original.
+    """
+    nomes = list(matriz_distancias.columns)
+    if deposito not in cidades:
+        raise ValueError(f"O depósito '{deposito}' precisa estar entre as cidades selecionadas.")
+    indices = [nomes.index(deposito)] + [i for i, nome in enumerate(nomes) if nome in cidades and nome != deposito]
+    return preparar_matriz_distancias(matriz_distancias.iloc[indices, indices]), indices
+
+
+class Simulacao:
+    """Uma resolução em segundo plano. 'estatisticas' é atualizada pelo B&B durante a busca."""
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.estatisticas = EstatisticasBusca()
+        self.futuro = None
+
+    @property
+    def concluida(self):
+        return self.futuro is not None and self.futuro.done()
+
+    def progresso(self):
+        """Contadores parciais da busca (lidos sem bloquear a thread de trabalho)."""
+        incumbentes = self.estatisticas.linha_tempo_incumbente
+        return {
+            "segundos": time.perf_counter() - self.estatisticas.inicio,
+            "nos_expandidos": self.estatisticas.nos_expandidos,
+            "nos_podados": self.estatisticas.nos_podados,
+            "melhor_custo": incumbentes[-1][2] if incumbentes else None,
+        }
+
+    def resultado(self):
+        """Resultado no formato de 'resultados_branch_and_bound.json' (propaga a exceção, se houver)."""
+        return self.futuro.result()
+
+
+def resolver_cenario(matriz_distancias, cidades, deposito, estatisticas=None, cache=None):
+    """
+    Resolve o TSP restrito às cidades escolhidas. Os índices da rota retornada se referem
+    à matriz original, para reaproveitar pontos de visita e geometrias já carregados.
+    Com 'cache' (CacheResultados), uma seleção já resolvida, nesta ou em outra execução,
+    volta imediatamente, com o mesmo formato e "do_cache": True.
+    """
+    sub, indices = submatriz_cenario(matriz_distancias, cidades, deposito)
+    limitante = escolher_limitante(sub.to_numpy())
+    chave = (chave_instancia(sub.columns, sub.to_numpy(), configuracao_cache(limitante=limitante))
+             if cache is not None else None)
+    em_cache = cache.obter(chave) if cache is not None else None
+
+    if em_cache is not None:
+        rota = rota_para_indices(em_cache["rota_cidades"], sub.columns)
+        custo, nos_expandidos = em_cache["custo"], em_cache["nos_expandidos"]
+        tempo_execucao = em_cache["tempo_execucao_segundos"]
+    else:
+        if estatisticas is not None:
+            estatisticas.inicio = time.perf_counter()  # desconsidera o tempo de espera na fila do pool
+        inicio = time.time()
+        rota, custo, nos_expandidos = branch_and_bound_tsp(sub, estatisticas, limitante=limitante)
+        tempo_execucao = time.time() - inicio
+        if cache is not None and rota is not None:
+            cache.guardar(chave, {"rota_cidades": rota_para_cidades(rota, sub.columns), "custo": float(custo),
+                                  "nos_expandidos": nos_expandidos, "tempo_execucao_segundos": tempo_execucao,
+                                  "instrumentacao": None})
+    if cache is not None:
+        cache.salvar()
+
+    if rota is None:
+        return None
+    rota_indices = [indices[i] for i in rota]
+    resultado = {
+        "rota_otima_indices": rota_indices,
+        "rota_otima_nomes": [matriz_distancias.columns[i] for i in rota_indices + [rota_indices[0]]],
+        "custo_total_km": float(custo),
+        "tempo_execucao_segundos": tempo_execucao,
+        "nos_expandidos": nos_expandidos,
+    }
+    if em_cache is not None:
+        resultado["do_cache"] = True
+    return resultado
+
+
+class GerenciadorSimulacoes:
+    """
+    Executa as simulações em um pool de threads, para que o dashboard continue respondendo
+    e consulte o progresso a cada rerun. Cada combinação (matriz, cidades, depósito) é
+    resolvida uma única vez: voltar a uma seleção anterior reaproveita o resultado.
+    Com 'cache_resultados' (CacheResultados), os resultados também persistem entre sessões.
+    """
+
+    def __init__(self, num_trabalhadores=1, tamanho_cache=64, cache_resultados=None):
+        self.executor = ThreadPoolExecutor(max_workers=num_trabalhadores, thread_name_prefix='simulacao')
+        self.tamanho_cache = tamanho_cache
+        self.cache_resultados = cache_resultados
+        self.simulacoes = OrderedDict()
+        self.trava = threading.Lock()
+
+    @staticmethod
+    def chave(identificador_matriz, cidades, deposito):
+        return identificador_matriz, frozenset(cidades), deposito
+
+    def submeter(self, matriz_distancias, cidades, deposito, identificador_matriz):
+        """Retorna a simulação da seleção, iniciando a resolução apenas se ela ainda não existir."""
+        chave = self.chave(identificador_matriz, cidades, deposito)
+        with self.trava:
+            simulacao = self.simulacoes.get(chave)
+            if simulacao is not None:
+                self.simulacoes.move_to_end(chave)
+                return simulacao
+
+            # Seleções que ainda aguardam na fila deixaram de interessar: só a mais recente é resolvida
+            for chave_pendente, pendente in list(self.simulacoes.items()):
+                if pendente.futuro.cancel():
+                    del self.simulacoes[chave_pendente]
+
+            simulacao = Simulacao(chave)
+            simulacao.futuro = self.executor.submit(resolver_cenario, matriz_distancias, set(cidades), deposito,
+                                                    simulacao.estatisticas, self.cache_resultados)
+            self.simulacoes[chave] = simulacao
+
+            # Descarta as simulações concluídas mais antigas (as em andamento são mantidas)
+            for chave_antiga in list(self.simulacoes):
+                if len(self.simulacoes) <= self.tamanho_cache:
+                    break
+                if self.simulacoes[chave_antiga].concluida:
+                    del self.simulacoes[chave_antiga]
+            return simulacao
+
+    def encerrar(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
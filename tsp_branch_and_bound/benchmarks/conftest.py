@@ -0,0 +1,159 @@
+import json
+import os
+import platform
+import sys
+import tracemalloc
+
+import pytest
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+BASELINE_JSON = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Regressão máxima tolerada por métrica (fração acima do baseline).
+# Tempos são ruidosos em máquinas compartilhadas (o mínimo das rodadas ainda varia
+# bastante); contagens de nós são determinísticas e usam um limiar bem mais estreito.
+LIMIARES_REGRESSAO = {
+    'tempo_segundos': 1.00,
+    'tempo_importacao_segundos': 1.00,
+    'nos_expandidos': 0.05,
+    'pico_memoria_kb': 0.25,
+}
+LIMIAR_PADRAO = 0.25
+
+# Métricas abaixo deste valor absoluto são ignoradas na comparação (ruído de medição)
+MINIMOS_ABSOLUTOS = {
+    'tempo_segundos': 0.001,
+    'tempo_importacao_segundos': 0.01,
+    'pico_memoria_kb': 64,
+}
+
+
+def pytest_addoption(parser):
+    grupo = parser.getgroup('roteamento', 'Benchmarks de roteamento')
+    grupo.addoption('--salvar-baseline', action='store_true', default=False,
+                    help="Grava as métricas desta execução em benchmarks/baseline.json em vez de comparar.")
+    grupo.addoption('--limiar-regressao', type=float, default=None,
+                    help="Sobrescreve o limiar de regressão (fração) de todas as métricas.")
+    grupo.addoption('--n-max-exato', type=int, default=9,
+                    help="Maior n das instâncias sintéticas resolvidas pelo Branch and Bound (até 14).")
+
+
+def pytest_generate_tests(metafunc):
+    if 'n_exato' in metafunc.fixturenames:
+        n_max = min(metafunc.config.getoption('--n-max-exato'), 14)
+        metafunc.parametrize('n_exato', list(range(6, n_max + 1)))
+
+
+class RegistroBaseline:
+    """Lê o baseline, compara as métricas de cada caso e acumula as novas medições."""
+
+    def __init__(self, config):
+        self.salvar = config.getoption('--salvar-baseline')
+        self.limiar_global = config.getoption('--limiar-regressao')
+        self.casos = {}
+        if os.path.exists(BASELINE_JSON):
+            with open(BASELINE_JSON, 'r') as f:
+                self.casos = json.load(f).get('casos', {})
+        self.medicoes = {}
+
+    def limiar(self, metrica):
+        if self.limiar_global is not None:
+            return self.limiar_global
+        return LIMIARES_REGRESSAO.get(metrica, LIMIAR_PADRAO)
+
+    def sem_baseline(self, caso):
+        """True se o caso não tem referência gravada (caso novo ou renomeado) e não está sendo gravado."""
+        return not self.salvar and caso not in self.casos
+
+    def verificar(self, caso, metricas):
+        """Registra as métricas do caso e retorna a lista de regressões encontradas."""
+        self.medicoes[caso] = metricas
+        if self.salvar or caso not in self.casos:
+            return []
+
+        regressoes = []
+        for metrica, valor in metricas.items():
+            referencia = self.casos[caso].get(metrica)
+            if referencia is None or valor is None:
+                continue
+            if max(valor, referencia) < MINIMOS_ABSOLUTOS.get(metrica, 0):
+                continue
+            limite = referencia * (1 + self.limiar(metrica))
+            if valor > limite:
+                regressoes.append(
+                    f"{metrica}: {valor:.6g} > {referencia:.6g} (+{100 * self.limiar(metrica):.0f}% permitido)")
+        return regressoes
+
+    def gravar(self):
+        casos = dict(self.casos)
+        casos.update(self.medicoes)
+        with open(BASELINE_JSON, 'w') as f:
+            json.dump({
+                'maquina': {'python': platform.python_version(), 'processador': platform.machine(),
+                            'sistema': platform.system()},
+                'casos': dict(sorted(casos.items()))
+            }, f, indent=4)
+
+
+def pytest_configure(config):
+    config._registro_baseline = RegistroBaseline(config)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    registro = getattr(session.config, '_registro_baseline', None)
+    if registro is not None and registro.salvar and registro.medicoes:
+        registro.gravar()
+        print(f"\nBaseline atualizado em '{BASELINE_JSON}' ({len(registro.medicoes)} casos).")
+
+
+@pytest.fixture
+def verificar_regressao(request):
+    """
+    Fixture usada pelos benchmarks: recebe o nome do caso e suas métricas e
+    falha o teste se alguma delas piorar além do limiar em relação ao baseline.
+    """
+    registro = request.config._registro_baseline
+
+    def _verificar(caso, **metricas):
+        regressoes = registro.verificar(caso, metricas)
+        if registro.sem_baseline(caso):
+            # Um caso renomeado passaria sem nunca ser comparado
+            pytest.fail(f"Caso '{caso}' sem referência em '{BASELINE_JSON}'; grave-o com --salvar-baseline.")
+        if regressoes:
+            pytest.fail(f"Regressão de desempenho em '{caso}':\n  " + "\n  ".join(regressoes))
+
+    return _verificar
+
+
+@pytest.fixture(scope='session')
+def kernels_compilados():
+    """
+    Compila os kernels JIT uma vez, fora da medição (a primeira resolução com JIT pagaria a
+    compilação). O B&B padrão só usa o JIT em buscas longas; ver app/kernels.py (NOS_MIN_JIT).
+    """
+    from instancias import gerar_instancia_assimetrica
+    from app.branch_e_bound import branch_and_bound_tsp
+    from app.kernels import NUMBA_DISPONIVEL
+
+    branch_and_bound_tsp(gerar_instancia_assimetrica(5, 0), usar_jit=NUMBA_DISPONIVEL)
+
+
+@pytest.fixture
+def medir_pico_memoria():
+    """
+    Retorna uma função que executa o alvo uma vez sob tracemalloc e devolve
+    (resultado, pico de memória em KB). Roda separada da medição de tempo.
+    """
+    def _medir(funcao, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            resultado = funcao(*args, **kwargs)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return resultado, pico / 1024
+
+    return _medir
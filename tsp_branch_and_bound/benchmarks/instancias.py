@@ -0,0 +1,93 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.branch_e_bound import carregar_matriz_distancias
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'results')
+MATRIZES_PARANA = {
+    'parana_10': os.path.join(RESULTS_DIR, 'matriz_distancias.csv'),
+    'parana_9': os.path.join(RESULTS_DIR, 'matriz_distancias_sensibilidade.csv'),
+}
+
+# Lado do quadrado (km) onde as cidades sintéticas são sorteadas (ordem de grandeza do Paraná)
+LADO_REGIAO_KM = 500.0
+
+
+def _como_matriz(valores):
+    """Converte um array NumPy no formato esperado pelos solvers (DataFrame com diagonal np.inf)."""
+    valores = np.array(valores, dtype=float)
+    np.fill_diagonal(valores, np.inf)
+    return pd.DataFrame(valores)
+
+
+def gerar_instancia_euclidiana(n, semente):
+    """Instância simétrica: cidades uniformes em um quadrado, distância euclidiana."""
+    rng = np.random.default_rng(semente)
+    pontos = rng.random((n, 2)) * LADO_REGIAO_KM
+    diferencas = pontos[:, None, :] - pontos[None, :, :]
+    return _como_matriz(np.sqrt((diferencas ** 2).sum(axis=2)))
+
+
+def gerar_instancia_assimetrica(n, semente):
+    """
+    Instância assimétrica parecida com distâncias de rodovia: a distância euclidiana
+    é multiplicada por um fator de desvio sorteado independentemente para i→j e j→i.
+    """
+    rng = np.random.default_rng(semente)
+    pontos = rng.random((n, 2)) * LADO_REGIAO_KM
+    diferencas = pontos[:, None, :] - pontos[None, :, :]
+    euclidiana = np.sqrt((diferencas ** 2).sum(axis=2))
+    return _como_matriz(euclidiana * rng.uniform(1.1, 1.5, size=(n, n)))
+
+
+def gerar_coordenadas(n, semente):
+    """Latitudes e longitudes uniformes em um retângulo do tamanho do Paraná (para o modo por agrupamento)."""
+    rng = np.random.default_rng(semente)
+    return rng.uniform(-26.5, -22.5, size=n), rng.uniform(-54.5, -48.5, size=n)
+
+
+def gerar_pontos_de_visita(n, semente):
+    """Pontos no formato de 'pontos_de_visita.csv', no mesmo retângulo de 'gerar_coordenadas'."""
+    latitudes, longitudes = gerar_coordenadas(n, semente)
+    return pd.DataFrame({'cidade': [f"P{i}" for i in range(n)], 'latitude': latitudes, 'longitude': longitudes})
+
+
+def gerar_premios(n, semente):
+    """Prêmios do problema de orientação com a forma da coluna osm_population (log-normal); o depósito vale 0."""
+    premios = np.random.default_rng(semente).lognormal(9.0, 1.2, size=n).round()
+    premios[0] = 0.0
+    return premios
+
+
+def carregar_instancia_parana(nome):
+    """Carrega uma das matrizes reais (ORS) distribuídas em 'results/'."""
+    return carregar_matriz_distancias(MATRIZES_PARANA[nome])
+
+
+def custo_otimo_held_karp(matriz):
+    """
+    Custo ótimo exato pela programação dinâmica de Held-Karp (O(2^n · n²)), para conferir os
+    solvers em matrizes assimétricas sem depender de nenhum limitante.
+    """
+    custos = np.asarray(matriz, dtype=float)
+    n = len(custos)
+    # melhor[mascara, j]: menor custo de 0 até j visitando as cidades 1..n-1 da máscara
+    melhor = np.full((1 << (n - 1), n), np.inf)
+    for j in range(1, n):
+        melhor[1 << (j - 1), j] = custos[0, j]
+    for mascara in range(1, 1 << (n - 1)):
+        ultimas = melhor[mascara]  # só as cidades da máscara são finitas
+        for k in range(1, n):
+            bit = 1 << (k - 1)
+            if mascara & bit:
+                continue
+            candidato = (ultimas + custos[:, k]).min()
+            if candidato < melhor[mascara | bit, k]:
+                melhor[mascara | bit, k] = candidato
+    return float((melhor[-1] + custos[:, 0]).min())
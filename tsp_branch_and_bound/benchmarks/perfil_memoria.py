@@ -0,0 +1,282 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from instancias import gerar_pontos_de_visita
+from app.backends_rota import BackendORSDirections, BackendLocal, FATOR_DESVIO_RODOVIA, codificar_polyline
+from app.indice_espacial import RAIO_TERRA_KM
+from app.matriz_custos import construir_matriz_custos, matriz_para_csv
+from app.agrupamento import resolver_por_agrupamento
+from app.cenarios import ARQUIVOS_CENARIO, descobrir_cenarios, ler_arquivo_resultado
+from app.estatisticas_resultados import calcular_estatisticas, salvar_estatisticas
+
+# Perfil de memória das etapas do pipeline (matriz de custos, resolução e carga do dashboard)
+# em vários tamanhos. Cada etapa roda uma vez sob o tracemalloc (pico das alocações do Python
+# e do NumPy) e com a memória residente (RSS) amostrada em uma thread. Uma etapa cujo pico
+# cresce mais rápido que O(n²) entre dois tamanhos é marcada no relatório.
+
+# Configuração de Paths
+RESULTS_DIR = 'results'
+OUTPUT_RELATORIO_JSON = os.path.join(RESULTS_DIR, 'perfil_memoria.json')
+
+SEMENTE = 42
+TAMANHOS_PADRAO = [10, 100, 1000]
+
+# Expoente de crescimento máximo aceito entre dois tamanhos (2 = quadrático) e pico mínimo
+# (KB) para o expoente ser considerado: abaixo disso, os custos fixos dominam a medição
+EXPOENTE_MAXIMO = 2.0
+FOLGA_EXPOENTE = 0.25
+PICO_MINIMO_KB = 256
+
+INTERVALO_AMOSTRAGEM_RSS_SEGUNDOS = 0.005
+VELOCIDADE_SIMULADA_KMH = 80.0
+
+
+class BackendDirectionsSimulado(BackendORSDirections):
+    """
+    Backend de directions do ORS sem rede: cada requisição responde na hora com a distância
+    Haversine corrigida pelo desvio de rodovia. A montagem da matriz é a do backend real.
+    A resposta é calculada com 'math' (um par por vez): com o NumPy, o custo fixo de cada
+    chamada dominaria a medição da montagem.
+    """
+
+    nome = 'ors-simulado'
+
+    def __init__(self):
+        super().__init__(api_key=None)
+
+    def _postar(self, url, payload, chave, registro):
+        (lon1, lat1), (lon2, lat2) = map(lambda ponto: map(math.radians, ponto), payload['coordinates'])
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        distancia = 2 * RAIO_TERRA_KM * math.asin(math.sqrt(min(a, 1.0))) * FATOR_DESVIO_RODOVIA
+        resumo = {'distance': distancia, 'duration': distancia / VELOCIDADE_SIMULADA_KMH * 3600.0}
+        return {'routes': [{'summary': resumo, 'geometry': ''}]}, 1, None
+
+
+def ler_rss_kb():
+    """Memória residente atual (KB): /proc no Linux; nos demais sistemas, o pico do processo."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024
+    except (OSError, ValueError, IndexError):
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / 1024 if sys.platform == 'darwin' else pico  # bytes no macOS, KB no Linux
+
+
+class AmostradorRSS:
+    """Thread que lê a RSS em intervalos curtos e guarda o maior valor acima da RSS inicial."""
+
+    def __init__(self, intervalo=INTERVALO_AMOSTRAGEM_RSS_SEGUNDOS):
+        self.intervalo = intervalo
+        self.inicial = ler_rss_kb()
+        self.pico = self.inicial
+        self.parar = threading.Event()
+        self.thread = threading.Thread(target=self._amostrar, daemon=True)
+
+    def _amostrar(self):
+        while not self.parar.wait(self.intervalo):
+            self.pico = max(self.pico, ler_rss_kb())
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *excecao):
+        self.parar.set()
+        self.thread.join()
+        self.pico = max(self.pico, ler_rss_kb())
+
+    @property
+    def acrescimo_kb(self):
+        return self.pico - self.inicial
+
+
+def medir_memoria(funcao, *args):
+    """
+    Executa 'funcao(*args)' uma vez (saída do terminal descartada) e retorna o pico do
+    tracemalloc (KB), o acréscimo de RSS (KB) e o tempo (s, inflado pelo tracemalloc).
+    """
+    tracemalloc.start()
+    try:
+        with AmostradorRSS() as rss, contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcao(*args)
+            tempo = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'pico_tracemalloc_kb': pico / 1024, 'acrescimo_rss_kb': rss.acrescimo_kb, 'tempo_segundos': tempo}
+
+
+# Etapas: cada uma tem uma preparação (fora da medição) e a execução medida.
+
+def preparar_pontos(n, diretorio):
+    return (gerar_pontos_de_visita(n, SEMENTE),)
+
+
+def matriz_ors_directions(pontos):
+    construir_matriz_custos(pontos, backend=BackendDirectionsSimulado())
+
+
+def matriz_local(pontos):
+    # O grafo é carregado dentro da medição: ele faz parte da memória da etapa
+    construir_matriz_custos(pontos, backend=BackendLocal())
+
+
+def resolver(pontos):
+    # Um único processo: o tracemalloc só enxerga o processo atual
+    resolver_por_agrupamento(pontos['latitude'].to_numpy(), pontos['longitude'].to_numpy(), num_processos=1)
+
+
+def preparar_cenario(n, diretorio):
+    """Grava um cenário sintético completo ('original') no formato de 'results/'."""
+    pontos = gerar_pontos_de_visita(n, SEMENTE)
+    matriz = construir_matriz_custos(pontos, backend=BackendLocal())
+    rota = list(range(n))
+    caminhos = {componente: os.path.join(diretorio, arquivo.format(sufixo=''))
+                for componente, arquivo in ARQUIVOS_CENARIO.items()}
+
+    pontos.assign(estado='PARANÁ').to_csv(caminhos['pontos'], index=False)
+    matriz_para_csv(matriz.camada('distancia_km')).to_csv(caminhos['matriz'])
+    with open(caminhos['resultados'], 'w') as f:
+        json.dump({"rota_otima_indices": rota, "rota_otima_nomes": [pontos['cidade'][i] for i in rota + [0]],
+                   "custo_total_km": 0.0, "tempo_execucao_segundos": 0.0, "nos_expandidos": 0}, f)
+    coordenadas = pontos[['latitude', 'longitude']].to_numpy()
+    with open(caminhos['geometrias'], 'w') as f:
+        json.dump({f"{i}-{(i + 1) % n}": codificar_polyline([coordenadas[i], coordenadas[(i + 1) % n]])
+                   for i in rota}, f)
+    salvar_estatisticas(calcular_estatisticas(matriz.camada('distancia_km').to_numpy(), matriz.cidades, rota),
+                        caminhos['estatisticas'])
+    return (diretorio,)
+
+
+def carregar_dashboard(diretorio):
+    # Sem o cache do 'Cenario.carregar': cada tamanho lê os arquivos do zero
+    cenario = descobrir_cenarios(diretorio)['original']
+    for componente in ARQUIVOS_CENARIO:
+        ler_arquivo_resultado(cenario.caminho(componente))
+
+
+def analise_dashboard(diretorio):
+    # Aba de análise: só as estatísticas pré-calculadas, sem passar pela matriz completa
+    from app.analise_dados import serie_histograma, tabela_resumo, tabela_trechos
+
+    estatisticas = ler_arquivo_resultado(descobrir_cenarios(diretorio)['original'].caminho('estatisticas'))
+    tabela_resumo(estatisticas['matriz']['resumo'])
+    serie_histograma(estatisticas['matriz']['histograma'], estatisticas['unidade'])
+    tabela_trechos(estatisticas['rota']['trechos'])
+
+
+# nome: (preparação, execução, maior n). Acima de 'n_max' a etapa é pulada (None: sem limite).
+ETAPAS = {
+    'matriz_ors_directions': (preparar_pontos, matriz_ors_directions, None),
+    'matriz_local': (preparar_pontos, matriz_local, None),
+    'resolver_agrupamento': (preparar_pontos, resolver, None),
+    'carregar_dashboard': (preparar_cenario, carregar_dashboard, None),
+    'analise_dashboard': (preparar_cenario, analise_dashboard, None),
+}
+
+
+def expoentes_crescimento(medicoes, metrica='pico_tracemalloc_kb'):
+    """
+    Expoente k de pico ~ n^k entre tamanhos consecutivos. Trechos com picos abaixo de
+    PICO_MINIMO_KB ficam como None (custo fixo, não crescimento).
+    """
+    expoentes = []
+    for anterior, atual in zip(medicoes, medicoes[1:]):
+        if max(anterior[metrica], atual[metrica]) < PICO_MINIMO_KB or anterior[metrica] <= 0:
+            expoentes.append(None)
+            continue
+        expoentes.append(math.log(atual[metrica] / anterior[metrica]) / math.log(atual['n'] / anterior['n']))
+    return expoentes
+
+
+def perfilar(tamanhos=TAMANHOS_PADRAO, etapas=None, ignorar_n_max=False):
+    """Mede cada etapa em cada tamanho e retorna o relatório (dicionário serializável em JSON)."""
+    relatorio = {
+        'maquina': {'python': platform.python_version(), 'processador': platform.machine(),
+                    'sistema': platform.system()},
+        'tamanhos': list(tamanhos),
+        'expoente_maximo': EXPOENTE_MAXIMO,
+        'etapas': {},
+    }
+    for nome in etapas or ETAPAS:
+        preparar, executar, n_max = ETAPAS[nome]
+        # Aquecimento no menor tamanho: importações tardias e compilação JIT não entram na medição
+        with tempfile.TemporaryDirectory() as diretorio, contextlib.redirect_stdout(io.StringIO()):
+            executar(*preparar(min(tamanhos), diretorio))
+
+        medicoes, pulados = [], []
+        for n in tamanhos:
+            if n_max is not None and n > n_max and not ignorar_n_max:
+                pulados.append(n)
+                continue
+            with tempfile.TemporaryDirectory() as diretorio:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    argumentos = preparar(n, diretorio)
+                medicao = medir_memoria(executar, *argumentos)
+            medicao['n'] = n
+            medicao['bytes_por_par'] = medicao['pico_tracemalloc_kb'] * 1024 / (n * n)
+            medicoes.append(medicao)
+
+        expoentes = expoentes_crescimento(medicoes)
+        relatorio['etapas'][nome] = {
+            'medicoes': medicoes,
+            'expoentes': expoentes,
+            'tamanhos_pulados': pulados,
+            'superquadratica': any(k is not None and k > EXPOENTE_MAXIMO + FOLGA_EXPOENTE for k in expoentes),
+        }
+    return relatorio
+
+
+def imprimir_relatorio(relatorio):
+    print(f"{'Etapa':<24}{'n':>7}{'Pico (KB)':>14}{'RSS (KB)':>12}{'B/par':>10}{'Tempo (s)':>11}{'Expoente':>10}")
+    for nome, etapa in relatorio['etapas'].items():
+        expoentes = [None] + etapa['expoentes']
+        for medicao, expoente in zip(etapa['medicoes'], expoentes):
+            texto_expoente = f"{expoente:.2f}" if expoente is not None else "-"
+            print(f"{nome:<24}{medicao['n']:>7}{medicao['pico_tracemalloc_kb']:>14,.0f}"
+                  f"{medicao['acrescimo_rss_kb']:>12,.0f}{medicao['bytes_por_par']:>10,.1f}"
+                  f"{medicao['tempo_segundos']:>11.3f}{texto_expoente:>10}")
+        if etapa['tamanhos_pulados']:
+            print(f"{nome:<24}  pulada para n = {etapa['tamanhos_pulados']} (use --sem-limite)")
+        if etapa['superquadratica']:
+            print(f"{nome:<24}  ATENÇÃO: memória cresce mais rápido que O(n²)")
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Perfil de memória das etapas do pipeline em vários tamanhos.")
+    parser.add_argument('--tamanhos', default=','.join(map(str, TAMANHOS_PADRAO)),
+                        help="Tamanhos (n) separados por vírgula.")
+    parser.add_argument('--etapas', default=None, help=f"Etapas separadas por vírgula ({', '.join(ETAPAS)}).")
+    parser.add_argument('--sem-limite', action='store_true', help="Roda também os tamanhos acima do n_max da etapa.")
+    parser.add_argument('--saida', default=OUTPUT_RELATORIO_JSON, help="Relatório em JSON.")
+    return parser.parse_args()
+
+
+# Execução Principal
+if __name__ == "__main__":
+    args = ler_argumentos()
+    relatorio = perfilar([int(n) for n in args.tamanhos.split(',')],
+                         args.etapas.split(',') if args.etapas else None, args.sem_limite)
+    imprimir_relatorio(relatorio)
+
+    os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+    with open(args.saida, 'w') as f:
+        json.dump(relatorio, f, indent=4)
+    print(f"\nRelatório salvo em '{args.saida}'.")
+    sys.exit(1 if any(etapa['superquadratica'] for etapa in relatorio['etapas'].values()) else 0)
@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pytest
+
+from instancias import gerar_pontos_de_visita
+from app.backends_rota import BackendLocal, GrafoRodoviario, GRAFO_RODOVIARIO_NPZ
+from app.matriz_custos import construir_matriz_custos
+from perfil_memoria import BackendDirectionsSimulado
+
+SEMENTE = 42
+TAMANHOS_MATRIZ_LOCAL = [100, 1000]
+TAMANHOS_MATRIZ_DIRECTIONS = [100, 300]
+CAMINHO_GRAFO = os.path.join(os.path.dirname(__file__), '..', GRAFO_RODOVIARIO_NPZ)
+# Os casos menores levam dezenas de ms: uma rodada fria (alocações, caches do processador)
+# varia mais que o limiar de regressão, então o tempo comparado é o mínimo de várias rodadas
+RODADAS = 5
+RODADAS_AQUECIMENTO = 1
+
+
+@pytest.fixture(scope='module')
+def backend_local():
+    backend = BackendLocal(GrafoRodoviario.carregar(CAMINHO_GRAFO))
+    backend.matriz(gerar_pontos_de_visita(3, SEMENTE))  # compila o Dijkstra (JIT) fora da medição
+    return backend
+
+
+@pytest.mark.parametrize('n', TAMANHOS_MATRIZ_LOCAL)
+def test_matriz_backend_local(benchmark, verificar_regressao, backend_local, n):
+    """Vazão da construção da matriz de custos sem rede (grafo rodoviário local)."""
+    pontos = gerar_pontos_de_visita(n, SEMENTE)
+    matriz = benchmark.pedantic(construir_matriz_custos, args=(pontos,), kwargs={'backend': backend_local},
+                                rounds=RODADAS, warmup_rounds=RODADAS_AQUECIMENTO, iterations=1)
+
+    distancias = matriz.camada('distancia_km').to_numpy()
+    assert np.isfinite(distancias[~np.eye(n, dtype=bool)]).all()
+    pares_por_segundo = n * (n - 1) / benchmark.stats.stats.min
+    benchmark.extra_info.update(pares_por_segundo=pares_por_segundo)
+    verificar_regressao(f"matriz_backend_local_n{n}", tempo_segundos=benchmark.stats.stats.min)
+
+
+@pytest.mark.parametrize('n', TAMANHOS_MATRIZ_DIRECTIONS)
+def test_matriz_backend_directions(benchmark, verificar_regressao, n):
+    """Vazão da montagem da matriz par a par (directions do ORS com respostas simuladas, sem rede)."""
+    pontos = gerar_pontos_de_visita(n, SEMENTE)
+    matriz = benchmark.pedantic(construir_matriz_custos, args=(pontos,),
+                                kwargs={'backend': BackendDirectionsSimulado()}, rounds=RODADAS,
+                                warmup_rounds=RODADAS_AQUECIMENTO, iterations=1)
+
+    distancias = matriz.camada('distancia_km').to_numpy()
+    assert np.isfinite(distancias[~np.eye(n, dtype=bool)]).all()
+    pares_por_segundo = n * (n - 1) / benchmark.stats.stats.min
+    benchmark.extra_info.update(pares_por_segundo=pares_por_segundo)
+    verificar_regressao(f"matriz_backend_directions_n{n}", tempo_segundos=benchmark.stats.stats.min)
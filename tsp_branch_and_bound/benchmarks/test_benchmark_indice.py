@@ -0,0 +1,41 @@
+import pytest
+
+from app.indice_espacial import IndiceEspacial, selecionar_pontos
+from app.pipeline_dados import ler_cidades_csv, INPUT_CSV_PATH
+import os
+
+CSV_CIDADES = os.path.join(os.path.dirname(__file__), '..', INPUT_CSV_PATH)
+CURITIBA = (-25.4296, -49.2713)
+
+
+@pytest.fixture(scope='module')
+def cidades():
+    return ler_cidades_csv(CSV_CIDADES)
+
+
+@pytest.fixture(scope='module')
+def indice(cidades):
+    return IndiceEspacial.de_dataframe(cidades)
+
+
+def test_construcao_indice(benchmark, verificar_regressao, cidades):
+    benchmark(IndiceEspacial.de_dataframe, cidades)
+    verificar_regressao("indice_construcao_5570", tempo_segundos=benchmark.stats.stats.min)
+
+
+@pytest.mark.parametrize('consulta', ['raio', 'retangulo', 'k_vizinhos'])
+def test_consultas_indice(benchmark, verificar_regressao, indice, consulta):
+    funcoes = {
+        'raio': lambda: indice.consulta_raio(*CURITIBA, 200),
+        'retangulo': lambda: indice.consulta_retangulo(-26.0, -22.5, -54.5, -48.0),
+        'k_vizinhos': lambda: indice.k_mais_proximos(*CURITIBA, 50),
+    }
+    benchmark(funcoes[consulta])
+    verificar_regressao(f"indice_{consulta}", tempo_segundos=benchmark.stats.stats.min)
+
+
+def test_selecao_pontos(benchmark, verificar_regressao, cidades, indice):
+    pontos = benchmark(selecionar_pontos, cidades, indice, deposito='CURITIBA', raio_km=300,
+                       populacao_minima=20000, k=30)
+    assert len(pontos) == 31
+    verificar_regressao("selecao_pontos_k30", tempo_segundos=benchmark.stats.stats.min)
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.kernels import NUMBA_DISPONIVEL
+
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Comando de cada ponto de entrada e os módulos pesados que ele não pode carregar
+PONTOS_DE_ENTRADA = {
+    'solver': (['-c', 'import app.branch_e_bound'], ('pandas', 'numba', 'requests')),
+    'heuristica': (['-c', 'import app.heuristicas'], ('pandas', 'numba', 'requests')),
+    'api': (['-c', 'import app.servico_api'], ('pandas', 'numba', 'requests')),
+    'cli': (['roteamento.py', '--help'], ('numpy', 'pandas', 'numba', 'requests')),
+}
+
+
+def importar_com_importtime(argumentos):
+    """
+    Roda o comando em um interpretador novo com '-X importtime'. Retorna o tempo total de
+    importação (soma dos módulos de primeiro nível, em segundos) e os módulos importados.
+    """
+    processo = subprocess.run([sys.executable, '-X', 'importtime'] + argumentos, cwd=RAIZ_PROJETO,
+                              capture_output=True, text=True, check=True)
+    total_us = 0
+    modulos = set()
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, cumulativo, nome = linha.split('|')
+        modulos.add(nome.strip().split('.')[0])
+        if not nome.startswith('  '):  # primeiro nível (os aninhados já entram no cumulativo)
+            total_us += int(cumulativo)
+    return total_us / 1e6, modulos
+
+
+@pytest.mark.parametrize('ponto_de_entrada', list(PONTOS_DE_ENTRADA))
+def test_tempo_inicializacao(benchmark, verificar_regressao, ponto_de_entrada):
+    """Partida a frio: tempo de importação de cada ponto de entrada e módulos carregados."""
+    argumentos, proibidos = PONTOS_DE_ENTRADA[ponto_de_entrada]
+    tempo_importacao, modulos = benchmark.pedantic(importar_com_importtime, args=(argumentos,),
+                                                   rounds=3, iterations=1)
+
+    assert not modulos & set(proibidos), f"'{ponto_de_entrada}' carregou {sorted(modulos & set(proibidos))}"
+    benchmark.extra_info.update(tempo_importacao_segundos=tempo_importacao)
+    verificar_regressao(f"inicializacao_{ponto_de_entrada}", tempo_segundos=benchmark.stats.stats.min,
+                        tempo_importacao_segundos=tempo_importacao)
+
+
+def resolver_em_processo_novo(usar_jit):
+    """Resolve a matriz do Paraná em um interpretador novo; retorna se o numba foi carregado."""
+    codigo = ("import sys; from app.branch_e_bound import branch_and_bound_tsp, ler_matriz_csv; "
+              f"branch_and_bound_tsp(ler_matriz_csv('results/matriz_distancias.csv')[1], usar_jit={usar_jit}); "
+              "print('numba' in sys.modules)")
+    processo = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ_PROJETO, capture_output=True, text=True,
+                              check=True)
+    return processo.stdout.strip() == 'True'
+
+
+@pytest.mark.parametrize('kernels', ['padrao', 'jit'])
+def test_partida_fria_solver(benchmark, verificar_regressao, kernels):
+    """
+    Resolução completa da matriz do Paraná (n = 10) em um processo novo. Com o JIT, o import do
+    numba e a carga dos kernels do cache custam mais do que a busca inteira com os kernels em Python.
+    """
+    if kernels == 'jit' and not NUMBA_DISPONIVEL:
+        pytest.skip("numba não instalado")
+    carregou_numba = benchmark.pedantic(resolver_em_processo_novo, args=(True if kernels == 'jit' else None,),
+                                        rounds=3, iterations=1)
+
+    assert carregou_numba == (kernels == 'jit')
+    verificar_regressao(f"partida_fria_solver_{kernels}", tempo_segundos=benchmark.stats.stats.min)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from instancias import gerar_instancia_assimetrica
+from app.branch_e_bound import No, calcular_lower_bound
+from app.kernels import Kernels, NUMBA_DISPONIVEL
+
+SEMENTE = 42
+TAMANHOS_EXPANSAO = [10, 30, 60]
+NUM_NOS = 200
+
+
+def _rotas_parciais(n, semente):
+    """Rotas parciais sorteadas (metade das cidades visitadas), partindo da cidade 0."""
+    rng = np.random.default_rng(semente)
+    return [[0] + [int(v) for v in rng.permutation(np.arange(1, n))[:n // 2 - 1]] for _ in range(NUM_NOS)]
+
+
+def _expandir_referencia(matriz_np, n, rotas):
+    """Geração dos filhos como no laço original (conjuntos + calcular_lower_bound por filho)."""
+    for rota in rotas:
+        for proximo in set(range(n)) - set(rota):
+            filho = No(rota=rota + [proximo], custo=matriz_np[rota[-1], proximo], bound=0)
+            filho.bound = calcular_lower_bound(matriz_np, filho, n)
+
+
+def _expandir_kernels(kernels, rotas):
+    for rota in rotas:
+        kernels.expandir(rota, 0.0, float('inf'))
+
+
+@pytest.mark.parametrize('implementacao', ['referencia', 'python', 'numpy', 'jit'])
+@pytest.mark.parametrize('n', TAMANHOS_EXPANSAO)
+def test_custo_por_no_expansao(benchmark, verificar_regressao, n, implementacao):
+    """Tempo por nó expandido (geração dos filhos + bounds): laço Python, NumPy vetorizado e JIT."""
+    if implementacao == 'jit' and not NUMBA_DISPONIVEL:
+        pytest.skip("numba não instalado")
+
+    matriz_np = gerar_instancia_assimetrica(n, SEMENTE).values
+    rotas = _rotas_parciais(n, SEMENTE)
+    if implementacao == 'referencia':
+        benchmark(_expandir_referencia, matriz_np, n, rotas)
+    else:
+        kernels = Kernels(matriz_np, implementacao=implementacao)
+        kernels.expandir(rotas[0], 0.0, float('inf'))  # compila fora da medição
+        benchmark(_expandir_kernels, kernels, rotas)
+
+    tempo_por_no = benchmark.stats.stats.min / NUM_NOS
+    benchmark.extra_info.update(tempo_por_no_us=tempo_por_no * 1e6)
+    verificar_regressao(f"expansao_{implementacao}_n{n}", tempo_segundos=benchmark.stats.stats.min)
@@ -0,0 +1,49 @@
+import pytest
+
+from instancias import gerar_instancia_assimetrica, carregar_instancia_parana, custo_otimo_held_karp
+from app.branch_e_bound import branch_and_bound_tsp, EstatisticasBusca, LIMITANTES
+
+SEMENTE = 42
+# Instâncias assimétricas sintéticas de tamanho fixo, além das do --n-max-exato: o limitante
+# de atribuição é o que deixa resolver as maiores em tempo de benchmark
+TAMANHOS_ASSIMETRICOS = [12, 16]
+INSTANCIAS = {
+    'parana_9': lambda: carregar_instancia_parana('parana_9'),
+    'parana_10': lambda: carregar_instancia_parana('parana_10'),
+    **{f"assimetrica_n{n}": (lambda n=n: gerar_instancia_assimetrica(n, SEMENTE)) for n in TAMANHOS_ASSIMETRICOS},
+}
+
+pytestmark = pytest.mark.usefixtures('kernels_compilados')
+
+
+def _resolver(matriz, limitante):
+    estatisticas = EstatisticasBusca()
+    rota, custo, nos_expandidos = branch_and_bound_tsp(matriz, estatisticas, limitante=limitante)
+    return rota, custo, nos_expandidos, estatisticas
+
+
+@pytest.mark.parametrize('limitante', LIMITANTES)
+@pytest.mark.parametrize('nome', list(INSTANCIAS))
+def test_limitante_nas_matrizes_assimetricas(benchmark, verificar_regressao, nome, limitante):
+    """Tempo, nós expandidos e tempos de expansão e de bound de cada limitante nas matrizes reais (ORS) e sintéticas."""
+    if limitante == 'duas_menores' and nome == 'assimetrica_n16':
+        pytest.skip("milhões de nós com o limitante das duas menores arestas")
+    matriz = INSTANCIAS[nome]()
+    rota, custo, nos_expandidos, estatisticas = benchmark.pedantic(_resolver, args=(matriz, limitante),
+                                                                   rounds=1, iterations=1)
+
+    assert sorted(rota) == list(range(len(matriz)))
+    benchmark.extra_info.update(custo=float(custo), nos_expandidos=nos_expandidos,
+                                tempo_bound_segundos=estatisticas.tempo_bound_segundos,
+                                tempo_expansao_segundos=estatisticas.tempo_expansao_segundos)
+    verificar_regressao(f"limitante_{limitante}_{nome}", tempo_segundos=benchmark.stats.stats.min,
+                        nos_expandidos=nos_expandidos)
+
+
+@pytest.mark.parametrize('nome', ['parana_9', 'parana_10', 'assimetrica_n12'])
+def test_atribuicao_expande_menos_nos(nome):
+    """Custo ótimo conferido pelo Held-Karp (o das duas menores arestas não é referência em matrizes assimétricas)."""
+    matriz = INSTANCIAS[nome]()
+    _, _, nos_ref, _ = _resolver(matriz, 'duas_menores')
+    _, custo, nos, _ = _resolver(matriz, 'atribuicao')
+    assert custo == pytest.approx(custo_otimo_held_karp(matriz)) and nos < nos_ref
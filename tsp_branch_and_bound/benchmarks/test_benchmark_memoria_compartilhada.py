@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+
+from instancias import gerar_instancia_euclidiana
+from app.memoria_compartilhada import MatrizCompartilhada, inicializar_trabalhador, matriz_trabalhador
+
+SEMENTE = 42
+N_CIDADES = 2000  # 32 MB em float64
+NUM_TRABALHADORES = [1, 2, 4]
+
+
+def _linha_da_copia(matriz, linha):
+    return float(matriz[linha, 0])
+
+
+def _linha_compartilhada(linha):
+    return float(matriz_trabalhador().matriz[linha, 0])
+
+
+def _distribuir_por_copia(matriz, trabalhadores):
+    """Uma tarefa por trabalhador, cada uma recebendo a matriz serializada (pickle)."""
+    with ProcessPoolExecutor(max_workers=trabalhadores) as pool:
+        return list(pool.map(_linha_da_copia, [matriz] * trabalhadores, range(trabalhadores)))
+
+
+def _distribuir_compartilhada(matriz, trabalhadores):
+    """Uma tarefa por trabalhador; os trabalhadores se anexam à matriz pelo nome do bloco."""
+    with MatrizCompartilhada.criar(matriz) as compartilhada, \
+            ProcessPoolExecutor(max_workers=trabalhadores, initializer=inicializar_trabalhador,
+                                initargs=(compartilhada.descritor,)) as pool:
+        return list(pool.map(_linha_compartilhada, range(trabalhadores)))
+
+
+@pytest.mark.parametrize('modo', ['copia', 'compartilhada'])
+@pytest.mark.parametrize('trabalhadores', NUM_TRABALHADORES)
+def test_distribuir_matriz_para_trabalhadores(benchmark, verificar_regressao, modo, trabalhadores):
+    """Custo de entregar uma matriz de 2.000 cidades aos trabalhadores de um pool de processos."""
+    matriz = np.ascontiguousarray(gerar_instancia_euclidiana(N_CIDADES, SEMENTE).values)
+    distribuir = _distribuir_por_copia if modo == 'copia' else _distribuir_compartilhada
+
+    valores = benchmark.pedantic(distribuir, args=(matriz, trabalhadores), rounds=3, iterations=1)
+
+    assert valores == [float(matriz[linha, 0]) for linha in range(trabalhadores)]
+    verificar_regressao(f"distribuir_matriz_{modo}_{trabalhadores}t", tempo_segundos=benchmark.stats.stats.min)
@@ -0,0 +1,28 @@
+import pytest
+
+from instancias import gerar_instancia_euclidiana, gerar_instancia_assimetrica, gerar_premios
+from app.orientacao import branch_and_bound_orientacao
+
+SEMENTE = 42
+GERADORES = {
+    'euclidiana': gerar_instancia_euclidiana,
+    'assimetrica': gerar_instancia_assimetrica,
+}
+# Candidatas e orçamento de um dia de visitas (cerca de 8 a 10 cidades no quadrado de 500 km)
+TAMANHOS_ORIENTACAO = [30, 40, 50]
+ORCAMENTO_KM = 600.0
+
+
+@pytest.mark.parametrize('tipo', sorted(GERADORES))
+@pytest.mark.parametrize('n', TAMANHOS_ORIENTACAO)
+def test_branch_and_bound_orientacao(benchmark, verificar_regressao, tipo, n):
+    matriz = GERADORES[tipo](n, SEMENTE)
+    premios = gerar_premios(n, SEMENTE)
+    rota, premio, custo, nos_expandidos = benchmark.pedantic(branch_and_bound_orientacao,
+                                                             args=(matriz, premios, ORCAMENTO_KM),
+                                                             rounds=1, iterations=1)
+
+    assert rota[0] == 0 and custo <= ORCAMENTO_KM * (1 + 1e-9)
+    benchmark.extra_info.update(premio=premio, cidades_visitadas=len(rota) - 1, nos_expandidos=nos_expandidos)
+    verificar_regressao(f"orientacao_{tipo}_n{n}", tempo_segundos=benchmark.stats.stats.min,
+                        nos_expandidos=nos_expandidos)
@@ -0,0 +1,19 @@
+import pytest
+
+from perfil_memoria import ETAPAS, perfilar, expoentes_crescimento
+
+
+def test_expoente_de_crescimento():
+    # Picos abaixo de PICO_MINIMO_KB não entram no cálculo
+    medicoes = [{'n': 10, 'pico': 0.1}, {'n': 100, 'pico': 100.0}, {'n': 1000, 'pico': 100_000.0}]
+    assert expoentes_crescimento(medicoes, 'pico') == [None, pytest.approx(3.0)]
+
+
+@pytest.mark.parametrize('etapa', list(ETAPAS))
+def test_perfil_memoria_das_etapas(verificar_regressao, etapa):
+    """Pico de memória (tracemalloc) de cada etapa em n = 10, 100 e 1000; falha se crescer mais que O(n²)."""
+    relatorio = perfilar(etapas=[etapa])['etapas'][etapa]
+
+    for medicao in relatorio['medicoes']:
+        verificar_regressao(f"memoria_{etapa}_n{medicao['n']}", pico_memoria_kb=medicao['pico_tracemalloc_kb'])
+    assert not relatorio['superquadratica'], f"memória de '{etapa}' cresce mais rápido que O(n²): {relatorio}"
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from instancias import (gerar_instancia_euclidiana, gerar_instancia_assimetrica, carregar_instancia_parana,
+                        gerar_coordenadas)
+from app.branch_e_bound import No, branch_and_bound_tsp, calcular_lower_bound
+from app.heuristicas import vizinho_mais_proximo_heuristica
+from app.agrupamento import resolver_por_agrupamento, custo_ciclo
+from app.matriz_custos import calcular_matriz_haversine
+
+SEMENTE = 42
+GERADORES = {
+    'euclidiana': gerar_instancia_euclidiana,
+    'assimetrica': gerar_instancia_assimetrica,
+}
+TAMANHOS_HEURISTICA = [10, 100, 1000]
+TAMANHOS_BOUND = [10, 100, 1000]
+TAMANHOS_AGRUPAMENTO = [200, 1000]
+# As resoluções exatas das instâncias pequenas levam poucos ms: o tempo comparado é o mínimo de várias rodadas
+RODADAS_EXATO = 5
+
+pytestmark = pytest.mark.usefixtures('kernels_compilados')
+
+
+def _medir_solver_exato(benchmark, medir_pico_memoria, verificar_regressao, caso, matriz):
+    """Mede tempo (pytest-benchmark), nós expandidos e pico de memória de uma resolução exata."""
+    rota, custo, nos_expandidos = benchmark.pedantic(branch_and_bound_tsp, args=(matriz,), rounds=RODADAS_EXATO,
+                                                     warmup_rounds=1, iterations=1)
+    _, pico_kb = medir_pico_memoria(branch_and_bound_tsp, matriz)
+
+    assert rota is not None and sorted(rota) == list(range(len(matriz)))
+    benchmark.extra_info.update(custo=float(custo), nos_expandidos=nos_expandidos, pico_memoria_kb=pico_kb)
+    verificar_regressao(caso, tempo_segundos=benchmark.stats.stats.min,
+                        nos_expandidos=nos_expandidos, pico_memoria_kb=pico_kb)
+
+
+@pytest.mark.parametrize('tipo', sorted(GERADORES))
+def test_branch_and_bound_sintetico(benchmark, medir_pico_memoria, verificar_regressao, tipo, n_exato):
+    matriz = GERADORES[tipo](n_exato, SEMENTE)
+    _medir_solver_exato(benchmark, medir_pico_memoria, verificar_regressao,
+                        f"bnb_{tipo}_n{n_exato}", matriz)
+
+
+@pytest.mark.parametrize('nome', ['parana_9', 'parana_10'])
+def test_branch_and_bound_parana(benchmark, medir_pico_memoria, verificar_regressao, nome):
+    matriz = carregar_instancia_parana(nome)
+    _medir_solver_exato(benchmark, medir_pico_memoria, verificar_regressao, f"bnb_{nome}", matriz)
+
+
+@pytest.mark.parametrize('tipo', sorted(GERADORES))
+@pytest.mark.parametrize('n', TAMANHOS_HEURISTICA)
+def test_heuristica_vizinho_mais_proximo(benchmark, medir_pico_memoria, verificar_regressao, tipo, n):
+    matriz = GERADORES[tipo](n, SEMENTE)
+    rota, custo = benchmark(vizinho_mais_proximo_heuristica, matriz)
+    _, pico_kb = medir_pico_memoria(vizinho_mais_proximo_heuristica, matriz)
+
+    assert sorted(rota) == list(range(n))
+    benchmark.extra_info.update(custo=float(custo), pico_memoria_kb=pico_kb)
+    verificar_regressao(f"heuristica_vmp_{tipo}_n{n}", tempo_segundos=benchmark.stats.stats.min,
+                        pico_memoria_kb=pico_kb)
+
+
+@pytest.mark.parametrize('n', TAMANHOS_BOUND)
+def test_lower_bound_no_raiz(benchmark, verificar_regressao, n):
+    matriz_np = gerar_instancia_euclidiana(n, SEMENTE).values
+    no_raiz = No(rota=[0], custo=0, bound=0)
+
+    bound = benchmark(calcular_lower_bound, matriz_np, no_raiz, n)
+
+    assert bound > 0
+    verificar_regressao(f"bound_raiz_n{n}", tempo_segundos=benchmark.stats.stats.min)
+
+
+@pytest.mark.parametrize('n', TAMANHOS_AGRUPAMENTO)
+def test_agrupamento(benchmark, verificar_regressao, n):
+    latitudes, longitudes = gerar_coordenadas(n, SEMENTE)
+    rota, custo, informacoes = benchmark.pedantic(resolver_por_agrupamento, args=(latitudes, longitudes),
+                                                  kwargs={'num_processos': 1}, rounds=1, iterations=1)
+
+    assert sorted(rota) == list(range(n))
+    # Qualidade: custo em relação ao vizinho mais próximo sobre a mesma matriz Haversine
+    matriz = calcular_matriz_haversine(latitudes, longitudes)
+    np.fill_diagonal(matriz, np.inf)
+    rota_vmp, _ = vizinho_mais_proximo_heuristica(pd.DataFrame(matriz))
+    custo_relativo = custo / custo_ciclo(matriz, rota_vmp)
+
+    benchmark.extra_info.update(custo=custo, custo_relativo_vmp=custo_relativo, num_grupos=informacoes['num_grupos'])
+    verificar_regressao(f"agrupamento_n{n}", tempo_segundos=benchmark.stats.stats.min,
+                        custo_relativo_vmp=custo_relativo)
@@ -10,13 +10,16 @@ APP_DIR = 'app'
 PIPELINE_SCRIPT = os.path.join(APP_DIR, 'pipeline_dados.py')
 MATRIZ_SCRIPT = os.path.join(APP_DIR, 'matriz_custos.py')
 BNB_SCRIPT = os.path.join(APP_DIR, 'branch_e_bound.py')
+GEOMETRIAS_SCRIPT = os.path.join(APP_DIR, 'geometrias.py')
 DASHBOARD_SCRIPT = os.path.join(APP_DIR, 'analise_dados.py')
+API_SCRIPT = os.path.join(APP_DIR, 'servico_api.py')
 
 # Scripts de Sensibilidade
 SENSIBILIDADE_DIR = 'scripts_sensibilidade'
 PIPELINE_SENSIBILIDADE_SCRIPT = os.path.join(SENSIBILIDADE_DIR, 'pipeline_sensibilidade.py')
 MATRIZ_CUSTOS_SENSIBILIDADE_SCRIPT = os.path.join(SENSIBILIDADE_DIR, 'matriz_custos_sensibilidade.py')
 BNB_SENSIBILIDADE_SCRIPT = os.path.join(SENSIBILIDADE_DIR, 'branch_e_bound_sensibilidade.py')
+GEOMETRIAS_SENSIBILIDADE_SCRIPT = os.path.join(SENSIBILIDADE_DIR, 'geometrias_sensibilidade.py')
 
 # Paths para os testes
 TESTS_DIR = 'tests'
@@ -62,6 +65,13 @@ def run_streamlit():
     run_command(command)
 
 
+def run_api():
+    """Inicia a API HTTP local de resolução do TSP."""
+    print(f"\n--- Iniciando a API HTTP de Resolução ---")
+    print("Para parar o servidor, pressione Ctrl+C neste terminal.")
+    run_command([API_SCRIPT])
+
+
 def run_pytest():
     """Executa o comando 'pytest'."""
     command = ['-m', 'pytest', TESTS_DIR]
@@ -73,15 +83,18 @@ def run_sensibilidade_pipeline():
     """Executa a pipeline para o cenário de sensibilidade."""
     print("\n--- INICIANDO PIPELINE DE SENSIBILIDADE (CENÁRIO 9 CIDADES) ---")
 
-    print("\n--- (1/3): Gerando Amostra de Sensibilidade ---")
+    print("\n--- (1/4): Gerando Amostra de Sensibilidade ---")
     if not run_command([PIPELINE_SENSIBILIDADE_SCRIPT]): return
 
-    print("\n--- (2/3): Calculando Matriz de Custos de Sensibilidade ---")
+    print("\n--- (2/4): Calculando Matriz de Custos de Sensibilidade ---")
     print("(Depende da API)")
     if not run_command([MATRIZ_CUSTOS_SENSIBILIDADE_SCRIPT]): return
 
-    print("\n--- (3/3): Executando Algoritmo Branch and Bound de Sensibilidade ---")
-    if not run_command([BNB_SENSIBILIDADE_SCRIPT]): return
+    print("\n--- (3/4): Executando Algoritmo Branch and Bound de Sensibilidade ---")
+    if not run_command([BNB_SENSIBILIDADE_SCRIPT, '--instrumentar']): return
+
+    print("\n--- (4/4): Buscando Geometrias da Rota de Sensibilidade ---")
+    if not run_command([GEOMETRIAS_SENSIBILIDADE_SCRIPT]): return
 
     print("\n--- PIPELINE DE SENSIBILIDADE CONCLUÍDA COM SUCESSO! ---")
 
@@ -92,16 +105,20 @@ def run_full_pipeline():
     """
     print("\n--- INICIANDO PIPELINE ORIGINAL (10 CIDADES) ---")
 
-    print("\n--- (1/3): Gerando Amostra de Cidades ---")
+    print("\n--- (1/4): Gerando Amostra de Cidades ---")
     if not run_command([PIPELINE_SCRIPT]): return
 
-    print("\n--- (2/3): Calculando Matriz de Custos e Geometrias ---")
+    print("\n--- (2/4): Calculando Matriz de Custos ---")
     print("(Isso pode levar vários minutos e depende da API)")
     if not run_command([MATRIZ_SCRIPT]): return
 
-    print("\n--- (3/3): Executando Algoritmo Branch and Bound ---")
+    print("\n--- (3/4): Executando Algoritmo Branch and Bound ---")
     print("(Isso pode levar alguns minutos)")
-    if not run_command([BNB_SCRIPT]): return
+    if not run_command([BNB_SCRIPT, '--instrumentar']): return
+
+    print("\n--- (4/4): Buscando Geometrias da Rota Ótima ---")
+    print("(Apenas os trechos da rota; os já baixados vêm do cache)")
+    if not run_command([GEOMETRIAS_SCRIPT]): return
 
     print("\n--- PIPELINE ORIGINAL CONCLUÍDA COM SUCESSO! ---")
 
@@ -137,9 +154,10 @@ def main_menu():
         print("1. [Rodar] Pipeline COMPLETA (Original + Sensibilidade)")
         print("2. [Iniciar] Dashboard Streamlit (Visualização)")
         print("3. [Rodar] Testes Unitários")
-        print("4. [Sair]")
+        print("4. [Iniciar] API HTTP de Resolução (local)")
+        print("5. [Sair]")
 
-        escolha = input("Digite sua escolha (1-4): ")
+        escolha = input("Digite sua escolha (1-5): ")
 
         if escolha == '1':
             run_full_pipeline()
@@ -152,6 +170,8 @@ def main_menu():
         elif escolha == '3':
             run_pytest()
         elif escolha == '4':
+            run_api()
+        elif escolha == '5':
             print("Encerrando...")
             break
         else:
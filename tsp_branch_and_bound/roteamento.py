@@ -0,0 +1,136 @@
+import argparse
+import os
+import sys
+
+# Cada subcomando importa apenas os módulos de que precisa, dentro da própria função:
+# 'solve' lê o CSV e roda o Branch and Bound só com o NumPy (o pandas entra apenas com
+# '--pesos'), e o numba só é carregado quando os kernels JIT são usados.
+
+# Configuração de Paths
+RESULTS_DIR = 'results'
+BENCHMARKS_DIR = 'benchmarks'
+MATRIZ_CSV = os.path.join(RESULTS_DIR, 'matriz_distancias.csv')
+CAMADAS_NPZ = os.path.join(RESULTS_DIR, 'matriz_custos.npz')
+PONTOS_CSV = os.path.join(RESULTS_DIR, 'pontos_de_visita.csv')
+RESULTADOS_JSON = os.path.join(RESULTS_DIR, 'resultados_branch_and_bound.json')
+EVENTOS_JSONL = os.path.join(RESULTS_DIR, 'eventos.jsonl')
+CACHE_RESULTADOS_JSON = os.path.join('data', 'cache', 'resultados.json')
+ORIENTACAO_JSON = os.path.join(RESULTS_DIR, 'resultados_orientacao.json')
+
+
+def comando_solve(argumentos):
+    from app.branch_e_bound import executar_branch_and_bound
+
+    pesos = None
+    if argumentos.pesos:
+        from app.camadas_custo import ler_pesos_camadas
+        pesos = ler_pesos_camadas(argumentos.pesos)
+    resultados = executar_branch_and_bound(argumentos.matriz, argumentos.saida,
+                                           instrumentar=argumentos.instrumentar,
+                                           modo_matriz=argumentos.modo_matriz, pesos_camadas=pesos,
+                                           caminho_camadas=argumentos.camadas, caminho_eventos=argumentos.eventos,
+                                           caminho_cache=None if argumentos.sem_cache else argumentos.cache,
+                                           limitante=argumentos.limitante)
+    return 0 if resultados else 1
+
+
+def comando_orienteer(argumentos):
+    from app.orientacao import executar_orientacao
+
+    resultados = executar_orientacao(argumentos.pontos, argumentos.matriz, argumentos.saida,
+                                     orcamento_km=argumentos.orcamento_km, instrumentar=argumentos.instrumentar,
+                                     caminho_eventos=argumentos.eventos)
+    return 0 if resultados else 1
+
+
+def comando_matrix(argumentos):
+    from app.matriz_custos import executar_matriz_custos
+
+    executar_matriz_custos(argumentos.pontos, argumentos.saida, argumentos.camadas,
+                           perfis_horarios=argumentos.perfis_horarios, caminho_eventos=argumentos.eventos,
+                           backend=argumentos.backend)
+    return 0
+
+
+def comando_bench(argumentos):
+    import pytest
+
+    return pytest.main([BENCHMARKS_DIR] + argumentos.argumentos_pytest)
+
+
+def comando_serve(argumentos):
+    from app.servico_api import executar_servidor
+
+    executar_servidor(argumentos.host, argumentos.porta)
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='roteamento',
+        description="Roteamento de vendas: matriz de custos, resolução do TSP (ou da orientação), "
+                    "benchmarks e API HTTP.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    solve = subcomandos.add_parser('solve', help="Resolve o TSP (Branch and Bound) sobre a matriz de custos.")
+    solve.add_argument('--matriz', default=MATRIZ_CSV, help="Matriz de distâncias (CSV).")
+    solve.add_argument('--saida', default=RESULTADOS_JSON, help="Arquivo JSON de resultados.")
+    solve.add_argument('--modo-matriz', default='float64', choices=['float64', 'float32', 'int32'],
+                       help="Representação interna da matriz.")
+    solve.add_argument('--limitante', default=None, choices=['duas_menores', 'atribuicao'],
+                       help="Bound da busca: duas menores arestas ou problema de atribuição "
+                            "(padrão: atribuição se a matriz for assimétrica).")
+    solve.add_argument('--pesos', default=None,
+                       help="Combinação de camadas de custo (ex: 'duracao_h:1' ou 'distancia_km:1,duracao_h:80').")
+    solve.add_argument('--camadas', default=CAMADAS_NPZ, help="Camadas de custo (NPZ), usadas com '--pesos'.")
+    solve.add_argument('--instrumentar', action='store_true', help="Exporta as estatísticas detalhadas da busca.")
+    solve.add_argument('--eventos', nargs='?', const=EVENTOS_JSONL, default=None,
+                       help="Grava o andamento como eventos JSONL (padrão: results/eventos.jsonl).")
+    solve.add_argument('--cache', default=CACHE_RESULTADOS_JSON, help="Cache de resultados já resolvidos (JSON).")
+    solve.add_argument('--sem-cache', action='store_true', help="Resolve sempre, sem consultar o cache de resultados.")
+    solve.set_defaults(funcao=comando_solve)
+
+    orienteer = subcomandos.add_parser(
+        'orienteer', help="Escolhe as cidades do dia dentro de um orçamento de km, maximizando a população.")
+    orienteer.add_argument('--orcamento-km', type=float, required=True, help="Distância máxima do dia (ida e volta).")
+    orienteer.add_argument('--matriz', default=MATRIZ_CSV, help="Matriz de distâncias (CSV).")
+    orienteer.add_argument('--pontos', default=PONTOS_CSV, help="Pontos de visita (CSV).")
+    orienteer.add_argument('--saida', default=ORIENTACAO_JSON, help="Arquivo JSON de resultados.")
+    orienteer.add_argument('--instrumentar', action='store_true', help="Exporta as estatísticas detalhadas da busca.")
+    orienteer.add_argument('--eventos', nargs='?', const=EVENTOS_JSONL, default=None,
+                           help="Grava o andamento como eventos JSONL (padrão: results/eventos.jsonl).")
+    orienteer.set_defaults(funcao=comando_orienteer)
+
+    matrix = subcomandos.add_parser('matrix', help="Constrói a matriz de custos dos pontos de visita.")
+    matrix.add_argument('--pontos', default=PONTOS_CSV, help="Pontos de visita (CSV).")
+    matrix.add_argument('--saida', default=MATRIZ_CSV, help="Matriz de distâncias (CSV).")
+    matrix.add_argument('--camadas', default=CAMADAS_NPZ, help="Camadas de custo (NPZ).")
+    matrix.add_argument('--backend', default='ors', help="Backend de roteamento: ors, ors-matriz ou local.")
+    matrix.add_argument('--perfis-horarios', action='store_true', help="Salva também a duração por hora do dia.")
+    matrix.add_argument('--eventos', nargs='?', const=EVENTOS_JSONL, default=None,
+                        help="Grava o andamento como eventos JSONL (padrão: results/eventos.jsonl).")
+    matrix.set_defaults(funcao=comando_matrix)
+
+    bench = subcomandos.add_parser('bench', help="Roda os benchmarks (argumentos extras vão para o pytest).")
+    bench.set_defaults(funcao=comando_bench)
+
+    serve = subcomandos.add_parser('serve', help="Sobe a API HTTP local de resolução.")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--porta', type=int, default=int(os.getenv("PORTA_API", 8000)))
+    serve.set_defaults(funcao=comando_serve)
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    # Apenas o 'bench' aceita argumentos desconhecidos (repassados ao pytest, ex: -k, --salvar-baseline)
+    argumentos, extras = parser.parse_known_args(argv)
+    if extras and argumentos.comando != 'bench':
+        parser.error(f"argumentos não reconhecidos: {' '.join(extras)}")
+    argumentos.argumentos_pytest = extras
+    return argumentos.funcao(argumentos)
+
+
+# Execução Principal
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,152 +1,27 @@
-import pandas as pd
-import numpy as np
-import time
-import heapq
-import json
 import os
 import sys
 
+# Permite importar os módulos de 'app' (o algoritmo é o mesmo do cenário original)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.branch_e_bound import executar_branch_and_bound, ler_opcao, CACHE_RESULTADOS_JSON, LIMITANTE_PADRAO
+from app.camadas_custo import ler_pesos_camadas
+from app.eventos import caminho_eventos_argumentos
+
 # Configuração de Paths
 RESULTS_DIR = 'results'
 INPUT_MATRIZ_CSV = os.path.join(RESULTS_DIR, 'matriz_distancias_sensibilidade.csv')
 OUTPUT_RESULTADOS_JSON = os.path.join(RESULTS_DIR, 'resultados_branch_and_bound_sensibilidade.json')
-
-
-# Representa um nó na árvore de busca do Branch and Bound.
-class No:
-    def __init__(self, rota, custo, bound):
-        self.rota = rota
-        self.custo = custo
-        self.bound = bound
-
-    def __lt__(self, other):
-        return (self.bound, self.custo) < (other.bound, other.custo)
-
-
-def calcular_lower_bound(matriz_distancias_np, no_atual, n):
-    """
-    Calcula o limite inferior (lower bound) para um nó, usando APENAS NumPy.
-    """
-    lower_bound = no_atual.custo
-    vertices_nao_visitados = set(range(n)) - set(no_atual.rota)
-
-    # Se a rota está completa, retorna o custo total ao voltar para o início
-    if len(no_atual.rota) == n:
-        return lower_bound + matriz_distancias_np[no_atual.rota[-1], no_atual.rota[0]]
-
-    # Adiciona a menor aresta que sai do último vértice da rota parcial
-    ultima_cidade = no_atual.rota[-1]
-    if vertices_nao_visitados:
-        # Usa sintaxe NumPy pura para indexação (matriz[row, [cols]])
-        valores_possiveis = matriz_distancias_np[ultima_cidade, list(vertices_nao_visitados)]
-        valores_finitos = valores_possiveis[np.isfinite(valores_possiveis)]
-        if len(valores_finitos) > 0:
-            lower_bound += np.min(valores_finitos)
-
-    # Soma as duas menores arestas de cada vértice não visitado
-    for vertice in vertices_nao_visitados:
-        # Usa sintaxe NumPy pura para indexação (matriz[row, :])
-        arestas_vertice = matriz_distancias_np[vertice, :]
-        arestas_vertice = arestas_vertice[np.isfinite(arestas_vertice)]
-        arestas_vertice.sort()
-        if len(arestas_vertice) >= 2:
-            lower_bound += arestas_vertice[0] + arestas_vertice[1]
-        elif len(arestas_vertice) == 1:
-            lower_bound += arestas_vertice[0]
-
-    return lower_bound / 2
-
-
-def branch_and_bound_tsp(matriz_distancias_df):
-    # Implementa o algoritmo Branch and Bound para o TSP.
-    n = len(matriz_distancias_df)
-    fila_prioridade = []
-
-    # Conversão para NumPy AQUI, e não antes da chamada da função
-    matriz_distancias_np = matriz_distancias_df.values
-
-    no_inicial = No(rota=[0], custo=0, bound=0)
-    # Passa o array NumPy
-    no_inicial.bound = calcular_lower_bound(matriz_distancias_np, no_inicial, n)
-    heapq.heappush(fila_prioridade, no_inicial)
-
-    solucao_otima = None
-    custo_otimo = float('inf')
-    nos_expandidos = 0
-
-    while fila_prioridade:
-        no_atual = heapq.heappop(fila_prioridade)
-        nos_expandidos += 1
-
-        if no_atual.bound >= custo_otimo:
-            continue
-
-        if len(no_atual.rota) == n:
-            # Usa a matriz NumPy
-            custo_total = no_atual.custo + matriz_distancias_np[no_atual.rota[-1], no_atual.rota[0]]
-            if custo_total < custo_otimo:
-                custo_otimo = custo_total
-                solucao_otima = no_atual.rota
-        else:
-            ultimo_vertice = no_atual.rota[-1]
-            vertices_nao_visitados = set(range(n)) - set(no_atual.rota)
-
-            for proximo_vertice in vertices_nao_visitados:
-                # Usa a matriz NumPy
-                novo_custo = no_atual.custo + matriz_distancias_np[ultimo_vertice, proximo_vertice]
-                if not np.isfinite(novo_custo):
-                    continue
-
-                if novo_custo < custo_otimo:
-                    nova_rota = no_atual.rota + [proximo_vertice]
-                    novo_no = No(rota=nova_rota, custo=novo_custo, bound=0)
-                    # Passa a matriz NumPy
-                    novo_no.bound = calcular_lower_bound(matriz_distancias_np, novo_no, n)
-                    heapq.heappush(fila_prioridade, novo_no)
-
-    return solucao_otima, custo_otimo, nos_expandidos
+INPUT_CAMADAS_NPZ = os.path.join(RESULTS_DIR, 'matriz_custos_sensibilidade.npz')
 
 
 if __name__ == "__main__":
-    try:
-        matriz_distancias_df = pd.read_csv(INPUT_MATRIZ_CSV, index_col=0)
-        matriz_distancias_df = matriz_distancias_df.apply(pd.to_numeric, errors='coerce')
-        matriz_distancias_df = matriz_distancias_df.fillna(np.inf)
-        np.fill_diagonal(matriz_distancias_df.values, np.inf)
-
-    except FileNotFoundError:
-        print(f"Erro: O arquivo '{INPUT_MATRIZ_CSV}' não foi encontrado.")
-        print("Execute o 'matriz_custos_sensibilidade.py' primeiro.")
-        sys.exit(1)
-
-    print("Iniciando o algoritmo de Branch and Bound (Sensibilidade)...\n")
-    inicio = time.time()
-    rota_otima, custo_otimo, nos_expandidos = branch_and_bound_tsp(matriz_distancias_df)
-    fim = time.time()
-    tempo_execucao = fim - inicio
-
-    print("Resultados (Sensibilidade):")
-    if rota_otima is None:
-        print("Nenhuma rota viável encontrada.")
-    else:
-        rota_completa = rota_otima + [rota_otima[0]]
-        rota_nomes = [matriz_distancias_df.columns[i] for i in rota_completa]
-        print(f"Rota Ótima (índices): {rota_completa}")
-        print(f"Rota Ótima (nomes): {rota_nomes}")
-        print(f"Custo Total da Rota: {custo_otimo:.2f} km")
-        print(f"Nós Expandidos: {nos_expandidos}")
-        print(f"Tempo de Execução: {tempo_execucao:.4f} segundos")
-
-        resultados = {
-            "rota_otima_indices": rota_otima,
-            "rota_otima_nomes": rota_nomes,
-            "custo_total_km": custo_otimo,
-            "tempo_execucao_segundos": tempo_execucao,
-            "nos_expandidos": nos_expandidos
-        }
-        try:
-            with open(OUTPUT_RESULTADOS_JSON, 'w') as f:
-                json.dump(resultados, f, indent=4)
-            print(f"Resultados salvos em '{OUTPUT_RESULTADOS_JSON}'.")
-        except Exception as e:
-            print(f"Erro ao salvar o arquivo de resultados: {e}")
+    pesos = ler_opcao(sys.argv, 'pesos')
+    executar_branch_and_bound(INPUT_MATRIZ_CSV, OUTPUT_RESULTADOS_JSON,
+                              instrumentar='--instrumentar' in sys.argv,
+                              descricao=" (Sensibilidade)",
+                              pesos_camadas=ler_pesos_camadas(pesos) if pesos else None,
+                              caminho_camadas=INPUT_CAMADAS_NPZ,
+                              caminho_eventos=caminho_eventos_argumentos(sys.argv),
+                              caminho_cache=None if '--sem-cache' in sys.argv else CACHE_RESULTADOS_JSON,
+                              limitante=ler_opcao(sys.argv, 'limitante', LIMITANTE_PADRAO))
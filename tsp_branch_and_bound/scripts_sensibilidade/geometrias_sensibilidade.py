@@ -0,0 +1,21 @@
+import os
+import sys
+
+# Permite importar os módulos de 'app'
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.geometrias import executar_geometrias
+from app.eventos import caminho_eventos_argumentos
+from app.backends_rota import backend_argumentos
+
+# Configuração de Paths
+RESULTS_DIR = 'results'
+INPUT_PONTOS_CSV = os.path.join(RESULTS_DIR, 'pontos_de_visita_sensibilidade.csv')
+INPUT_RESULTADOS_JSON = os.path.join(RESULTS_DIR, 'resultados_branch_and_bound_sensibilidade.json')
+OUTPUT_GEOM_JSON = os.path.join(RESULTS_DIR, 'geometrias_rotas_sensibilidade.json')
+
+
+if __name__ == "__main__":
+    executar_geometrias(INPUT_PONTOS_CSV, INPUT_RESULTADOS_JSON, OUTPUT_GEOM_JSON, descricao="_sensibilidade",
+                        caminho_eventos=caminho_eventos_argumentos(sys.argv),
+                        backend=backend_argumentos(sys.argv))
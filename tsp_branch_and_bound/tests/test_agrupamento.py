@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.agrupamento import particionar, projetar_coordenadas, dois_opt, custo_ciclo, resolver_por_agrupamento
+from app.branch_e_bound import branch_and_bound_tsp
+from app.heuristicas import vizinho_mais_proximo_heuristica
+from app.matriz_custos import calcular_matriz_haversine
+
+
+def coordenadas(n, semente):
+    rng = np.random.default_rng(semente)
+    return rng.uniform(-26.5, -22.5, size=n), rng.uniform(-54.5, -48.5, size=n)
+
+
+def test_particionar_respeita_tamanho_maximo():
+    latitudes, longitudes = coordenadas(300, 1)
+    grupos = particionar(projetar_coordenadas(latitudes, longitudes), tamanho_max_grupo=8)
+    assert max(len(grupo) for grupo in grupos) <= 8
+    assert sorted(np.concatenate(grupos).tolist()) == list(range(300))
+
+    # Pontos coincidentes também são divididos
+    grupos = particionar(np.zeros((20, 2)), tamanho_max_grupo=8)
+    assert max(len(grupo) for grupo in grupos) <= 8
+
+
+def test_dois_opt_chega_a_otimo_local_em_matriz_assimetrica():
+    rng = np.random.default_rng(7)
+    matriz = rng.uniform(10, 100, size=(12, 12))
+    np.fill_diagonal(matriz, np.inf)
+    rota_inicial = list(range(12))
+
+    rota = dois_opt(matriz, rota_inicial)
+    assert rota[0] == 0 and sorted(rota) == rota_inicial
+    custo = custo_ciclo(matriz, rota)
+    assert custo <= custo_ciclo(matriz, rota_inicial)
+    # Nenhuma inversão melhora a rota (o ganho vetorizado bate com o custo recalculado)
+    for i in range(1, 11):
+        for j in range(i + 1, 12):
+            vizinha = rota[:i] + rota[i:j + 1][::-1] + rota[j + 1:]
+            assert custo_ciclo(matriz, vizinha) >= custo - 1e-9
+
+
+def test_agrupamento_valido_e_melhor_que_vizinho_mais_proximo():
+    latitudes, longitudes = coordenadas(150, 3)
+    rota, custo, informacoes = resolver_por_agrupamento(latitudes, longitudes, deposito=5, num_processos=1)
+    assert rota[0] == 5 and sorted(rota) == list(range(150))
+    assert informacoes['maior_grupo'] <= 8
+
+    matriz = calcular_matriz_haversine(latitudes, longitudes)
+    np.fill_diagonal(matriz, np.inf)
+    assert np.isclose(custo, custo_ciclo(matriz, rota))
+    rota_vmp, _ = vizinho_mais_proximo_heuristica(pd.DataFrame(matriz))
+    assert custo < custo_ciclo(matriz, rota_vmp)
+
+    # Com um único grupo, a rota é a ótima do Branch and Bound
+    latitudes, longitudes = coordenadas(8, 4)
+    _, custo, informacoes = resolver_por_agrupamento(latitudes, longitudes, num_processos=1)
+    matriz = calcular_matriz_haversine(latitudes, longitudes)
+    np.fill_diagonal(matriz, np.inf)
+    assert informacoes['num_grupos'] == 1
+    assert np.isclose(custo, branch_and_bound_tsp(pd.DataFrame(matriz))[1])
@@ -8,7 +8,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
 
 # Agora podemos importar as classes e funções do seu aplicativo
-from app.branch_e_bound import No, calcular_lower_bound
+from app.branch_e_bound import No, calcular_lower_bound, branch_and_bound_tsp, EstatisticasBusca
 
 
 # Fixture: Dados de Teste
@@ -62,4 +62,211 @@ def test_bound_no_final(matriz_teste_simples_np):
 
     # Cálculo Manual do Bound (Verificação: 45.0)
     bound_calculado = calcular_lower_bound(matriz_teste_simples_np, no_final, n)
-    assert bound_calculado == 45.0
\ No newline at end of file
+    assert bound_calculado == 45.0
+
+
+def test_instrumentacao_nao_altera_resultado():
+    """
+    Testa que a instrumentação opcional preenche os contadores sem alterar a rota ótima.
+    """
+    matriz = pd.DataFrame([
+        [np.inf, 10, 15, 20],
+        [10, np.inf, 35, 25],
+        [15, 35, np.inf, 30],
+        [20, 25, 30, np.inf]
+    ])
+    rota, custo, nos_expandidos = branch_and_bound_tsp(matriz)
+
+    estatisticas = EstatisticasBusca()
+    rota_inst, custo_inst, nos_inst = branch_and_bound_tsp(matriz, estatisticas)
+
+    assert (rota_inst, custo_inst, nos_inst) == (rota, custo, nos_expandidos)
+    assert custo == 80
+    assert estatisticas.nos_expandidos == nos_expandidos
+    assert estatisticas.nos_gerados <= estatisticas.chamadas_bound
+    assert estatisticas.nos_podados == sum(estatisticas.podas_por_profundidade)
+    assert estatisticas.linha_tempo_incumbente[-1][2] == custo
+    assert (estatisticas.tempo_expansao_segundos + estatisticas.tempo_bound_segundos
+            <= estatisticas.tempo_total_segundos)
+
+
+@pytest.mark.parametrize("limitante", ['duas_menores', 'atribuicao'])
+def test_chamadas_bound_contadas_onde_acontecem(limitante, monkeypatch):
+    """
+    Testa que 'chamadas_bound' soma exatamente os bounds calculados: o da raiz, o de cada filho
+    devolvido pelos kernels (antes da dominância) e cada re-solução do problema de atribuição.
+    """
+    from app.kernels import Kernels
+    from app.limitante_atribuicao import LimitanteAtribuicao
+
+    chamadas = []
+
+    def espiar(classe, nome, quantas=lambda resultado, args: 1):
+        original = getattr(classe, nome)
+
+        def espiao(self, *args):
+            resultado = original(self, *args)
+            chamadas.append(quantas(resultado, args))
+            return resultado
+        monkeypatch.setattr(classe, nome, espiao)
+
+    def bounds_da_expansao(resultado, args):
+        rota, calcular_bounds = args[0], args[4]
+        # Com a atribuição, o kernel só calcula o bound das rotas completas
+        return resultado[0] if calcular_bounds or len(rota) + 1 == 9 else 0
+
+    espiar(Kernels, 'bound')
+    espiar(Kernels, 'expandir', bounds_da_expansao)
+    espiar(LimitanteAtribuicao, 'raiz')
+    espiar(LimitanteAtribuicao, 'filho')
+
+    rng = np.random.default_rng(11)
+    valores = rng.uniform(50, 600, size=(9, 9))
+    np.fill_diagonal(valores, np.inf)
+    estatisticas = EstatisticasBusca()
+    branch_and_bound_tsp(valores, estatisticas, limitante=limitante)
+
+    assert estatisticas.chamadas_bound == sum(chamadas)
+    if limitante == 'duas_menores':
+        # Filhos descartados pela dominância já tiveram o bound calculado nos kernels
+        assert estatisticas.chamadas_bound > estatisticas.nos_gerados
+
+
+@pytest.mark.parametrize("modo_matriz", ["float32", "int32"])
+@pytest.mark.parametrize("semente", [0, 1, 2])
+def test_matriz_compacta_encontra_mesma_rota(modo_matriz, semente):
+    """
+    Testa que os modos compactos da matriz (float32 e int32 em metros) encontram a mesma
+    rota e o mesmo custo (a menos do arredondamento) que a matriz float64.
+    """
+    rng = np.random.default_rng(semente)
+    valores = rng.uniform(50, 600, size=(8, 8)).round(3)  # km com 3 casas, como na matriz do ORS
+    np.fill_diagonal(valores, np.inf)
+    valores[2, 5] = np.inf  # aresta inexistente: vira a sentinela no modo int32
+    matriz = pd.DataFrame(valores)
+
+    rota, custo, _ = branch_and_bound_tsp(matriz)
+    rota_compacta, custo_compacto, _ = branch_and_bound_tsp(matriz, modo_matriz=modo_matriz)
+
+    assert rota_compacta == rota
+    assert custo_compacto == pytest.approx(custo, abs=1e-2)
+    assert isinstance(custo_compacto, float)
+
+
+def test_matriz_int32_ocupa_metade_da_memoria():
+    from app.matriz_compacta import compactar_matriz, SENTINELA_INT32
+
+    valores = np.array([[np.inf, 1.2346], [np.nan, np.inf]])
+    compacta, infinito, escala = compactar_matriz(valores, 'int32')
+    assert compacta.nbytes * 2 == valores.nbytes
+    assert compacta.tolist() == [[SENTINELA_INT32, 1235], [SENTINELA_INT32, SENTINELA_INT32]]
+    assert (infinito, escala) == (SENTINELA_INT32, 1000)
+
+
+@pytest.mark.parametrize("implementacao", ['python', 'numpy', 'jit'])
+def test_kernels_reproduzem_bound_original(implementacao, monkeypatch):
+    """
+    Testa que os kernels (Python puro, NumPy vetorizado e, se o numba estiver instalado, JIT)
+    calculam exatamente os mesmos bounds e encontram a mesma rota com os mesmos nós expandidos.
+    """
+    import app.kernels as kernels_modulo
+    from app.kernels import Kernels, NUMBA_DISPONIVEL
+    if implementacao == 'jit' and not NUMBA_DISPONIVEL:
+        pytest.skip("numba não instalado")
+
+    rng = np.random.default_rng(7)
+    valores = rng.uniform(50, 600, size=(8, 8))
+    np.fill_diagonal(valores, np.inf)
+    valores[3, 1] = np.inf
+    kernels = Kernels(valores, implementacao=implementacao)
+
+    for _ in range(50):
+        rota = [0] + [int(v) for v in rng.permutation(np.arange(1, 8))[:rng.integers(0, 8)]]
+        no = No(rota=rota, custo=float(rng.uniform(0, 500)), bound=0)
+        assert kernels.bound(no.rota, no.custo) == calcular_lower_bound(valores, no, 8)
+
+    matriz = pd.DataFrame(valores)
+    referencias = {modo: branch_and_bound_tsp(matriz, usar_jit=False, modo_matriz=modo)
+                   for modo in ('float64', 'int32')}
+    if implementacao == 'numpy':
+        # Sem o numba, o B&B usa os kernels vetorizados a partir de N_MIN_VETORIZADO cidades
+        monkeypatch.setattr(kernels_modulo, 'N_MIN_VETORIZADO', 0)
+    for modo, referencia in referencias.items():
+        assert branch_and_bound_tsp(matriz, usar_jit=implementacao == 'jit', modo_matriz=modo) == referencia
+    rota, custo, _ = referencias['float64']
+    assert kernels.custo_rota(rota) == custo
+
+
+def test_jit_apenas_em_buscas_longas(monkeypatch):
+    """
+    Testa que, sem 'usar_jit', uma busca curta não importa o numba e que a troca para os
+    kernels JIT no meio de uma busca longa não altera a rota, o custo nem os nós expandidos.
+    """
+    import subprocess
+    import app.branch_e_bound as branch_e_bound
+    from app.kernels import NUMBA_DISPONIVEL
+
+    codigo = ("import sys; import numpy as np; from app.branch_e_bound import branch_and_bound_tsp; "
+              "m = np.random.default_rng(0).uniform(1, 9, (8, 8)); np.fill_diagonal(m, np.inf); "
+              "branch_and_bound_tsp(m); print('numba' in sys.modules)")
+    raiz = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    saida = subprocess.run([sys.executable, '-c', codigo], cwd=raiz, capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == 'False'
+
+    if not NUMBA_DISPONIVEL:
+        pytest.skip("numba não instalado")
+    rng = np.random.default_rng(3)
+    valores = rng.uniform(50, 600, size=(9, 9))
+    np.fill_diagonal(valores, np.inf)
+    referencia = branch_and_bound_tsp(valores, usar_jit=False)
+    monkeypatch.setattr(branch_e_bound, 'NOS_MIN_JIT', 50)
+    assert referencia[2] > 50
+    assert branch_and_bound_tsp(valores) == referencia
+
+
+@pytest.mark.parametrize("simetrica", [True, False])
+def test_simetria_e_dominancia_preservam_otimo(simetrica):
+    """
+    Testa que a quebra de simetria e a poda por dominância mantêm o custo ótimo
+    (comparado à força bruta) e reduzem os nós expandidos.
+    """
+    import itertools
+
+    rng = np.random.default_rng(11)
+    pontos = rng.random((8, 2)) * 500
+    valores = np.sqrt(((pontos[:, None, :] - pontos[None, :, :]) ** 2).sum(axis=2))
+    if not simetrica:
+        valores = valores * rng.uniform(1.1, 1.5, size=(8, 8))
+    np.fill_diagonal(valores, np.inf)
+    matriz = pd.DataFrame(valores)
+
+    otimo = min(
+        sum(valores[a, b] for a, b in zip((0,) + perm, perm + (0,)))
+        for perm in itertools.permutations(range(1, 8))
+    )
+    # Mesmo limitante nas duas buscas: a diferença de nós vem só da simetria e da dominância
+    _, custo_sem_podas, nos_sem_podas = branch_and_bound_tsp(matriz, podar_dominancia=False,
+                                                             quebrar_simetria=False, limitante='duas_menores')
+    estatisticas = EstatisticasBusca()
+    rota, custo, nos_expandidos = branch_and_bound_tsp(matriz, estatisticas, limitante='duas_menores')
+
+    assert custo == pytest.approx(otimo) and custo_sem_podas == pytest.approx(otimo)
+    assert sorted(rota) == list(range(8))
+    if simetrica:
+        assert rota[1] < rota[-1]  # um único sentido de percurso
+    assert nos_expandidos * 5 < nos_sem_podas
+    assert estatisticas.nos_dominados > 0
+
+
+def test_tabela_dominancia_descarta_lru():
+    from app.branch_e_bound import TabelaDominancia
+
+    tabela = TabelaDominancia(tamanho_maximo=2)
+    assert tabela.registrar('a', 10) and tabela.registrar('b', 20)
+    assert not tabela.registrar('a', 10)  # dominado (custo igual); 'a' passa a ser o mais recente
+    assert tabela.registrar('a', 5)
+    assert tabela.superado('a', 10) and not tabela.superado('a', 5)
+
+    tabela.registrar('c', 30)  # excede o limite: sai 'b', o usado há mais tempo
+    assert len(tabela) == 2 and tabela.descartes == 1
+    assert 'b' not in tabela.melhores and tabela.registrar('b', 25)
@@ -0,0 +1,35 @@
+import numpy as np
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.analise_dados import simplificar_trajetoria, trajetos_da_rota, serie_histograma
+
+
+def test_simplificacao_mantem_extremos_e_respeita_tolerancia():
+    """
+    Testa que a simplificação (Douglas-Peucker) preserva início e fim, remove pontos
+    colineares e mantém os desvios maiores que a tolerância.
+    """
+    x = np.linspace(0, 1, 101)
+    reta = [(xi, 0.0) for xi in x]
+    assert simplificar_trajetoria(reta, 0.001) == [(0.0, 0.0), (1.0, 0.0)]
+
+    com_desvio = [(xi, 0.5 if i == 50 else 0.0) for i, xi in enumerate(x)]
+    simplificada = simplificar_trajetoria(com_desvio, 0.001)
+    assert simplificada[0] == (0.0, 0.0) and simplificada[-1] == (1.0, 0.0)
+    assert (0.5, 0.5) in simplificada
+
+
+def test_trajetos_da_rota_inclui_retorno():
+    geometrias = {"0-2": "a", "2-1": "b", "1-0": "c"}
+    assert trajetos_da_rota([0, 2, 1], geometrias) == ("a", "b", "c")
+    assert trajetos_da_rota([0, 1, 2], geometrias) == (None, None, None)
+
+
+def test_histograma_salvo_vira_serie_ordenada_pelo_centro_das_faixas():
+    serie = serie_histograma({"bordas": [0.0, 50.0, 100.0, 150.0], "contagens": [4, 0, 2]}, 'km')
+    assert list(serie.index) == [25.0, 75.0, 125.0] and list(serie) == [4, 0, 2]
+    assert serie.index.name == "Distância (km)"
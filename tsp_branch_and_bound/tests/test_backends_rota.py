@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.backends_rota as backends_rota
+from app.backends_rota import GrafoRodoviario, BackendLocal, BackendORSMatriz, codificar_polyline, NUMBA_DISPONIVEL
+from app.analise_dados import decode_polyline
+
+
+def grafo_quadrado():
+    # 0 - 1 - 2 pelo equador e um desvio 0 - 3 - 2 mais longo; o nó 4 fica isolado
+    latitudes = [0.0, 0.0, 0.0, 1.0, 5.0]
+    longitudes = [0.0, 1.0, 2.0, 1.0, 5.0]
+    return GrafoRodoviario.de_arestas(latitudes, longitudes, origens=[0, 1, 0, 3], destinos=[1, 2, 3, 2])
+
+
+def test_codificar_polyline_no_formato_do_dashboard():
+    pontos = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+    assert codificar_polyline(pontos) == '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    np.testing.assert_allclose(decode_polyline(codificar_polyline(pontos)), pontos)
+
+
+@pytest.mark.parametrize('usar_jit', [False, True] if NUMBA_DISPONIVEL else [False])
+def test_backend_local_caminhos_minimos_e_tracados(usar_jit):
+    grafo = grafo_quadrado()
+    backend = BackendLocal(grafo, usar_jit=usar_jit)
+    pontos = pd.DataFrame({'cidade': ['A', 'B', 'C', 'D'], 'latitude': [0.0, 0.0, 0.1, 5.0],
+                           'longitude': [0.0, 2.0, 1.0, 5.0]})
+
+    distancias, duracoes = backend.matriz(pontos)
+    trecho = grafo.distancias_km[grafo.inicio[0]]  # aresta 0 -> 1
+    assert distancias[0, 1] == pytest.approx(2 * trecho)
+    assert duracoes[0, 1] == pytest.approx(2 * trecho / backends_rota.VELOCIDADE_VIA_LONGA_KMH)
+    # 'C' fica a 0,1 grau do nó 1: o trecho de acesso entra nos dois sentidos
+    _, acesso_km, _ = backend.ligar([[1.0, 0.1]])
+    assert distancias[0, 2] == pytest.approx(trecho + acesso_km[0])
+    assert distancias[2, 0] == pytest.approx(distancias[0, 2])
+    # Nó isolado: pares sem rota ficam NaN, como as falhas da API
+    assert np.isnan(distancias[0, 3]) and np.isnan(duracoes[3, 1])
+    assert (np.diag(distancias) == 0).all()
+
+    caminho = decode_polyline(backend.geometria((0.0, 0.0), (2.0, 0.0)))
+    np.testing.assert_allclose(caminho, [[0, 0], [0, 0], [0, 1], [0, 2], [0, 2]])
+    assert backend.geometria((0.0, 0.0), (5.0, 5.0)) is None
+
+
+def test_backend_ors_matriz_monta_blocos(monkeypatch):
+    n = 5
+    pontos = pd.DataFrame({'cidade': [f"C{i}" for i in range(n)], 'latitude': [0.0] * n,
+                           'longitude': [float(i) for i in range(n)]})
+    pedidos = []
+
+    def post_falso(url, headers, json):
+        assert url == backends_rota.URL_ORS_MATRIX and len(json['locations']) <= 4
+        pedidos.append(json)
+        origens = [json['locations'][s][0] for s in json['sources']]
+        destinos = [json['locations'][d][0] for d in json['destinations']]
+        km = [[None if (o, d) == (0, 4) else 100.0 * abs(d - o) for d in destinos] for o in origens]
+        return RespostaMatriz(km, [[k and k * 36.0 for k in linha] for linha in km])
+
+    monkeypatch.setattr(backends_rota, 'BLOCO_MATRIZ_ORS', 2)
+    monkeypatch.setattr(backends_rota.requests, 'post', post_falso)
+    monkeypatch.setattr(backends_rota.time, 'sleep', lambda segundos: None)
+
+    distancias, duracoes = BackendORSMatriz('chave').matriz(pontos)
+    assert len(pedidos) == 9  # blocos de 2 x 2 origens/destinos
+    esperado = 100.0 * np.abs(np.subtract.outer(np.arange(n), np.arange(n)))
+    esperado[0, 4] = np.nan
+    np.testing.assert_allclose(distancias, esperado)
+    np.testing.assert_allclose(duracoes, esperado / 100.0)
+
+
+def test_backend_ors_directions_preenche_arrays_pre_alocados(monkeypatch):
+    n = 4
+    pontos = pd.DataFrame({'cidade': [f"C{i}" for i in range(n)], 'latitude': [0.0] * n,
+                           'longitude': [float(i) for i in range(n)]})
+
+    def post_falso(url, headers, json):
+        (lon_o, _), (lon_d, _) = json['coordinates']
+        if (lon_o, lon_d) == (1.0, 3.0):
+            return RespostaErro()
+        km = 100.0 * abs(lon_d - lon_o)
+        return RespostaDirections(km, km * 36.0)
+
+    monkeypatch.setattr(backends_rota.requests, 'post', post_falso)
+    monkeypatch.setattr(backends_rota.time, 'sleep', lambda segundos: None)
+
+    distancias, duracoes = backends_rota.BackendORSDirections('chave').matriz(pontos)
+    assert isinstance(distancias, np.ndarray) and distancias.dtype == float
+    esperado = 100.0 * np.abs(np.subtract.outer(np.arange(n), np.arange(n)))
+    esperado[1, 3] = np.nan  # par com falha fica sem rota nas duas camadas
+    np.testing.assert_allclose(distancias, esperado)
+    np.testing.assert_allclose(duracoes, esperado / 100.0)
+
+
+class RespostaMatriz:
+    status_code = 200
+
+    def __init__(self, distancias, duracoes):
+        self.dados = {'distances': distancias, 'durations': duracoes}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.dados
+
+
+class RespostaDirections(RespostaMatriz):
+
+    def __init__(self, distancia, duracao):
+        self.dados = {'routes': [{'summary': {'distance': distancia, 'duration': duracao}}]}
+
+
+class RespostaErro:
+    status_code = 500
+
+    def raise_for_status(self):
+        raise backends_rota.requests.exceptions.HTTPError("500 Server Error")
@@ -0,0 +1,138 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.cache_resultados import CacheResultados, chave_instancia, rota_para_indices
+from app.branch_e_bound import executar_branch_and_bound, configuracao_cache
+from app.simulacao import resolver_cenario
+
+
+def matriz_exemplo(n=6, semente=5):
+    rng = np.random.default_rng(semente)
+    valores = rng.uniform(10, 100, size=(n, n)).round(3)
+    np.fill_diagonal(valores, 0.0)
+    nomes = [f"CIDADE {i}" for i in range(n)]
+    return pd.DataFrame(valores, index=nomes, columns=nomes)
+
+
+def test_chave_independe_da_ordem_das_cidades():
+    matriz = matriz_exemplo()
+    configuracao = configuracao_cache()
+    chave = chave_instancia(matriz.columns, matriz.to_numpy(), configuracao)
+
+    ordem = [3, 0, 5, 1, 4, 2]
+    permutada = matriz.iloc[ordem, ordem]
+    assert chave_instancia(permutada.columns, permutada.to_numpy(), configuracao) == chave
+
+    alterada = matriz.to_numpy().copy()
+    alterada[1, 2] += 1.0
+    assert chave_instancia(matriz.columns, alterada, configuracao) != chave
+    assert chave_instancia(matriz.columns, matriz.to_numpy(), configuracao_cache('int32')) != chave
+    assert chave_instancia(["A", "A"], np.zeros((2, 2)), configuracao) is None
+
+
+def test_rota_para_indices_gira_para_o_inicio():
+    assert rota_para_indices(["B", "C", "A"], ["A", "B", "C"]) == [0, 1, 2]
+
+
+def test_remove_entradas_menos_usadas_por_tamanho(tmp_path):
+    caminho = str(tmp_path / 'resultados.json')
+    entrada = {"rota_cidades": ["X"] * 20}
+    tamanho = len(json.dumps(entrada))
+    cache = CacheResultados(caminho, tamanho_max_bytes=2 * tamanho)
+
+    cache.guardar('a', entrada)
+    cache.guardar('b', entrada)
+    assert cache.obter('a') == entrada  # 'a' passa a ser a mais recente
+    cache.guardar('c', entrada)
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.obter('b') is None
+
+    cache.salvar()
+    recarregado = CacheResultados(caminho)
+    estatisticas = recarregado.estatisticas()
+    assert len(recarregado) == 2
+    assert (estatisticas['acertos'], estatisticas['falhas'], estatisticas['remocoes']) == (1, 1, 1)
+    assert estatisticas['taxa_acerto'] == 0.5
+
+
+def test_processos_com_o_mesmo_arquivo_nao_perdem_entradas(tmp_path):
+    """Duas instâncias (ex: dashboard e CLI) abertas antes de qualquer gravação mesclam as entradas."""
+    caminho = str(tmp_path / 'resultados.json')
+    dashboard, cli = CacheResultados(caminho), CacheResultados(caminho)
+    dashboard.guardar('a', {"custo": 1})
+    cli.guardar('b', {"custo": 2})
+    assert cli.obter('z') is None
+
+    dashboard.salvar()
+    cli.salvar()
+    recarregado = CacheResultados(caminho)
+    assert recarregado.obter('a') == {"custo": 1} and recarregado.obter('b') == {"custo": 2}
+    assert recarregado.estatisticas()['gravacoes'] == 2 and recarregado.estatisticas()['falhas'] == 1
+    assert not os.path.exists(caminho + '.lock')
+
+
+def test_gravacoes_concorrentes_com_o_mesmo_arquivo(tmp_path):
+    caminho = str(tmp_path / 'resultados.json')
+
+    def gravar(indice):
+        cache = CacheResultados(caminho)
+        for j in range(10):
+            cache.guardar(f"{indice}-{j}", {"custo": j})
+            cache.salvar()
+
+    threads = [threading.Thread(target=gravar, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(CacheResultados(caminho)) == 40
+
+
+def test_limpar_descarta_as_entradas_gravadas_por_outros(tmp_path):
+    caminho = str(tmp_path / 'resultados.json')
+    cache = CacheResultados(caminho)
+    cache.guardar('a', {"custo": 1})
+    cache.salvar()
+
+    outro = CacheResultados(caminho)
+    outro.limpar()
+    outro.salvar()
+    assert len(CacheResultados(caminho)) == 0
+
+
+def test_simulacao_reaproveita_a_mesma_selecao_com_outro_deposito(tmp_path):
+    matriz = matriz_exemplo()
+    cache = CacheResultados(str(tmp_path / 'resultados.json'))
+    cidades = {"CIDADE 0", "CIDADE 2", "CIDADE 3", "CIDADE 5"}
+
+    original = resolver_cenario(matriz, cidades, "CIDADE 2", cache=cache)
+    repetido = resolver_cenario(matriz, cidades, "CIDADE 5", cache=cache)
+
+    assert 'do_cache' not in original and repetido['do_cache']
+    assert repetido['custo_total_km'] == original['custo_total_km']
+    assert repetido['rota_otima_indices'][0] == 5
+    assert set(repetido['rota_otima_indices']) == {0, 2, 3, 5}
+    assert cache.estatisticas()['acertos'] == 1
+
+
+def test_executar_branch_and_bound_usa_o_cache(tmp_path):
+    caminho_matriz = str(tmp_path / 'matriz.csv')
+    caminho_resultados = str(tmp_path / 'resultados.json')
+    caminho_cache = str(tmp_path / 'cache.json')
+    matriz_exemplo().to_csv(caminho_matriz)
+
+    primeiro = executar_branch_and_bound(caminho_matriz, caminho_resultados, caminho_cache=caminho_cache)
+    segundo = executar_branch_and_bound(caminho_matriz, caminho_resultados, caminho_cache=caminho_cache)
+
+    assert 'do_cache' not in primeiro and segundo['do_cache']
+    assert segundo['rota_otima_indices'] == primeiro['rota_otima_indices']
+    assert segundo['custo_total_km'] == primeiro['custo_total_km']
+    with open(caminho_resultados) as f:
+        assert json.load(f)['do_cache']
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.matriz_custos as matriz_custos
+import app.backends_rota as backends_rota
+from app.camadas_custo import MatrizCustos, ler_pesos_camadas, nome_perfil_horario, unidade_pesos
+from app.branch_e_bound import branch_and_bound_tsp, executar_branch_and_bound
+
+
+def matriz_duas_camadas():
+    rng = np.random.default_rng(5)
+    distancias = rng.uniform(50, 500, size=(6, 6))
+    duracoes = distancias / rng.uniform(40, 100, size=(6, 6))  # velocidades diferentes por trecho
+    return MatrizCustos(np.stack([distancias, duracoes]), ['distancia_km', 'duracao_h'],
+                        [f"C{i}" for i in range(6)])
+
+
+def test_trocar_objetivo_nao_copia_camadas(tmp_path):
+    matriz = matriz_duas_camadas()
+
+    distancia = matriz.combinar({'distancia_km': 1})
+    assert np.shares_memory(distancia.to_numpy(), matriz.camadas)
+    assert np.isinf(np.diag(distancia.to_numpy())).all()
+
+    combinada = matriz.combinar(ler_pesos_camadas('distancia_km:1,duracao_h:80'))
+    np.testing.assert_allclose(combinada.to_numpy()[0, 1],
+                               matriz.camadas[0, 0, 1] + 80 * matriz.camadas[1, 0, 1])
+
+    # Otimizar horas ou km usa a mesma matriz de camadas, sem nova consulta
+    _, custo_km, _ = branch_and_bound_tsp(distancia)
+    rota_h, custo_h, _ = branch_and_bound_tsp(matriz.camada('duracao_h'))
+    assert custo_km > custo_h > 0
+
+    matriz.adicionar_perfis_horarios({8: 1.5, 14: 1.0})
+    np.testing.assert_allclose(matriz.camada(nome_perfil_horario(8)).to_numpy(),
+                               1.5 * matriz.camada('duracao_h').to_numpy())
+
+    matriz.salvar(tmp_path / 'camadas.npz')
+    recarregada = MatrizCustos.carregar(tmp_path / 'camadas.npz')
+    assert recarregada.nomes_camadas == ['distancia_km', 'duracao_h', 'duracao_h_08', 'duracao_h_14']
+    assert branch_and_bound_tsp(recarregada.camada('duracao_h'))[0] == rota_h
+
+
+def test_resultados_guardam_a_unidade_dos_pesos(tmp_path):
+    assert unidade_pesos(None) == unidade_pesos({'distancia_km': 1}) == 'km'
+    assert unidade_pesos({'duracao_h': 1}) == unidade_pesos({nome_perfil_horario(8): 1}) == 'h'
+    assert unidade_pesos(ler_pesos_camadas('distancia_km:1,duracao_h:80')) == 'custo'
+
+    matriz = matriz_duas_camadas()
+    matriz.salvar(tmp_path / 'camadas.npz')
+    resultados = executar_branch_and_bound(None, str(tmp_path / 'resultados_branch_and_bound.json'),
+                                           pesos_camadas={'duracao_h': 1},
+                                           caminho_camadas=str(tmp_path / 'camadas.npz'))
+    # Horas não podem aparecer como km para o dashboard e a API
+    assert resultados['unidade'] == 'h' and 'custo_total_km' not in resultados
+    assert resultados['custo_total'] == branch_and_bound_tsp(matriz.camada('duracao_h'))[1]
+
+
+class RespostaFalsa:
+    status_code = 200
+
+    def __init__(self, distancia, duracao):
+        self.dados = {'routes': [{'summary': {'distance': distancia, 'duration': duracao}, 'geometry': 'abc'}]}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.dados
+
+
+def test_construir_matriz_custos_guarda_distancia_e_duracao(monkeypatch):
+    pontos = pd.DataFrame({'cidade': ['A', 'B', 'C'], 'latitude': [0.0, 1.0, 2.0], 'longitude': [0.0, 1.0, 2.0]})
+
+    def post_falso(url, headers, json):
+        assert json['geometry'] is False  # o traçado é buscado só para a rota escolhida
+        (lon_o, _), (lon_d, _) = json['coordinates']
+        km = 100.0 * abs(lon_d - lon_o)
+        return RespostaFalsa(km, km * 36.0)  # 100 km/h, duração em segundos
+
+    monkeypatch.setattr(backends_rota.requests, 'post', post_falso)
+    monkeypatch.setattr(backends_rota.time, 'sleep', lambda segundos: None)
+
+    matriz = matriz_custos.construir_matriz_custos(pontos, 'chave')
+    assert matriz.nomes_camadas == ['distancia_km', 'duracao_h']
+    assert matriz.camada('distancia_km').loc['A', 'C'] == 200.0
+    assert matriz.camada('duracao_h').loc['A', 'C'] == 2.0
+
+    csv = matriz_custos.matriz_para_csv(matriz.camada('distancia_km'))
+    assert csv.loc['B', 'B'] == 0.0 and csv.index.name == 'cidade'
@@ -0,0 +1,38 @@
+import json
+import os
+import sys
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.cenarios import descobrir_cenarios
+
+
+def gravar_resultados(diretorio, sufixo, custo):
+    with open(diretorio / f'resultados_branch_and_bound{sufixo}.json', 'w') as f:
+        json.dump({'custo_total_km': custo}, f)
+
+
+def test_descoberta_de_cenarios_original_primeiro(tmp_path):
+    gravar_resultados(tmp_path, '_sensibilidade', 2.0)
+    gravar_resultados(tmp_path, '', 1.0)
+    gravar_resultados(tmp_path, '_litoral', 3.0)
+
+    cenarios = descobrir_cenarios(str(tmp_path))
+    assert list(cenarios) == ['original', 'litoral', 'sensibilidade']
+    assert cenarios['litoral'].caminho('pontos').endswith('pontos_de_visita_litoral.csv')
+    assert not cenarios['litoral'].disponivel('pontos')
+
+
+def test_carregamento_sob_demanda_le_o_arquivo_atual(tmp_path):
+    gravar_resultados(tmp_path, '', 1.0)
+    cenario = descobrir_cenarios(str(tmp_path))['original']
+    assert cenario.carregar('resultados')['custo_total_km'] == 1.0
+
+    caminho = cenario.caminho('resultados')
+    mtime = os.stat(caminho).st_mtime_ns
+    gravar_resultados(tmp_path, '', 5.0)
+    os.utime(caminho, ns=(mtime + 10**9, mtime + 10**9))
+    assert cenario.carregar('resultados')['custo_total_km'] == 5.0
+    # A assinatura (chave do cache do dashboard) acompanha a regravação
+    assert cenario.assinatura('resultados') == (caminho, mtime + 10**9)
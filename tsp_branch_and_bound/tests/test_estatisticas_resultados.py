@@ -0,0 +1,62 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.estatisticas_resultados import calcular_estatisticas, caminho_estatisticas
+from app.branch_e_bound import executar_branch_and_bound
+from app.cenarios import descobrir_cenarios
+
+
+def matriz_exemplo(n=5, semente=3):
+    rng = np.random.default_rng(semente)
+    valores = rng.uniform(10, 100, size=(n, n)).round(2)
+    np.fill_diagonal(valores, 0.0)
+    valores[1, 3] = np.nan  # par sem rota
+    nomes = [f"CIDADE {i}" for i in range(n)]
+    return pd.DataFrame(valores, index=pd.Index(nomes, name='cidade'), columns=nomes)
+
+
+def test_resumo_e_histograma_equivalem_a_matriz_completa():
+    matriz = matriz_exemplo()
+    estatisticas = calcular_estatisticas(matriz.to_numpy(), list(matriz.columns), [0, 2, 4, 1, 3])
+
+    distancias = matriz.to_numpy().flatten()
+    distancias = distancias[np.isfinite(distancias) & (distancias > 0)]
+    esperado = pd.Series(distancias).describe()
+    for nome, valor in estatisticas['matriz']['resumo'].items():
+        assert valor == pytest.approx(esperado[nome])
+
+    histograma = estatisticas['matriz']['histograma']
+    assert sum(histograma['contagens']) == len(distancias)
+    assert histograma['bordas'][0] == distancias.min() and histograma['bordas'][-1] == distancias.max()
+
+
+def test_trechos_incluem_o_retorno_ao_inicio():
+    matriz = matriz_exemplo()
+    rota = [0, 2, 4, 3, 1]
+    trechos = calcular_estatisticas(matriz.to_numpy(), list(matriz.columns), rota)['rota']['trechos']
+
+    assert [(t['origem'], t['destino']) for t in trechos][-1] == ("CIDADE 1", "CIDADE 0")
+    assert [t['custo'] for t in trechos] == [matriz.iloc[i, j] for i, j in zip(rota, rota[1:] + rota[:1])]
+
+
+def test_estatisticas_salvas_ao_lado_dos_resultados(tmp_path):
+    matriz_exemplo().to_csv(tmp_path / 'matriz_distancias_litoral.csv')
+    caminho_resultados = str(tmp_path / 'resultados_branch_and_bound_litoral.json')
+    resultados = executar_branch_and_bound(str(tmp_path / 'matriz_distancias_litoral.csv'), caminho_resultados)
+
+    cenario = descobrir_cenarios(str(tmp_path))['litoral']
+    assert cenario.caminho('estatisticas') == caminho_estatisticas(caminho_resultados)
+    estatisticas = cenario.carregar('estatisticas')
+    assert estatisticas['unidade'] == 'km'
+    custos = [trecho['custo'] for trecho in estatisticas['rota']['trechos']]
+    assert sum(custos) == pytest.approx(resultados['custo_total_km'])
+    # O arquivo é pequeno: resumo, histograma e um registro por trecho
+    with open(cenario.caminho('estatisticas')) as f:
+        assert len(json.load(f)['matriz']['histograma']['contagens']) == 30
@@ -0,0 +1,87 @@
+import numpy as np
+import time
+import pandas as pd
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.branch_e_bound as branch_e_bound
+from app.eventos import (RegistroEventos, ler_eventos, resumir_eventos, caminho_eventos_argumentos, EVENTOS_JSONL,
+                         PAR_OBTIDO, ESPERA_LIMITE, PROGRESSO_BUSCA, INCUMBENTE)
+
+
+def test_resumo_calcula_vazao_e_eta(tmp_path):
+    caminho = tmp_path / 'eventos.jsonl'
+    with RegistroEventos(caminho) as registro:
+        with registro.etapa('matriz_custos', cidades=5):
+            for concluidos in range(1, 11):
+                registro.emitir(PAR_OBTIDO, origem=0, destino=1, concluidos=concluidos, total_pares=20,
+                                distancia_km=np.float64(1.5))
+            registro.emitir(ESPERA_LIMITE, segundos=60)
+
+    eventos = ler_eventos(caminho)
+    assert len(eventos) == 13
+    # Reescreve os instantes: um par por segundo
+    pares = [evento for evento in eventos if evento['tipo'] == PAR_OBTIDO]
+    for segundo, evento in enumerate(pares):
+        evento['ts'] = 1000.0 + segundo
+
+    resumo = resumir_eventos(eventos)
+    assert resumo['por_tipo'][PAR_OBTIDO] == 10
+    assert resumo['matriz']['pares_por_segundo'] == 1.0
+    assert resumo['matriz']['eta_segundos'] == 10.0
+    assert resumo['matriz']['tempo_em_espera_segundos'] == 60
+    assert resumo['etapas']['matriz_custos'] >= 0
+
+    assert caminho_eventos_argumentos(['app.py', '--eventos']) == EVENTOS_JSONL
+    assert caminho_eventos_argumentos(['app.py', '--eventos=x.jsonl']) == 'x.jsonl'
+    assert caminho_eventos_argumentos(['app.py']) is None
+
+
+def test_busca_emite_progresso_e_incumbentes(tmp_path, monkeypatch):
+    rng = np.random.default_rng(3)
+    pontos = rng.uniform(0, 100, size=(9, 2))
+    matriz = np.linalg.norm(pontos[:, None] - pontos[None], axis=2)
+    np.fill_diagonal(matriz, np.inf)
+    matriz_df = pd.DataFrame(matriz)
+    monkeypatch.setattr(branch_e_bound, 'INTERVALO_EVENTOS_BUSCA', 10)
+
+    caminho = tmp_path / 'eventos.jsonl'
+    with RegistroEventos(caminho) as registro:
+        rota, custo, nos_expandidos = branch_e_bound.branch_and_bound_tsp(matriz_df, registro=registro)
+    assert (rota, custo) == branch_e_bound.branch_and_bound_tsp(matriz_df)[:2]
+
+    eventos = ler_eventos(caminho)
+    incumbentes = [evento['custo'] for evento in eventos if evento['tipo'] == INCUMBENTE]
+    assert incumbentes and incumbentes[-1] == custo
+    assert incumbentes == sorted(incumbentes, reverse=True)
+    progresso = [evento for evento in eventos if evento['tipo'] == PROGRESSO_BUSCA]
+    assert len(progresso) == nos_expandidos // 10
+    assert resumir_eventos(eventos)['busca']['nos_expandidos'] == progresso[-1]['nos_expandidos']
+
+
+def test_evento_nao_serializavel_nao_interrompe_a_gravacao(tmp_path):
+    caminho = tmp_path / 'eventos.jsonl'
+    with RegistroEventos(caminho) as registro:
+        registro.emitir(PAR_OBTIDO, concluidos=1)
+        registro.emitir(PAR_OBTIDO, concluidos=2, resposta=object())
+        registro.emitir(PAR_OBTIDO, concluidos=3, distancias=np.zeros(3))  # .item() falha em arrays
+        registro.emitir(PAR_OBTIDO, concluidos=4)
+
+    assert [evento['concluidos'] for evento in ler_eventos(caminho)] == [1, 4]
+    assert registro.eventos_descartados == 2
+
+
+def test_descarga_periodica_com_eventos_sem_pausa(tmp_path):
+    caminho = tmp_path / 'eventos.jsonl'
+    with RegistroEventos(caminho, intervalo_descarga=0.05) as registro:
+        # Eventos chegando sem pausa, bem abaixo do tamanho do buffer: sem a descarga pelo
+        # relógio, nada chegaria ao disco antes do fechamento
+        limite = time.monotonic() + 0.5
+        while time.monotonic() < limite:
+            registro.emitir(PAR_OBTIDO, concluidos=1)
+            time.sleep(0.002)
+        gravados_antes_de_fechar = len(ler_eventos(caminho))
+    assert gravados_antes_de_fechar > 0
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.backends_rota as backends_rota
+import app.geometrias as geometrias
+from app.backends_rota import BackendORSDirections
+from app.geometrias import CacheGeometrias, geometrias_das_rotas
+
+
+class RespostaGeometria:
+    status_code = 200
+
+    def __init__(self, geometria):
+        self.geometria = geometria
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'routes': [{'summary': {'distance': 1.0}, 'geometry': self.geometria}]}
+
+
+def test_busca_apenas_trechos_da_rota_e_reaproveita_cache(tmp_path, monkeypatch):
+    pontos = pd.DataFrame({'cidade': list('ABCDEF'), 'latitude': [float(i) for i in range(6)],
+                           'longitude': [float(-i) for i in range(6)]})
+    pedidos = []
+
+    def post_falso(url, headers, json):
+        pedidos.append(json['coordinates'])
+        (lon_o, _), (lon_d, _) = json['coordinates']
+        return RespostaGeometria(f"geo{lon_o:.0f}{lon_d:.0f}")
+
+    monkeypatch.setattr(backends_rota.requests, 'post', post_falso)
+    monkeypatch.setattr(backends_rota.time, 'sleep', lambda segundos: None)
+
+    cache = CacheGeometrias(str(tmp_path / 'cache' / 'geometrias.json'))
+    rota = [0, 2, 4, 1, 5, 3]
+    resultado = geometrias_das_rotas(pontos, [rota], BackendORSDirections('chave'), cache)
+    # 6 trechos (com o retorno ao início) em vez dos 30 pares da matriz
+    assert len(pedidos) == 6
+    assert sorted(resultado) == sorted(['0-2', '2-4', '4-1', '1-5', '5-3', '3-0'])
+    assert resultado['3-0'] == 'geo-30'
+    cache.salvar()
+
+    # Outro cenário (subconjunto das cidades, índices diferentes) usa o cache salvo em disco
+    sub = pontos.iloc[[2, 4, 1]].reset_index(drop=True)
+    resultado = geometrias_das_rotas(sub, [[0, 1, 2]], BackendORSDirections('chave'), CacheGeometrias(cache.caminho))
+    assert len(pedidos) == 6 + 1  # apenas o trecho 1 -> 2 (B -> C) é novo
+    assert resultado['0-1'] == 'geo-2-4'
+
+
+def test_salvar_interrompido_preserva_o_cache_anterior(tmp_path, monkeypatch):
+    caminho = str(tmp_path / 'geometrias.json')
+    cache = CacheGeometrias(caminho)
+    cache.guardar('a', 'geo-a')
+    cache.salvar()
+
+    def dump_interrompido(dados, f):
+        f.write('{"a": "ge')
+        raise KeyboardInterrupt
+
+    cache.guardar('b', 'geo-b')
+    monkeypatch.setattr(geometrias.json, 'dump', dump_interrompido)
+    with pytest.raises(KeyboardInterrupt):
+        cache.salvar()
+    monkeypatch.undo()
+    assert CacheGeometrias(caminho).geometrias == {'a': 'geo-a'}
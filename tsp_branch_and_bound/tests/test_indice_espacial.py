@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.indice_espacial import IndiceEspacial, distancias_haversine, selecionar_pontos
+from app.pipeline_dados import ler_cidades_csv
+
+CSV_CIDADES = os.path.join(os.path.dirname(__file__), '..', 'data', 'brazilian_cities.csv')
+
+
+@pytest.fixture(scope='module')
+def cidades():
+    return ler_cidades_csv(CSV_CIDADES)
+
+
+@pytest.fixture(scope='module')
+def indice(cidades):
+    return IndiceEspacial.de_dataframe(cidades)
+
+
+def test_consultas_equivalem_a_forca_bruta(cidades, indice):
+    """Raio, retângulo e k-vizinhos do índice batem com a busca exaustiva."""
+    lat, lon = -25.4296, -49.2713  # Curitiba
+    distancias = distancias_haversine(lat, lon, cidades['latitude'], cidades['longitude'])
+
+    indices_raio, _ = indice.consulta_raio(lat, lon, 150)
+    assert set(indices_raio) == set(np.flatnonzero(distancias <= 150))
+
+    indices_k, distancias_k = indice.k_mais_proximos(lat, lon, 12)
+    assert list(indices_k) == list(np.argsort(distancias, kind='stable')[:12])
+    assert np.all(np.diff(distancias_k) >= 0)
+
+    retangulo = (-26.0, -24.0, -51.0, -48.5)
+    esperado = np.flatnonzero((cidades['latitude'] >= -26.0) & (cidades['latitude'] <= -24.0) &
+                              (cidades['longitude'] >= -51.0) & (cidades['longitude'] <= -48.5))
+    assert list(indice.consulta_retangulo(*retangulo)) == list(esperado)
+
+
+def test_selecao_combina_filtros_com_deposito_primeiro(cidades, indice):
+    pontos = selecionar_pontos(cidades, indice, deposito='Curitiba', raio_km=100, populacao_minima=50000, k=5)
+
+    assert pontos['cidade'].iloc[0] == 'CURITIBA'
+    assert len(pontos) == 6
+    assert (pontos['populacao'].iloc[1:] >= 50000).all()
+    distancias = distancias_haversine(pontos['latitude'].iloc[0], pontos['longitude'].iloc[0],
+                                      pontos['latitude'].iloc[1:], pontos['longitude'].iloc[1:])
+    assert (distancias <= 100).all()
+
+
+def test_deposito_inexistente(cidades, indice):
+    with pytest.raises(ValueError):
+        selecionar_pontos(cidades, indice, deposito='CIDADE QUE NAO EXISTE', k=3)
+
+
+def test_deposito_com_nome_repetido_entre_estados(cidades, indice):
+    # ALTO ALEGRE existe no RS, em RR e em SP
+    with pytest.raises(ValueError, match="mais de um estado"):
+        selecionar_pontos(cidades, indice, deposito='Alto Alegre', k=3)
+
+    pontos = selecionar_pontos(cidades, indice, deposito='Alto Alegre', estado_deposito='Roraima', k=3)
+    assert tuple(pontos[['cidade', 'estado']].iloc[0]) == ('ALTO ALEGRE', 'RORAIMA')
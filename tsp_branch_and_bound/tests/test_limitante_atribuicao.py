@@ -0,0 +1,115 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.limitante_atribuicao import LimitanteAtribuicao, resolver_atribuicao
+from app.branch_e_bound import branch_and_bound_tsp, escolher_limitante, EstatisticasBusca
+from app.kernels import Kernels
+
+
+def matriz_assimetrica(n, semente, proibidas=0.0):
+    rng = np.random.default_rng(semente)
+    pontos = rng.random((n, 2)) * 500
+    valores = np.sqrt(((pontos[:, None, :] - pontos[None, :, :]) ** 2).sum(axis=2))
+    valores = valores * rng.uniform(1.1, 1.5, size=(n, n))
+    valores[rng.random((n, n)) < proibidas] = np.inf
+    np.fill_diagonal(valores, np.inf)
+    return valores
+
+
+def matriz_fortemente_assimetrica(n, semente):
+    """Custos inteiros sorteados para cada sentido: i -> j e j -> i sem relação nenhuma."""
+    valores = np.random.default_rng(semente).integers(1, 100, size=(n, n)).astype(float)
+    np.fill_diagonal(valores, np.inf)
+    return valores
+
+
+def custo_tsp_forca_bruta(matriz):
+    n = len(matriz)
+    return min(sum(matriz[a, b] for a, b in zip(rota, rota[1:] + rota[:1]))
+               for rota in ([0, *resto] for resto in itertools.permutations(range(1, n))))
+
+
+def atribuicao_forca_bruta(custos):
+    n = len(custos)
+    return min(custos[np.arange(n), list(perm)].sum() for perm in itertools.permutations(range(n)))
+
+
+def atribuicao_do_no(matriz, rota):
+    """AP do nó montado do zero: linhas {fim} ∪ U, colunas U ∪ {início}, sem fechar o ciclo cedo."""
+    nao_visitadas = [v for v in range(len(matriz)) if v not in rota]
+    custos = matriz[np.ix_([rota[-1]] + nao_visitadas, nao_visitadas + [rota[0]])].copy()
+    custos[0, -1] = np.inf
+    return atribuicao_forca_bruta(custos)
+
+
+@pytest.mark.parametrize('semente', range(4))
+def test_atribuicao_igual_a_forca_bruta(semente):
+    matriz = matriz_assimetrica(7, semente, proibidas=0.2 * (semente % 2))
+    linha_para_coluna, valor = resolver_atribuicao(matriz)
+    assert valor == pytest.approx(atribuicao_forca_bruta(matriz))
+    assert sorted(linha_para_coluna) == list(range(7))
+
+
+def test_filhos_reaproveitam_a_atribuicao_do_pai():
+    matriz = matriz_assimetrica(7, 3, proibidas=0.15)
+    limitante = LimitanteAtribuicao(matriz)
+    pendentes = [([0], *limitante.raiz())]
+    while pendentes:
+        rota, estado, valor = pendentes.pop()
+        esperado = atribuicao_do_no(matriz, rota)
+        assert valor == pytest.approx(esperado) or valor == esperado == np.inf
+        if estado is None or len(rota) + 1 == len(matriz):
+            continue
+        for proximo in set(range(len(matriz))) - set(rota):
+            pendentes.append((rota + [proximo], *limitante.filho(estado, rota, proximo)))
+
+
+@pytest.mark.parametrize('modo_matriz', ['float64', 'float32', 'int32'])
+@pytest.mark.parametrize('semente', range(6))
+def test_limitante_atribuicao_igual_a_forca_bruta(modo_matriz, semente):
+    # O limitante das duas menores arestas não é válido nessas matrizes: o de atribuição não
+    # pode depender dele
+    matriz = matriz_fortemente_assimetrica(7 + semente % 2, semente)
+    estatisticas = EstatisticasBusca()
+    rota, custo, nos = branch_and_bound_tsp(pd.DataFrame(matriz), estatisticas, modo_matriz, limitante='atribuicao')
+
+    assert custo == pytest.approx(custo_tsp_forca_bruta(matriz)) and sorted(rota) == list(range(len(matriz)))
+    assert estatisticas.nos_expandidos == nos
+
+
+def test_limitante_atribuicao_poda_mais():
+    matriz = pd.DataFrame(matriz_assimetrica(9, 7))
+    _, custo_ref, nos_ref = branch_and_bound_tsp(matriz, limitante='duas_menores')
+    _, custo, nos = branch_and_bound_tsp(matriz, limitante='atribuicao')
+    assert custo == pytest.approx(custo_ref) and nos < nos_ref
+
+
+@pytest.mark.parametrize('semente', range(10))
+def test_padrao_usa_atribuicao_em_matrizes_assimetricas(semente, monkeypatch):
+    matriz = matriz_fortemente_assimetrica(7, semente)
+    simetrica = np.minimum(matriz, matriz.T)
+    assert escolher_limitante(matriz) == 'atribuicao' and escolher_limitante(simetrica) == 'duas_menores'
+    assert escolher_limitante(matriz, 'duas_menores') == 'duas_menores'
+
+    # Nesse modo, o kernel só calcula o bound das rotas completas: o das duas menores arestas seria descartado
+    expandir = Kernels.expandir
+
+    def expandir_conferindo(self, rota, custo, custo_otimo, simetrica=False, calcular_bounds=True):
+        assert calcular_bounds == (len(rota) + 1 == len(matriz))
+        return expandir(self, rota, custo, custo_otimo, simetrica, calcular_bounds)
+
+    monkeypatch.setattr(Kernels, 'expandir', expandir_conferindo)
+    _, custo, _ = branch_and_bound_tsp(matriz)
+    assert custo == pytest.approx(custo_tsp_forca_bruta(matriz))
+
+
+def test_limitante_invalido():
+    with pytest.raises(ValueError):
+        branch_and_bound_tsp(matriz_assimetrica(4, 0), limitante='lagrangiano')
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.servico_api as servico_api
+from app.memoria_compartilhada import MatrizCompartilhada, inicializar_trabalhador, matriz_trabalhador
+from app.branch_e_bound import branch_and_bound_tsp
+
+
+def matriz_aleatoria(n, semente):
+    rng = np.random.default_rng(semente)
+    matriz = rng.uniform(10, 100, size=(n, n))
+    matriz[rng.random((n, n)) < 0.2] = np.inf  # arestas inexistentes
+    np.fill_diagonal(matriz, np.inf)
+    return matriz
+
+
+def _somar_matriz_do_trabalhador(linha):
+    compartilhada = matriz_trabalhador()
+    return float(compartilhada.matriz[linha][np.isfinite(compartilhada.matriz[linha])].sum())
+
+
+def test_trabalhadores_leem_matriz_sem_copia():
+    matriz = matriz_aleatoria(9, 1)
+    with MatrizCompartilhada.criar(matriz) as compartilhada:
+        np.testing.assert_array_equal(compartilhada.matriz, matriz)
+
+        anexada = MatrizCompartilhada.anexar(compartilhada.descritor)
+        compartilhada.matriz[0, 1] = 1.0
+        assert anexada.matriz[0, 1] == 1.0  # mesma memória
+        anexada.fechar()
+        compartilhada.matriz[0, 1] = matriz[0, 1]
+
+        with ProcessPoolExecutor(max_workers=2, initializer=inicializar_trabalhador,
+                                 initargs=(compartilhada.descritor,)) as pool:
+            somas = list(pool.map(_somar_matriz_do_trabalhador, range(9)))
+        for linha, soma in enumerate(somas):
+            assert np.isclose(soma, matriz[linha][np.isfinite(matriz[linha])].sum())
+
+        resultado = branch_and_bound_tsp(pd.DataFrame(compartilhada.matriz, copy=False))
+        assert resultado == branch_and_bound_tsp(pd.DataFrame(matriz))
+
+
+def test_api_usa_memoria_compartilhada_para_matrizes_grandes(monkeypatch):
+    monkeypatch.setattr(servico_api, 'LIMITE_BYTES_COMPARTILHAR', 0)
+    matriz = np.round(matriz_aleatoria(8, 2), 3)
+    matriz[np.isinf(matriz)] = 500.0
+    servico = servico_api.ServicoResolucao(num_trabalhadores=1)
+    try:
+        status, corpo = servico.resolver({"matriz": matriz.tolist(), "metodo": "exato"})
+    finally:
+        servico.encerrar()
+    assert status == 200
+    np.fill_diagonal(matriz, np.inf)
+    assert np.isclose(corpo["custo"], branch_and_bound_tsp(pd.DataFrame(matriz))[1])
@@ -0,0 +1,148 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.orientacao import (branch_and_bound_orientacao, insercao_gulosa, LimitantesOrientacao,
+                            premios_populacao)
+from app.branch_e_bound import EstatisticasBusca, carregar_matriz_distancias
+
+MATRIZ_PARANA = os.path.join(os.path.dirname(__file__), '..', 'results', 'matriz_distancias.csv')
+
+
+def instancia(n, semente, simetrica=True):
+    rng = np.random.default_rng(semente)
+    pontos = rng.random((n, 2)) * 500.0
+    distancias = np.sqrt(((pontos[:, None, :] - pontos[None, :, :]) ** 2).sum(axis=2))
+    if not simetrica:
+        distancias = distancias * rng.uniform(1.1, 1.5, size=(n, n))
+    np.fill_diagonal(distancias, np.inf)
+    premios = rng.lognormal(9.0, 1.2, size=n).round()
+    premios[0] = 0.0
+    return distancias, premios
+
+
+def premio_forca_bruta(matriz, premios, orcamento):
+    n = len(matriz)
+    melhor = 0.0
+    for tamanho in range(1, n):
+        for cidades in itertools.combinations(range(1, n), tamanho):
+            if premios[list(cidades)].sum() <= melhor:
+                continue
+            for ordem in itertools.permutations(cidades):
+                rota = (0,) + ordem
+                if sum(matriz[a, b] for a, b in zip(rota, rota[1:] + (0,))) <= orcamento:
+                    melhor = premios[list(cidades)].sum()
+                    break
+    return melhor
+
+
+def premio_held_karp(matriz, premios, orcamento):
+    """Ótimo exato pela programação dinâmica sobre subconjuntos (para matrizes de 10 cidades)."""
+    n = len(matriz)
+    custo = np.full((1 << (n - 1), n), np.inf)
+    for j in range(1, n):
+        custo[1 << (j - 1), j] = matriz[0, j]
+    melhor = 0.0
+    for mascara in range(1, 1 << (n - 1)):
+        ultimas = custo[mascara]
+        if (ultimas + matriz[:, 0]).min() <= orcamento:
+            melhor = max(melhor, sum(premios[j] for j in range(1, n) if mascara >> (j - 1) & 1))
+        for k in range(1, n):
+            bit = 1 << (k - 1)
+            if not mascara & bit:
+                custo[mascara | bit, k] = min(custo[mascara | bit, k], (ultimas + matriz[:, k]).min())
+    return melhor
+
+
+def custo_rota(matriz, rota):
+    if len(rota) == 1:
+        return 0.0
+    return sum(matriz[a, b] for a, b in zip(rota, rota[1:] + [rota[0]]))
+
+
+@pytest.mark.parametrize('semente', range(6))
+def test_orientacao_igual_a_forca_bruta(semente):
+    matriz, premios = instancia(7, semente, simetrica=semente % 2 == 0)
+    orcamento = 400.0 + 200.0 * semente
+    rota, premio, custo, _ = branch_and_bound_orientacao(matriz, premios, orcamento)
+
+    assert premio == pytest.approx(premio_forca_bruta(matriz, premios, orcamento))
+    assert rota[0] == 0 and len(set(rota)) == len(rota)
+    assert custo == pytest.approx(custo_rota(matriz, rota)) and custo <= orcamento + 1e-6
+    assert premio == pytest.approx(premios[rota].sum())
+
+
+def instancia_nao_metrica(n, semente):
+    """Distâncias sorteadas sem relação entre si: muitos desvios por uma terceira cidade são mais curtos."""
+    rng = np.random.default_rng(semente)
+    distancias = rng.uniform(10.0, 300.0, size=(n, n))
+    np.fill_diagonal(distancias, np.inf)
+    premios = rng.lognormal(9.0, 1.2, size=n).round()
+    premios[0] = 0.0
+    return distancias, premios, float(rng.uniform(200.0, 900.0))
+
+
+@pytest.mark.parametrize('semente', range(30))
+def test_orientacao_sem_desigualdade_triangular(semente):
+    matriz, premios, orcamento = instancia_nao_metrica(7, semente)
+    rota, premio, custo, _ = branch_and_bound_orientacao(matriz, premios, orcamento)
+
+    assert premio == pytest.approx(premio_forca_bruta(matriz, premios, orcamento))
+    assert custo == pytest.approx(custo_rota(matriz, rota)) and custo <= orcamento + 1e-6
+
+
+@pytest.mark.parametrize('orcamento', [600.0, 831.75, 1200.0])
+def test_orientacao_na_matriz_do_parana(orcamento):
+    # A matriz do ORS viola a desigualdade triangular em vários pares
+    matriz = carregar_matriz_distancias(MATRIZ_PARANA).to_numpy(dtype=float, copy=True)
+    premios = np.random.default_rng(0).lognormal(9.0, 1.2, size=len(matriz)).round()
+    premios[0] = 0.0
+    _, premio, custo, _ = branch_and_bound_orientacao(matriz, premios, orcamento)
+
+    matriz[np.isnan(matriz)] = np.inf
+    assert premio == pytest.approx(premio_held_karp(matriz, premios, orcamento)) and custo <= orcamento + 1e-6
+
+
+def test_limitante_da_raiz_cobre_o_otimo():
+    matriz, premios = instancia(8, 11)
+    orcamento = 900.0
+    limitantes = LimitantesOrientacao(matriz, premios, orcamento)
+    candidatas = limitantes.alcancaveis(0, 0.0, np.arange(8) > 0)
+    raiz = limitantes.superiores(np.array([0]), np.array([0.0]), np.array([0.0]), candidatas)[0]
+    assert raiz >= premio_forca_bruta(matriz, premios, orcamento) - 1e-6
+
+
+def test_orcamento_sem_cidades_alcancaveis():
+    matriz, premios = instancia(6, 2)
+    rota, premio, custo, _ = branch_and_bound_orientacao(matriz, premios, 1.0)
+    assert (rota, premio, custo) == ([0], 0.0, 0.0)
+
+
+@pytest.mark.parametrize('n', [30, 50])
+def test_orientacao_escala_para_dezenas_de_candidatas(n):
+    matriz, premios = instancia(n, 42)
+    orcamento = 600.0
+    estatisticas = EstatisticasBusca()
+    rota, premio, custo, nos_expandidos = branch_and_bound_orientacao(matriz, premios, orcamento, estatisticas)
+
+    _, premio_guloso, _ = insercao_gulosa(matriz, premios, orcamento)
+    assert premio >= premio_guloso
+    assert len(set(rota)) == len(rota) > 1
+    assert custo == pytest.approx(custo_rota(matriz, rota)) and custo <= orcamento + 1e-6
+    assert estatisticas.nos_expandidos == nos_expandidos
+    assert estatisticas.nos_gerados < 100_000
+
+
+def test_premios_populacao_pela_tabela_de_cidades():
+    pontos = pd.DataFrame({'cidade': ['Curitiba', 'MARINGÁ', 'INEXISTENTE'],
+                           'estado': ['PARANÁ', 'PARANÁ', 'PARANÁ']})
+    cidades = pd.DataFrame({'cidade': ['CURITIBA', 'MARINGÁ', 'MARINGÁ'],
+                            'estado': ['PARANÁ', 'PARANÁ', 'SÃO PAULO'],
+                            'populacao': [1_773_733.0, 409_657.0, 1.0]})
+    np.testing.assert_array_equal(premios_populacao(pontos, cidades), [1_773_733.0, 409_657.0, 0.0])
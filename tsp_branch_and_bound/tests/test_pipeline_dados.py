@@ -0,0 +1,82 @@
+import shutil
+import pandas as pd
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.pipeline_dados import carregar_cidades, ler_cidades_csv
+
+CSV_CIDADES = os.path.join(os.path.dirname(__file__), '..', 'data', 'brazilian_cities.csv')
+
+
+@pytest.fixture
+def csv_temporario(tmp_path):
+    """Cópia do dataset em um diretório temporário (o cache é gravado ao lado)."""
+    caminho = tmp_path / 'brazilian_cities.csv'
+    shutil.copy(CSV_CIDADES, caminho)
+    return caminho
+
+
+def test_leitura_tipada_equivale_a_leitura_completa():
+    """A leitura com usecols/dtypes seleciona as mesmas cidades do Paraná que a leitura completa."""
+    df = pd.read_csv(CSV_CIDADES)
+    esperado = df[df['state'].str.upper() == 'PARANÁ']['city'].str.upper().drop_duplicates().tolist()
+
+    cidades = ler_cidades_csv(CSV_CIDADES, estado='PARANÁ')
+    assert cidades['cidade'].tolist() == esperado
+    assert cidades['latitude'].dtype == 'float64'
+    assert isinstance(cidades['estado'].dtype, pd.CategoricalDtype)
+
+
+def test_coordenadas_exportadas_sem_perda(tmp_path):
+    """As coordenadas gravadas em 'pontos_de_visita.csv' são as mesmas do CSV original (7 casas decimais)."""
+    original = pd.read_csv(CSV_CIDADES)
+    original = original[original['state'].str.upper() == 'PARANÁ'].assign(cidade=original['city'].str.upper())
+    original = original.drop_duplicates('cidade').set_index('cidade')
+    ler_cidades_csv(CSV_CIDADES, estado='PARANÁ').to_csv(tmp_path / 'pontos.csv', index=False)
+
+    relidas = pd.read_csv(tmp_path / 'pontos.csv').set_index('cidade')
+    assert relidas['latitude'].tolist() == original.loc[relidas.index, 'osm_latitude'].tolist()
+    assert relidas['longitude'].tolist() == original.loc[relidas.index, 'osm_longitude'].tolist()
+
+
+def test_cache_reutilizado_e_invalidado(csv_temporario, tmp_path):
+    caminho_cache = tmp_path / 'cache' / 'cidades.npz'
+
+    original = carregar_cidades(csv_temporario, caminho_cache=caminho_cache)
+    assert caminho_cache.exists()
+    mtime_cache = caminho_cache.stat().st_mtime_ns
+
+    do_cache = carregar_cidades(csv_temporario, caminho_cache=caminho_cache)
+    assert caminho_cache.stat().st_mtime_ns == mtime_cache
+    pd.testing.assert_frame_equal(do_cache, original, check_dtype=False, check_categorical=False)
+
+    # Alterar o CSV muda o hash e força a reconstrução do cache
+    with open(csv_temporario, 'a', encoding='utf-8') as f:
+        f.write("\nCidade Nova,9999999,41,Paraná,1,1000,-25.0,-50.0")
+    atualizado = carregar_cidades(csv_temporario, estado='PARANÁ', caminho_cache=caminho_cache)
+    assert 'CIDADE NOVA' in atualizado['cidade'].tolist()
+
+
+def test_estado_filtrado_antes_do_tratamento_de_strings(csv_temporario, tmp_path, monkeypatch):
+    caminho_cache = tmp_path / 'cache' / 'cidades.npz'
+    linhas_tratadas = []
+    upper_original = pd.Series.str.upper
+
+    def upper_contando(self):
+        linhas_tratadas.append(len(self._parent))
+        return upper_original(self)
+
+    monkeypatch.setattr(pd.core.strings.accessor.StringMethods, 'upper', upper_contando)
+    cidades_pr = carregar_cidades(csv_temporario, estado='PARANÁ', caminho_cache=caminho_cache)
+    monkeypatch.undo()
+
+    # Só as cidades do Paraná passam pelo tratamento de strings, e o cache é o do estado
+    assert linhas_tratadas == [len(cidades_pr)] and len(cidades_pr) < 500
+    assert (cidades_pr['estado'] == 'PARANÁ').all()
+    assert not caminho_cache.exists() and (tmp_path / 'cache' / 'cidades_parana.npz').exists()
+    pd.testing.assert_frame_equal(carregar_cidades(csv_temporario, estado='PARANÁ', caminho_cache=caminho_cache),
+                                  cidades_pr, check_dtype=False, check_categorical=False)
@@ -0,0 +1,33 @@
+import json
+import numpy as np
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import roteamento
+from app.branch_e_bound import ler_matriz_csv, carregar_matriz_distancias, branch_and_bound_tsp
+
+MATRIZ_PARANA = os.path.join(os.path.dirname(__file__), '..', 'results', 'matriz_distancias_sensibilidade.csv')
+
+
+def test_solve_le_csv_sem_pandas_e_resolve_como_o_dataframe(tmp_path):
+    cidades, matriz = ler_matriz_csv(MATRIZ_PARANA)
+    matriz_df = carregar_matriz_distancias(MATRIZ_PARANA)
+    assert cidades == list(matriz_df.columns)
+    np.testing.assert_array_equal(matriz, matriz_df.to_numpy())
+
+    saida = tmp_path / 'resultados.json'
+    cache = str(tmp_path / 'cache.json')
+    assert roteamento.main(['solve', '--matriz', MATRIZ_PARANA, '--saida', str(saida), '--cache', cache]) == 0
+    resultados = json.loads(saida.read_text())
+    rota, custo, _ = branch_and_bound_tsp(matriz_df)
+    assert resultados['rota_otima_indices'] == rota
+    assert resultados['rota_otima_nomes'][0] == cidades[rota[0]]
+    assert np.isclose(resultados['custo_total_km'], custo)
+
+    # Argumentos desconhecidos só são aceitos pelo 'bench' (repassados ao pytest)
+    with pytest.raises(SystemExit):
+        roteamento.main(['solve', '-k', 'algo'])
@@ -0,0 +1,144 @@
+import http.client
+import json
+import threading
+import time
+import urllib.request
+import urllib.error
+import numpy as np
+import pytest
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.servico_api import (ServicoResolucao, ErroRequisicao, canonicalizar_matriz, chave_cache, criar_servidor,
+                             LIMITE_CIDADES_EXATO)
+
+
+MATRIZ_4 = [
+    [0, 10, 15, 20],
+    [10, 0, 35, 25],
+    [15, 35, 0, 30],
+    [20, 25, 30, 0]
+]
+
+
+@pytest.fixture
+def servidor():
+    """Sobe o servidor HTTP em uma porta livre e o encerra ao final do teste."""
+    servico = ServicoResolucao(num_trabalhadores=1, tamanho_fila=1)
+    srv = criar_servidor(porta=0, servico=servico)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+    servico.encerrar()
+
+
+def _post(url, corpo):
+    req = urllib.request.Request(url, data=json.dumps(corpo).encode(), headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req) as resp:
+        return resp.status, json.loads(resp.read())
+
+
+def test_chave_cache_ignora_diagonal_e_ruido():
+    """Matrizes equivalentes (diagonal 0 vs inf, ruído abaixo de 1e-6) geram a mesma chave."""
+    a = canonicalizar_matriz(MATRIZ_4)
+    b = np.array(MATRIZ_4, dtype=float) + 1e-9
+    np.fill_diagonal(b, np.inf)
+    assert chave_cache(a, 'exato') == chave_cache(canonicalizar_matriz(b), 'exato')
+    assert chave_cache(a, 'exato') != chave_cache(a, 'heuristica')
+
+
+def test_resolver_matriz_e_cache(servidor):
+    status, corpo = _post(servidor + '/resolver', {"matriz": MATRIZ_4, "metodo": "exato"})
+    assert status == 200
+    assert corpo["custo"] == 80.0
+    assert sorted(corpo["rota"]) == [0, 1, 2, 3]
+    assert corpo["cache"] is False
+
+    _, corpo_repetido = _post(servidor + '/resolver', {"matriz": MATRIZ_4, "metodo": "exato"})
+    assert corpo_repetido["cache"] is True
+    assert corpo_repetido["rota"] == corpo["rota"]
+
+    with urllib.request.urlopen(servidor + '/metricas') as resp:
+        metricas = json.loads(resp.read())
+    assert metricas["cache_hits"] == 1
+    assert metricas["latencia_ms"]["amostras"] == 2
+    assert metricas["latencia_ms"]["p50"] <= metricas["latencia_ms"]["p99"]
+
+
+def test_resolver_coordenadas_heuristica(servidor):
+    coordenadas = [[-23.35, -52.10], [-25.43, -49.27], [-24.33, -50.63], [-22.74, -53.04]]
+    status, corpo = _post(servidor + '/resolver', {"coordenadas": coordenadas, "metodo": "heuristica"})
+    assert status == 200
+    assert corpo["metodo"] == "heuristica"
+    assert len(corpo["rota"]) == 4
+
+
+def test_requisicao_invalida(servidor):
+    with pytest.raises(urllib.error.HTTPError) as erro:
+        _post(servidor + '/resolver', {"matriz": [[0, 1, 2], [1, 0, 3]]})
+    assert erro.value.code == 400
+
+
+def test_fila_cheia_recusa_requisicao():
+    """Sem vagas no pool, a requisição é recusada com 503 em vez de ficar bloqueada."""
+    servico = ServicoResolucao(num_trabalhadores=1, tamanho_fila=0)
+    try:
+        servico.vagas.acquire()
+        status, corpo = servico.resolver({"matriz": MATRIZ_4})
+        assert status == 503
+        assert servico.metricas()["rejeitadas"] == 1
+    finally:
+        servico.vagas.release()
+        servico.encerrar()
+
+
+def test_tempo_limite_mantem_a_vaga_ate_o_trabalhador_terminar():
+    """Após um 504 o trabalhador continua resolvendo: a vaga só volta quando ele termina."""
+    servico = ServicoResolucao(num_trabalhadores=1, tamanho_fila=0, tempo_limite=1e-6)
+    try:
+        status, _ = servico.resolver({"matriz": MATRIZ_4, "metodo": "exato"})
+        assert status == 504
+        status, _ = servico.resolver({"matriz": MATRIZ_4, "metodo": "heuristica"})
+        assert status == 503
+
+        limite = time.monotonic() + 30
+        while not servico.vagas.acquire(blocking=False):
+            assert time.monotonic() < limite
+            time.sleep(0.05)
+        servico.vagas.release()
+    finally:
+        servico.encerrar()
+
+
+def test_exato_acima_do_limite_recusado():
+    servico = ServicoResolucao(num_trabalhadores=1, tamanho_fila=0)
+    try:
+        coordenadas = [[-23.0 - 0.1 * i, -52.0 + 0.1 * i] for i in range(LIMITE_CIDADES_EXATO + 1)]
+        with pytest.raises(ErroRequisicao):
+            servico.resolver({"coordenadas": coordenadas, "metodo": "exato"})
+    finally:
+        servico.encerrar()
+
+
+def test_falha_do_pool_responde_500():
+    servico = ServicoResolucao(num_trabalhadores=1, tamanho_fila=0)
+    servico.encerrar()
+    status, corpo = servico.resolver({"matriz": MATRIZ_4, "metodo": "exato"})
+    assert status == 500 and "erro" in corpo
+    # A vaga foi devolvida mesmo sem o trabalhador ter recebido a instância
+    assert servico.vagas.acquire(blocking=False)
+
+
+def test_content_length_invalido(servidor):
+    conexao = http.client.HTTPConnection(servidor.removeprefix('http://'))
+    conexao.putrequest('POST', '/resolver')
+    conexao.putheader('Content-Length', 'abc')
+    conexao.endheaders()
+    resposta = conexao.getresponse()
+    assert resposta.status == 400 and "erro" in json.loads(resposta.read())
+    conexao.close()
@@ -0,0 +1,63 @@
+import itertools
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Configuração de Path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.simulacao import GerenciadorSimulacoes, resolver_cenario, submatriz_cenario
+
+
+def matriz_exemplo(n=6, semente=3):
+    rng = np.random.default_rng(semente)
+    valores = rng.uniform(10, 100, size=(n, n)).round(3)
+    np.fill_diagonal(valores, 0.0)  # Formato de 'matriz_distancias.csv'
+    nomes = [f"CIDADE {i}" for i in range(n)]
+    return pd.DataFrame(valores, index=nomes, columns=nomes)
+
+
+def custo_forca_bruta(valores, indices, deposito):
+    outros = [i for i in indices if i != deposito]
+    return min(
+        sum(valores[a, b] for a, b in zip((deposito,) + perm, perm + (deposito,)))
+        for perm in itertools.permutations(outros)
+    )
+
+
+def test_submatriz_coloca_deposito_na_origem():
+    matriz = matriz_exemplo()
+    sub, indices = submatriz_cenario(matriz, {"CIDADE 1", "CIDADE 3", "CIDADE 4"}, "CIDADE 4")
+    assert indices == [4, 1, 3]
+    assert list(sub.columns) == ["CIDADE 4", "CIDADE 1", "CIDADE 3"]
+    assert np.isinf(np.diag(sub.to_numpy())).all()
+
+
+def test_resolver_cenario_retorna_indices_da_matriz_original():
+    matriz = matriz_exemplo()
+    cidades = {"CIDADE 0", "CIDADE 2", "CIDADE 3", "CIDADE 5"}
+    resultado = resolver_cenario(matriz, cidades, "CIDADE 5")
+
+    assert resultado["rota_otima_indices"][0] == 5
+    assert sorted(resultado["rota_otima_indices"]) == [0, 2, 3, 5]
+    assert resultado["rota_otima_nomes"][0] == resultado["rota_otima_nomes"][-1] == "CIDADE 5"
+    esperado = custo_forca_bruta(matriz.to_numpy(), [0, 2, 3, 5], 5)
+    assert np.isclose(resultado["custo_total_km"], esperado)
+
+
+def test_gerenciador_reaproveita_selecao_anterior():
+    matriz = matriz_exemplo()
+    gerenciador = GerenciadorSimulacoes()
+    try:
+        primeira = gerenciador.submeter(matriz, ["CIDADE 0", "CIDADE 1", "CIDADE 2"], "CIDADE 0", "m")
+        primeira.futuro.result(timeout=30)
+        segunda = gerenciador.submeter(matriz, ["CIDADE 0", "CIDADE 1"], "CIDADE 0", "m")
+        segunda.futuro.result(timeout=30)
+
+        # Voltar à seleção anterior (em outra ordem) não dispara uma nova resolução
+        de_novo = gerenciador.submeter(matriz, ["CIDADE 2", "CIDADE 1", "CIDADE 0"], "CIDADE 0", "m")
+        assert de_novo is primeira and de_novo.concluida
+        assert de_novo.progresso()["nos_expandidos"] == de_novo.resultado()["nos_expandidos"]
+    finally:
+        gerenciador.encerrar()